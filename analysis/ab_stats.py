@@ -0,0 +1,238 @@
+"""
+A/B 測試統計檢定
+兩比例 z 檢定、Fisher 精確檢定、Wilson 信賴區間與 Beta-Binomial 後驗分布
+（函式皆接受 numpy 陣列，可一次評估多個同時進行的測試）
+"""
+
+import math
+from typing import Dict, Optional
+
+import numpy as np
+
+# 每組期望次數低於此值時改用 Fisher 精確檢定
+MIN_EXPECTED_COUNT = 5
+
+
+def _normal_quantile(confidence: float) -> float:
+    """雙尾信賴水準對應的常態分位數（95% -> 1.96）"""
+    from scipy.special import ndtri
+
+    return float(ndtri(0.5 + confidence / 2))
+
+
+def wilson_interval(successes, trials, confidence: float = 0.95):
+    """
+    比例的 Wilson 信賴區間（樣本小或比例接近 0、1 時仍有效）
+
+    Args:
+        successes: 成功次數（純量或陣列）
+        trials: 試驗次數（純量或陣列）
+        confidence: 信賴水準
+
+    Returns:
+        (下界, 上界)，試驗次數為 0 時為 (0, 1)
+    """
+    successes = np.asarray(successes, dtype=float)
+    trials = np.asarray(trials, dtype=float)
+    z = _normal_quantile(confidence)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rate = successes / trials
+        denominator = 1 + z ** 2 / trials
+        center = (rate + z ** 2 / (2 * trials)) / denominator
+        margin = z * np.sqrt(rate * (1 - rate) / trials + z ** 2 / (4 * trials ** 2)) / denominator
+
+    empty = trials == 0
+    low = np.where(empty, 0.0, np.clip(center - margin, 0, 1))
+    high = np.where(empty, 1.0, np.clip(center + margin, 0, 1))
+    return low, high
+
+
+def two_proportion_z_test(successes_a, trials_a, successes_b, trials_b, confidence: float = 0.95) -> Dict:
+    """
+    兩比例 z 檢定（雙尾，合併比例估計標準誤）
+
+    Args:
+        successes_a: A 組成功次數
+        trials_a: A 組試驗次數
+        successes_b: B 組成功次數
+        trials_b: B 組試驗次數
+        confidence: 差異信賴區間的信賴水準
+
+    Returns:
+        z 值、p 值、比例差異（A - B）與其信賴區間（未合併標準誤）
+    """
+    from scipy.special import ndtr
+
+    successes_a, trials_a, successes_b, trials_b = (
+        np.asarray(value, dtype=float) for value in (successes_a, trials_a, successes_b, trials_b)
+    )
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rate_a = successes_a / trials_a
+        rate_b = successes_b / trials_b
+        pooled = (successes_a + successes_b) / (trials_a + trials_b)
+        pooled_se = np.sqrt(pooled * (1 - pooled) * (1 / trials_a + 1 / trials_b))
+        z = np.where(pooled_se > 0, (rate_a - rate_b) / pooled_se, 0.0)
+        se = np.sqrt(rate_a * (1 - rate_a) / trials_a + rate_b * (1 - rate_b) / trials_b)
+
+    difference = rate_a - rate_b
+    margin = _normal_quantile(confidence) * se
+    return {
+        'z': z,
+        'p_value': 2 * ndtr(-np.abs(z)),
+        'difference': difference,
+        'difference_ci': (difference - margin, difference + margin)
+    }
+
+
+def fisher_exact_test(successes_a: int, trials_a: int, successes_b: int, trials_b: int) -> float:
+    """
+    Fisher 精確檢定（雙尾），適用於小樣本
+
+    以超幾何分布列舉所有邊際總和相同的 2x2 表，加總機率不大於觀察值者。
+
+    Returns:
+        p 值
+    """
+    total_successes = successes_a + successes_b
+    total = trials_a + trials_b
+    low = max(0, total_successes - trials_b)
+    high = min(total_successes, trials_a)
+    if high <= low:
+        return 1.0
+
+    def log_choose(n, k):
+        return math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1)
+
+    support = np.arange(low, high + 1)
+    log_p = np.array([
+        log_choose(trials_a, k) + log_choose(trials_b, total_successes - k) for k in support
+    ]) - log_choose(total, total_successes)
+    probabilities = np.exp(log_p)
+    observed = probabilities[successes_a - low]
+    # 容許浮點誤差
+    return float(min(1.0, probabilities[probabilities <= observed * (1 + 1e-7)].sum()))
+
+
+def compare_proportions(
+    successes_a: int,
+    trials_a: int,
+    successes_b: int,
+    trials_b: int,
+    confidence: float = 0.95
+) -> Dict:
+    """
+    比較兩組比例，樣本足夠時用 z 檢定，任一格期望次數過小時改用 Fisher 精確檢定
+
+    Returns:
+        test（z 或 fisher）、p_value、difference 與 difference_ci（A - B，比例）
+    """
+    result = two_proportion_z_test(successes_a, trials_a, successes_b, trials_b, confidence)
+    result = {
+        'test': 'z',
+        'z': float(result['z']),
+        'p_value': float(result['p_value']),
+        'difference': float(np.nan_to_num(result['difference'])),
+        'difference_ci': tuple(float(np.nan_to_num(bound)) for bound in result['difference_ci'])
+    }
+
+    total = trials_a + trials_b
+    if total == 0:
+        result['p_value'] = 1.0
+        return result
+
+    rate = (successes_a + successes_b) / total
+    expected = [trials * p for trials in (trials_a, trials_b) for p in (rate, 1 - rate)]
+    if min(expected) < MIN_EXPECTED_COUNT:
+        result['test'] = 'fisher'
+        result['p_value'] = fisher_exact_test(successes_a, trials_a, successes_b, trials_b)
+    return result
+
+
+def beta_posterior(
+    successes,
+    trials,
+    draws: int = 10000,
+    confidence: float = 0.95,
+    prior: tuple = (1.0, 1.0),
+    seed: Optional[int] = None,
+    chunk_size: int = 256
+) -> Dict:
+    """
+    Beta-Binomial 後驗分布（向量化）
+
+    每組的比例後驗為 Beta(prior_a + 成功, prior_b + 失敗)。可信區間由 Beta 分位數精確計算；
+    各組為最佳的機率以同一批抽樣估計，多個測試一次抽樣，依 chunk_size 分批以限制記憶體。
+
+    Args:
+        successes: 成功次數，形狀 (組數,) 或 (測試數, 組數)
+        trials: 試驗次數，形狀同 successes
+        draws: 每組抽樣次數
+        confidence: 可信區間的信賴水準
+        prior: Beta 先驗參數 (a, b)，預設為均勻分布
+        seed: 隨機種子
+        chunk_size: 每批處理的測試數
+
+    Returns:
+        mean（後驗平均）、ci_low、ci_high、prob_best（各組為最佳的機率），形狀同輸入
+    """
+    from scipy.special import betaincinv
+
+    successes = np.asarray(successes, dtype=float)
+    trials = np.asarray(trials, dtype=float)
+    single = successes.ndim == 1
+    successes, trials = np.atleast_2d(successes), np.atleast_2d(trials)
+
+    alpha = prior[0] + successes
+    beta = prior[1] + trials - successes
+    tail = (1 - confidence) / 2
+
+    rng = np.random.default_rng(seed)
+    prob_best = np.empty_like(alpha)
+    for start in range(0, alpha.shape[0], chunk_size):
+        a, b = alpha[start:start + chunk_size], beta[start:start + chunk_size]
+        samples = rng.beta(a[..., None], b[..., None], size=a.shape + (draws,))
+        best = samples.argmax(axis=1)
+        prob_best[start:start + chunk_size] = (best[:, None, :] == np.arange(a.shape[1])[None, :, None]).mean(axis=2)
+
+    result = {
+        'mean': alpha / (alpha + beta),
+        'ci_low': betaincinv(alpha, beta, tail),
+        'ci_high': betaincinv(alpha, beta, 1 - tail),
+        'prob_best': prob_best
+    }
+    return {key: value[0] for key, value in result.items()} if single else result
+
+
+def msprt_p_value(successes_a, trials_a, successes_b, trials_b, tau: float = 0.05):
+    """
+    混合序貫機率比檢定（mSPRT）在目前資料下的 p 值（Johari 等人，2017）
+
+    以常態近似比例差異 B - A，效果量先驗為 N(0, tau^2)，混合概似比為
+    sqrt(V / (V + tau^2)) * exp(diff^2 * tau^2 / (2V(V + tau^2)))，V 為差異的變異數（合併比例估計）。
+    對歷次結果取最小值即為「隨時有效」的 p 值：每批新資料都可檢查並在 p < alpha 時停止，
+    整體型一錯誤率仍不超過 alpha。
+
+    Args:
+        successes_a: A 組成功次數（純量或陣列）
+        trials_a: A 組試驗次數
+        successes_b: B 組成功次數
+        trials_b: B 組試驗次數
+        tau: 效果量先驗的標準差（比例，0.05 表示預期差異約 5 個百分點）
+
+    Returns:
+        1 / 概似比（上限為 1），任一組沒有試驗時為 1
+    """
+    successes_a, trials_a, successes_b, trials_b = (
+        np.asarray(value, dtype=float) for value in (successes_a, trials_a, successes_b, trials_b)
+    )
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        pooled = (successes_a + successes_b) / (trials_a + trials_b)
+        variance = pooled * (1 - pooled) * (1 / trials_a + 1 / trials_b)
+        difference = successes_b / trials_b - successes_a / trials_a
+        tau2 = tau ** 2
+        log_ratio = (0.5 * np.log(variance / (variance + tau2))
+                     + difference ** 2 * tau2 / (2 * variance * (variance + tau2)))
+        p_value = np.minimum(1.0, np.exp(-log_ratio))
+
+    return np.where((trials_a > 0) & (trials_b > 0) & (variance > 0), p_value, 1.0)
@@ -4,23 +4,512 @@ A/B 測試管理器
 """
 
 import json
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
 
+import numpy as np
+import pandas as pd
+
+from ab_stats import beta_posterior, compare_proportions, msprt_p_value, wilson_interval
 from database_client import DatabaseClient
 
 
+@dataclass
+class ArmCounts:
+    """單一測試組（檔案）的滑卡次數，可跨批次或工作程序合併"""
+
+    total_swipes: int = 0
+    right_swipes: int = 0
+    left_swipes: int = 0
+    matches: int = 0
+
+    @property
+    def match_rate(self) -> float:
+        """配對率（百分比，配對數 / 右滑數）"""
+        return (self.matches / self.right_swipes) * 100 if self.right_swipes else 0.0
+
+    def merge(self, other: 'ArmCounts') -> 'ArmCounts':
+        """合併另一份次數（就地更新）"""
+        self.total_swipes += other.total_swipes
+        self.right_swipes += other.right_swipes
+        self.left_swipes += other.left_swipes
+        self.matches += other.matches
+        return self
+
+    def to_dict(self) -> Dict:
+        """轉為分析結果的格式"""
+        return {
+            'total_swipes': self.total_swipes,
+            'right_swipes': self.right_swipes,
+            'left_swipes': self.left_swipes,
+            'matches': self.matches,
+            'match_rate': self.match_rate
+        }
+
+
+def _is_arrow(data) -> bool:
+    return type(data).__module__.startswith('pyarrow') and hasattr(data, 'num_rows')
+
+
+def _count_frame(frame: pd.DataFrame) -> ArmCounts:
+    """以向量運算計算 DataFrame 的次數"""
+    if 'swipe_direction' not in frame.columns:
+        return ArmCounts(total_swipes=len(frame))
+
+    direction = frame['swipe_direction']
+    right = (direction == 'right').to_numpy(dtype=bool)
+    is_match = frame['is_match'].fillna(False).to_numpy(dtype=bool) if 'is_match' in frame.columns else False
+    return ArmCounts(
+        total_swipes=len(frame),
+        right_swipes=int(right.sum()),
+        left_swipes=int((direction == 'left').sum()),
+        matches=int((right & is_match).sum())
+    )
+
+
+def _count_arrow(table) -> ArmCounts:
+    """以 pyarrow.compute 計算 Arrow Table / RecordBatch 的次數，不轉為 pandas"""
+    import pyarrow.compute as pc
+
+    if 'swipe_direction' not in table.column_names:
+        return ArmCounts(total_swipes=table.num_rows)
+
+    direction = table.column('swipe_direction')
+    right = pc.fill_null(pc.equal(direction, 'right'), False)
+    left = pc.fill_null(pc.equal(direction, 'left'), False)
+    matches = pc.scalar(0)
+    if 'is_match' in table.column_names:
+        matches = pc.sum(pc.and_(right, pc.fill_null(table.column('is_match'), False)))
+    return ArmCounts(
+        total_swipes=table.num_rows,
+        right_swipes=int(pc.sum(right).as_py() or 0),
+        left_swipes=int(pc.sum(left).as_py() or 0),
+        matches=int(matches.as_py() or 0)
+    )
+
+
+def count_swipes(records) -> ArmCounts:
+    """
+    單次掃描計算滑卡次數，記憶體用量固定
+
+    Args:
+        records: 下列任一種來源
+            - 滑卡記錄字典的列表或迭代器
+            - pandas DataFrame、pyarrow Table / RecordBatch（向量運算）
+            - 上述批次的迭代器（如 DatabaseClient.stream_swipe_records / stream_swipe_frames 的輸出）
+
+    Returns:
+        滑卡次數
+    """
+    if isinstance(records, pd.DataFrame):
+        return _count_frame(records)
+    if _is_arrow(records):
+        return _count_arrow(records)
+
+    counts = ArmCounts()
+    total = right = left = matches = 0
+    for item in records:
+        if isinstance(item, dict):
+            total += 1
+            direction = item.get('swipe_direction')
+            if direction == 'right':
+                right += 1
+                if item.get('is_match', False):
+                    matches += 1
+            elif direction == 'left':
+                left += 1
+        else:
+            # 一批記錄
+            counts.merge(count_swipes(item))
+
+    return counts.merge(ArmCounts(total, right, left, matches))
+
+
+def _arm_label(name: str) -> str:
+    """profile_a -> Profile A"""
+    return name.replace('_', ' ').title()
+
+
+@dataclass
+class SequentialABTest:
+    """
+    序貫 A/B 測試（mSPRT）
+
+    第一組為對照組，其餘各組與對照組比較。每批新記錄只累加次數，不重新掃描歷史；
+    每次評估以 mSPRT 更新「隨時有效」的 p 值（取歷次最小值），超過兩組時顯著水準以 Bonferroni 校正。
+    - 挑戰組顯著優於對照組：該組勝出，測試停止
+    - 挑戰組顯著劣於對照組：停止分配流量給該組（流量改分給其餘組）
+    - 所有挑戰組都被淘汰：對照組勝出
+    - 各組都用完滑卡預算仍無結論：停止，判定為 tie
+
+    實際滑卡時每個時段只啟用一個檔案：choose() 選出下一個時段的測試組，
+    時段結束後由 ABTestManager.record_session 讀取該時段的滑卡記錄並累加。
+    以 save / load 保存於 JSON，跨次執行持續累加。
+    """
+
+    arms: List[str]
+    budget_per_arm: Optional[int] = None
+    alpha: float = 0.05
+    tau: float = 0.05
+    min_right_swipes: int = 30
+    counts: Dict[str, ArmCounts] = field(default_factory=dict)
+    active: List[str] = field(default_factory=list)
+    p_values: Dict[str, float] = field(default_factory=dict)
+    looks: int = 0
+    status: str = 'running'
+    winner: Optional[str] = None
+    reason: Optional[str] = None
+    current: Optional[str] = None
+    session_started_at: Optional[str] = None
+
+    def __post_init__(self):
+        if len(self.arms) < 2:
+            raise ValueError('序貫測試至少需要兩組')
+        for name in self.arms:
+            self.counts.setdefault(name, ArmCounts())
+        if not self.active and self.status == 'running':
+            self.active = list(self.arms)
+        for name in self.arms[1:]:
+            self.p_values.setdefault(name, 1.0)
+
+    @property
+    def control(self) -> str:
+        """對照組名稱"""
+        return self.arms[0]
+
+    def update(self, arm: str, records) -> Dict:
+        """
+        加入一批新記錄並重新評估
+
+        Args:
+            arm: 測試組名稱
+            records: 該組新增的滑卡記錄（格式同 count_swipes），或已彙總的 ArmCounts
+
+        Returns:
+            目前的決策（同 decision()）
+        """
+        if arm not in self.counts:
+            raise ValueError(f"未知的測試組: {arm}")
+        self.counts[arm].merge(records if isinstance(records, ArmCounts) else count_swipes(records))
+        return self.evaluate()
+
+    def choose(self) -> Optional[str]:
+        """
+        選出下一個滑卡時段要啟用的測試組
+
+        Returns:
+            仍在測試的組中滑卡數最少者（停止後為勝出組），判定為 tie 時為 None
+        """
+        self.current = min(self.active, key=lambda name: self.counts[name].total_swipes) if self.active else None
+        return self.current
+
+    def evaluate(self) -> Dict:
+        """
+        以目前累積的次數評估是否停止
+
+        Returns:
+            目前的決策（同 decision()）
+        """
+        if self.status != 'running':
+            return self.decision()
+
+        self.looks += 1
+        control = self.counts[self.control]
+        alpha = self.alpha / (len(self.arms) - 1)
+
+        for name in [arm for arm in self.active if arm != self.control]:
+            challenger = self.counts[name]
+            if min(control.right_swipes, challenger.right_swipes) < self.min_right_swipes:
+                continue
+
+            p_value = float(msprt_p_value(
+                control.matches, control.right_swipes, challenger.matches, challenger.right_swipes, self.tau
+            ))
+            self.p_values[name] = min(self.p_values[name], p_value)
+            if self.p_values[name] < alpha:
+                if challenger.match_rate > control.match_rate:
+                    return self._stop(name, 'significant')
+                # 顯著劣於對照組，流量改分給其餘組
+                self.active.remove(name)
+
+        if self.active == [self.control]:
+            return self._stop(self.control, 'challengers_dropped')
+
+        if self.budget_per_arm and all(
+            self.counts[name].total_swipes >= self.budget_per_arm for name in self.active
+        ):
+            return self._stop(None, 'budget_exhausted')
+
+        return self.decision()
+
+    def _stop(self, winner: Optional[str], reason: str) -> Dict:
+        self.status = 'stopped'
+        self.winner = winner
+        self.reason = reason
+        self.active = [winner] if winner else []
+        return self.decision()
+
+    def allocation(self) -> Dict[str, float]:
+        """
+        各組下一批滑卡的流量比例
+
+        Returns:
+            測試組名稱對應比例（進行中平均分配給仍在測試的組，停止後全部給勝出組）
+        """
+        if not self.active:
+            return {}
+        return {name: 1 / len(self.active) if name in self.active else 0.0 for name in self.arms}
+
+    def decision(self) -> Dict:
+        """
+        目前的決策摘要
+
+        Returns:
+            status、winner、reason、各組次數與 p 值、流量分配，以及相對固定預算省下的滑卡數
+        """
+        used = sum(counts.total_swipes for counts in self.counts.values())
+        saved = None
+        if self.budget_per_arm and self.status == 'stopped':
+            saved = max(0, self.budget_per_arm * len(self.arms) - used)
+        return {
+            'status': self.status,
+            'winner': self.winner,
+            'reason': self.reason,
+            'looks': self.looks,
+            'arms': {name: counts.to_dict() for name, counts in self.counts.items()},
+            'p_values': dict(self.p_values),
+            'allocation': self.allocation(),
+            'swipes_used': used,
+            'swipes_saved': saved
+        }
+
+    def to_dict(self) -> Dict:
+        """轉為可 JSON 序列化的字典"""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'SequentialABTest':
+        """由 to_dict 的輸出還原"""
+        data = dict(data)
+        data['counts'] = {name: ArmCounts(**counts) for name, counts in data.get('counts', {}).items()}
+        return cls(**data)
+
+    def save(self, path: str):
+        """
+        保存測試狀態
+
+        Args:
+            path: JSON 檔路徑
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 先寫入暫存檔再取代，避免中斷時留下損壞的狀態檔
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: str) -> 'SequentialABTest':
+        """
+        載入測試狀態
+
+        Args:
+            path: JSON 檔路徑
+
+        Returns:
+            序貫測試
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
+@dataclass
+class ProfileBandit:
+    """
+    多臂吃角子老虎機的個人檔案分配器
+
+    取代依 switch_interval_hours 輪流切換固定檔案的作法：每個滑卡時段開始前由 choose()
+    依各檔案目前的配對率（配對數 / 右滑數）後驗選出要啟用的檔案，時段結束後以 update() 累加結果
+    （由資料庫讀取時使用 ABTestManager.record_session）。
+
+    策略:
+        - top_two（預設）: Top-two Thompson 抽樣，依 top_two_probability 選後驗抽樣最佳的檔案，
+          否則重新抽樣直到出現另一個最佳檔案（挑戰者）；持續比較前兩名，找出最佳檔案所需的滑卡數最少
+        - thompson: Thompson 抽樣，幾乎只使用目前最佳的檔案，配對數最多但確認最佳檔案較慢
+        - ucb: UCB1，未試過的檔案優先，之後選配對率加信賴上界最高的檔案
+
+    以 save / load 保存於 JSON，跨次執行持續累加。
+    """
+
+    arms: List[str]
+    strategy: str = 'top_two'
+    top_two_probability: float = 0.5
+    counts: Dict[str, ArmCounts] = field(default_factory=dict)
+    sessions: int = 0
+    current: Optional[str] = None
+    session_started_at: Optional[str] = None
+
+    STRATEGIES = ('top_two', 'thompson', 'ucb')
+
+    def __post_init__(self):
+        if not self.arms:
+            raise ValueError('至少需要一個個人檔案')
+        if self.strategy not in self.STRATEGIES:
+            raise ValueError(f"未知的分配策略: {self.strategy}")
+        for name in self.arms:
+            self.counts.setdefault(name, ArmCounts())
+        self._rng = np.random.default_rng()
+
+    def seed(self, seed: Optional[int]) -> 'ProfileBandit':
+        """設定抽樣的隨機種子（測試與模擬用），回傳自身"""
+        self._rng = np.random.default_rng(seed)
+        return self
+
+    def _successes_trials(self):
+        matches = np.array([self.counts[name].matches for name in self.arms], dtype=float)
+        trials = np.array([self.counts[name].right_swipes for name in self.arms], dtype=float)
+        return matches, trials
+
+    def choose(self) -> str:
+        """
+        選出下一個滑卡時段要啟用的個人檔案
+
+        Returns:
+            個人檔案名稱
+        """
+        matches, trials = self._successes_trials()
+        if self.strategy == 'ucb':
+            untried = np.flatnonzero(trials == 0)
+            if untried.size:
+                index = int(untried[0])
+            else:
+                bonus = np.sqrt(2 * np.log(trials.sum()) / trials)
+                index = int(np.argmax(matches / trials + bonus))
+        else:
+            alpha, beta = 1 + matches, 1 + trials - matches
+            index = int(self._rng.beta(alpha, beta).argmax())
+            if self.strategy == 'top_two' and len(self.arms) > 1 and self._rng.random() >= self.top_two_probability:
+                # 一次重新抽樣多輪，取第一個不同的最佳檔案；後驗集中於單一檔案時抽不到則維持原選擇
+                resampled = self._rng.beta(alpha[:, None], beta[:, None], size=(len(alpha), 100)).argmax(axis=0)
+                challengers = resampled[resampled != index]
+                if challengers.size:
+                    index = int(challengers[0])
+
+        self.sessions += 1
+        self.current = self.arms[index]
+        return self.current
+
+    def update(self, arm: str, records) -> ArmCounts:
+        """
+        加入一個滑卡時段的結果
+
+        Args:
+            arm: 個人檔案名稱
+            records: 該時段的滑卡記錄（格式同 count_swipes），或已彙總的 ArmCounts
+
+        Returns:
+            該檔案累積的次數
+        """
+        if arm not in self.counts:
+            raise ValueError(f"未知的個人檔案: {arm}")
+        return self.counts[arm].merge(records if isinstance(records, ArmCounts) else count_swipes(records))
+
+    def summary(self, draws: int = 10000, seed: Optional[int] = None) -> Dict:
+        """
+        目前的後驗摘要
+
+        Args:
+            draws: 估計「為最佳的機率」的抽樣次數
+            seed: 抽樣的隨機種子
+
+        Returns:
+            best（後驗平均最高的檔案）、sessions、current，
+            arms 為各檔案的次數、後驗平均配對率（百分比）與為最佳的機率
+        """
+        matches, trials = self._successes_trials()
+        posterior = beta_posterior(matches, trials, draws, seed=seed)
+        arms = {}
+        for index, name in enumerate(self.arms):
+            arms[name] = self.counts[name].to_dict()
+            arms[name].update(
+                posterior_mean=round(float(posterior['mean'][index]) * 100, 2),
+                prob_best=round(float(posterior['prob_best'][index]), 4)
+            )
+        return {
+            'strategy': self.strategy,
+            'sessions': self.sessions,
+            'current': self.current,
+            'best': self.arms[int(np.argmax(posterior['mean']))],
+            'arms': arms
+        }
+
+    def to_dict(self) -> Dict:
+        """轉為可 JSON 序列化的字典"""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ProfileBandit':
+        """由 to_dict 的輸出還原"""
+        data = dict(data)
+        data['counts'] = {name: ArmCounts(**counts) for name, counts in data.get('counts', {}).items()}
+        return cls(**data)
+
+    def save(self, path: str):
+        """
+        保存分配器狀態
+
+        Args:
+            path: JSON 檔路徑
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 先寫入暫存檔再取代，避免中斷時留下損壞的狀態檔
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: str) -> 'ProfileBandit':
+        """
+        載入分配器狀態
+
+        Args:
+            path: JSON 檔路徑
+
+        Returns:
+            個人檔案分配器
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
 class ABTestManager:
     """A/B 測試管理器類別"""
 
-    def __init__(self, db_client: DatabaseClient):
+    def __init__(
+        self,
+        db_client: DatabaseClient,
+        alpha: float = 0.05,
+        posterior_draws: int = 10000,
+        seed: Optional[int] = None
+    ):
         """
         初始化 A/B 測試管理器
         
         Args:
             db_client: 資料庫客戶端實例
+            alpha: 顯著水準（信賴區間為 1 - alpha）
+            posterior_draws: 估計後驗「為最佳的機率」的抽樣次數
+            seed: 後驗抽樣的隨機種子（測試用）
         """
         self.db_client = db_client
+        self.alpha = alpha
+        self.posterior_draws = posterior_draws
+        self.seed = seed
 
     def load_test_config(self, config_path: str) -> Dict:
         """
@@ -48,107 +537,222 @@ class ABTestManager:
         with open(config_path, 'r', encoding='utf-8') as f:
             return json.load(f)
 
-    def calculate_match_rate(self, swipe_records: List[Dict]) -> float:
+    def create_sequential_test(self, test_config: Dict) -> SequentialABTest:
+        """
+        依測試設定建立序貫測試
+
+        組別依 profiles 的順序（第一組為對照組），每組預算為 swipes_per_profile；
+        sequential 區塊可設定 alpha、tau 與 min_right_swipes。
+
+        Args:
+            test_config: load_test_config 載入的設定
+
+        Returns:
+            序貫測試
+        """
+        options = test_config.get('sequential', {})
+        return SequentialABTest(
+            arms=list(test_config['profiles']),
+            budget_per_arm=test_config.get('swipes_per_profile'),
+            alpha=options.get('alpha', self.alpha),
+            tau=options.get('tau', 0.05),
+            min_right_swipes=options.get('min_right_swipes', 30)
+        )
+
+    def create_bandit(self, test_config: Dict, strategy: Optional[str] = None) -> ProfileBandit:
+        """
+        依測試設定建立個人檔案分配器
+
+        組別為 profiles 的所有檔案（不限兩個）；bandit 區塊可設定 strategy 與 top_two_probability。
+
+        Args:
+            test_config: load_test_config 載入的設定
+            strategy: 分配策略，未提供時使用設定值（預設 top_two）
+
+        Returns:
+            個人檔案分配器
+        """
+        options = test_config.get('bandit', {})
+        bandit = ProfileBandit(
+            arms=list(test_config['profiles']),
+            strategy=strategy or options.get('strategy', 'top_two'),
+            top_two_probability=options.get('top_two_probability', 0.5)
+        )
+        return bandit.seed(self.seed)
+
+    def record_session(
+        self,
+        test,
+        dating_account_id: Optional[int] = None,
+        now: Optional[datetime] = None
+    ) -> Optional[ArmCounts]:
+        """
+        將上一個滑卡時段的記錄累加至序貫測試或分配器，並由現在開始下一個時段
+
+        上一個時段為 test.session_started_at 至 now，期間只啟用 test.current，
+        因此以 swiped_at 落在此範圍內的記錄作為該組的結果。
+
+        Args:
+            test: SequentialABTest 或 ProfileBandit
+            dating_account_id: 社交帳號 ID，未提供時讀取所有帳號
+            now: 時段結束時間，未提供時為目前時間
+
+        Returns:
+            上一個時段的次數；尚未開始過時段時為 None
+        """
+        now = now or datetime.now()
+        counts = None
+        if test.current is not None and test.session_started_at is not None:
+            counts = count_swipes(self.db_client.stream_swipe_frames(
+                dating_account_id=dating_account_id,
+                start=datetime.fromisoformat(test.session_started_at),
+                end=now,
+                columns=('swipe_direction', 'is_match')
+            ))
+            test.update(test.current, counts)
+        test.session_started_at = now.isoformat()
+        return counts
+
+    def calculate_match_rate(self, swipe_records: Iterable[Dict]) -> float:
         """
         計算配對率
         
         Args:
-            swipe_records: 滑卡記錄列表
+            swipe_records: 滑卡記錄（格式同 count_swipes）
             
         Returns:
             配對率（百分比）
         """
-        if not swipe_records:
-            return 0.0
+        return count_swipes(swipe_records).match_rate
 
-        right_swipes = [r for r in swipe_records if r.get('swipe_direction') == 'right']
-        matches = [r for r in right_swipes if r.get('is_match', False)]
+    def aggregate_arms(self, arms: Dict[str, Iterable]) -> Dict[str, ArmCounts]:
+        """
+        計算各測試組的滑卡次數，每個來源只掃描一次
 
-        if not right_swipes:
-            return 0.0
+        Args:
+            arms: 測試組名稱對應滑卡記錄（格式同 count_swipes）
 
-        return (len(matches) / len(right_swipes)) * 100
+        Returns:
+            測試組名稱對應滑卡次數
+        """
+        return {name: count_swipes(records) for name, records in arms.items()}
+
+    def analyze_arms(self, arms: Dict[str, Iterable]) -> Dict:
+        """
+        分析 N 組 A/B 測試結果
+
+        配對率（配對數 / 右滑數）附 Wilson 信賴區間與 Beta 後驗「為最佳的機率」；
+        後驗平均最高的組與次佳組以兩比例 z 檢定（小樣本時 Fisher 精確檢定）比較，
+        超過兩組時 p 值以 Bonferroni 校正，達顯著水準才判定勝者。
+
+        Args:
+            arms: 測試組名稱對應滑卡記錄（格式同 count_swipes），或 aggregate_arms 的結果
+
+        Returns:
+            分析結果（arms 為各組統計，winner 為勝出組名稱或 tie，significance 為檢定結果）
+        """
+        counts = {
+            name: records if isinstance(records, ArmCounts) else count_swipes(records)
+            for name, records in arms.items()
+        }
+        names = list(counts)
+        confidence_level = 1 - self.alpha
+        matches = np.array([counts[name].matches for name in names])
+        trials = np.array([counts[name].right_swipes for name in names])
+
+        results = {'arms': {name: counts[name].to_dict() for name in names}}
+        if not names:
+            results.update(winner='tie', confidence='low', significance=None,
+                           recommendation=self._generate_recommendation('tie', None))
+            return results
+
+        ci_low, ci_high = wilson_interval(matches, trials, confidence_level)
+        posterior = beta_posterior(matches, trials, self.posterior_draws, confidence_level, seed=self.seed)
+        for index, name in enumerate(names):
+            results['arms'][name].update(
+                match_rate_ci=[round(float(ci_low[index]) * 100, 2), round(float(ci_high[index]) * 100, 2)],
+                prob_best=round(float(posterior['prob_best'][index]), 4)
+            )
+
+        # 依後驗平均排序，比較最佳與次佳
+        ranked = sorted(range(len(names)), key=lambda index: posterior['mean'][index], reverse=True)
+        significance = None
+        winner, confidence = 'tie', 'low'
+        if len(ranked) > 1:
+            best, runner_up = ranked[0], ranked[1]
+            comparison = compare_proportions(
+                int(matches[best]), int(trials[best]), int(matches[runner_up]), int(trials[runner_up]),
+                confidence_level
+            )
+            pair = beta_posterior(matches[[best, runner_up]], trials[[best, runner_up]],
+                                  self.posterior_draws, confidence_level, seed=self.seed)
+            p_value = min(1.0, comparison['p_value'] * (len(names) - 1))
+            significance = {
+                'test': comparison['test'],
+                'compared': [names[best], names[runner_up]],
+                'p_value': p_value,
+                'alpha': self.alpha,
+                'difference': round(comparison['difference'] * 100, 2),
+                'difference_ci': [round(bound * 100, 2) for bound in comparison['difference_ci']],
+                'prob_beats_runner_up': round(float(pair['prob_best'][0]), 4)
+            }
+            if p_value < self.alpha:
+                winner = names[best]
+                confidence = 'high' if p_value < self.alpha / 5 else 'medium'
+
+        results.update(
+            winner=winner,
+            confidence=confidence,
+            significance=significance,
+            recommendation=self._generate_recommendation(winner, significance)
+        )
+        return results
 
     def analyze_test_results(
         self,
-        profile_a_records: List[Dict],
-        profile_b_records: List[Dict]
+        profile_a_records: Iterable[Dict],
+        profile_b_records: Iterable[Dict]
     ) -> Dict:
         """
         分析 A/B 測試結果
         
         Args:
-            profile_a_records: Profile A 的滑卡記錄
-            profile_b_records: Profile B 的滑卡記錄
+            profile_a_records: Profile A 的滑卡記錄（格式同 count_swipes）
+            profile_b_records: Profile B 的滑卡記錄（格式同 count_swipes）
             
         Returns:
             分析結果
         """
-        # Profile A 統計
-        profile_a_right = [r for r in profile_a_records if r.get('swipe_direction') == 'right']
-        profile_a_left = [r for r in profile_a_records if r.get('swipe_direction') == 'left']
-        profile_a_matches = [r for r in profile_a_right if r.get('is_match', False)]
-
-        # Profile B 統計
-        profile_b_right = [r for r in profile_b_records if r.get('swipe_direction') == 'right']
-        profile_b_left = [r for r in profile_b_records if r.get('swipe_direction') == 'left']
-        profile_b_matches = [r for r in profile_b_right if r.get('is_match', False)]
-
-        # 計算配對率
-        profile_a_match_rate = self.calculate_match_rate(profile_a_records)
-        profile_b_match_rate = self.calculate_match_rate(profile_b_records)
-
-        # 決定勝者
-        if profile_a_match_rate > profile_b_match_rate * 1.1:  # 需要有 10% 以上的差距
-            winner = 'profile_a'
-            confidence = 'high' if profile_a_match_rate > profile_b_match_rate * 1.2 else 'medium'
-        elif profile_b_match_rate > profile_a_match_rate * 1.1:
-            winner = 'profile_b'
-            confidence = 'high' if profile_b_match_rate > profile_a_match_rate * 1.2 else 'medium'
-        else:
-            winner = 'tie'
-            confidence = 'low'
+        results = self.analyze_arms({'profile_a': profile_a_records, 'profile_b': profile_b_records})
+        # 保留原本的 profile_a / profile_b 欄位
+        results.update(results['arms'])
+        return results
 
-        return {
-            'profile_a': {
-                'total_swipes': len(profile_a_records),
-                'right_swipes': len(profile_a_right),
-                'left_swipes': len(profile_a_left),
-                'matches': len(profile_a_matches),
-                'match_rate': profile_a_match_rate
-            },
-            'profile_b': {
-                'total_swipes': len(profile_b_records),
-                'right_swipes': len(profile_b_right),
-                'left_swipes': len(profile_b_left),
-                'matches': len(profile_b_matches),
-                'match_rate': profile_b_match_rate
-            },
-            'winner': winner,
-            'confidence': confidence,
-            'recommendation': self._generate_recommendation(winner, profile_a_match_rate, profile_b_match_rate)
-        }
+    def _confidence_percent(self) -> int:
+        """信賴水準（百分比，如 95）"""
+        return int(round((1 - self.alpha) * 100))
 
-    def _generate_recommendation(self, winner: str, rate_a: float, rate_b: float) -> str:
+    def _generate_recommendation(self, winner: str, significance: Optional[Dict]) -> str:
         """
         生成建議
         
         Args:
             winner: 勝者
-            rate_a: Profile A 配對率
-            rate_b: Profile B 配對率
+            significance: analyze_arms 的檢定結果
             
         Returns:
             建議文字
         """
-        if winner == 'profile_a':
-            improvement = ((rate_a - rate_b) / rate_b * 100) if rate_b > 0 else 100
-            return f"建議使用 Profile A，配對率高出 {improvement:.1f}%"
-        elif winner == 'profile_b':
-            improvement = ((rate_b - rate_a) / rate_a * 100) if rate_a > 0 else 100
-            return f"建議使用 Profile B，配對率高出 {improvement:.1f}%"
-        else:
-            return "兩個檔案表現相近，建議繼續測試或混合使用"
+        if significance is None:
+            return "測試組不足，無法比較"
+
+        low, high = significance['difference_ci']
+        interval = f"{self._confidence_percent()}% CI {low:+.2f} ~ {high:+.2f}"
+        if winner != 'tie':
+            return (f"建議使用 {_arm_label(winner)}，配對率高出 {significance['difference']:.2f} 個百分點"
+                    f"（{interval}），勝出機率 {significance['prob_beats_runner_up']:.1%}")
+        return (f"差異未達統計顯著（p = {significance['p_value']:.3f}，{interval} 個百分點），"
+                f"建議繼續測試或混合使用")
 
     def generate_report(self, test_results: Dict) -> str:
         """
@@ -166,26 +770,31 @@ class ABTestManager:
         report.append("=" * 60)
         report.append("")
 
-        # Profile A 結果
-        report.append("Profile A 表現:")
-        report.append(f"  總滑卡數: {test_results['profile_a']['total_swipes']}")
-        report.append(f"  右滑數: {test_results['profile_a']['right_swipes']}")
-        report.append(f"  配對數: {test_results['profile_a']['matches']}")
-        report.append(f"  配對率: {test_results['profile_a']['match_rate']:.2f}%")
-        report.append("")
-
-        # Profile B 結果
-        report.append("Profile B 表現:")
-        report.append(f"  總滑卡數: {test_results['profile_b']['total_swipes']}")
-        report.append(f"  右滑數: {test_results['profile_b']['right_swipes']}")
-        report.append(f"  配對數: {test_results['profile_b']['matches']}")
-        report.append(f"  配對率: {test_results['profile_b']['match_rate']:.2f}%")
-        report.append("")
+        # 各組結果
+        for name, arm in test_results['arms'].items():
+            report.append(f"{_arm_label(name)} 表現:")
+            report.append(f"  總滑卡數: {arm['total_swipes']}")
+            report.append(f"  右滑數: {arm['right_swipes']}")
+            report.append(f"  配對數: {arm['matches']}")
+            report.append(f"  配對率: {arm['match_rate']:.2f}%")
+            if 'match_rate_ci' in arm:
+                low, high = arm['match_rate_ci']
+                report.append(f"  配對率 {self._confidence_percent()}% 信賴區間: {low:.2f}% ~ {high:.2f}%")
+                report.append(f"  為最佳的機率: {arm['prob_best']:.1%}")
+            report.append("")
 
         # 結論
         report.append("測試結論:")
         report.append(f"  勝者: {test_results['winner'].upper()}")
         report.append(f"  信心水準: {test_results['confidence'].upper()}")
+        significance = test_results.get('significance')
+        if significance:
+            compared = ' vs '.join(_arm_label(name) for name in significance['compared'])
+            low, high = significance['difference_ci']
+            report.append(f"  比較: {compared}（{'Fisher 精確檢定' if significance['test'] == 'fisher' else '兩比例 z 檢定'}）")
+            report.append(f"  配對率差異: {significance['difference']:+.2f} 個百分點"
+                          f"（{self._confidence_percent()}% CI {low:+.2f} ~ {high:+.2f}）")
+            report.append(f"  p 值: {significance['p_value']:.4f}")
         report.append(f"  建議: {test_results['recommendation']}")
         report.append("")
         report.append("=" * 60)
@@ -3,30 +3,88 @@ AI 評分系統
 根據個人檔案特徵為對象評分，預測配對可能性
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 import pickle
 import os
 
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import StandardScaler
 
-from profile_analyzer import ProfileAnalyzer
+from analysis_cache import AnalysisCache
+from profile_analyzer import ProfileAnalysis, ProfileAnalyzer
+
+# 特徵向量欄位順序（與 extract_features 一致）
+FEATURE_NAMES = [
+    'age',
+    'distance',
+    'bio_length',
+    'photo_count',
+    'polarity',
+    'subjectivity',
+    'interest_count',
+    'emoji_count',
+    'keyword_count',
+]
+
+# 由資料庫訓練時需要的 swipe_records 欄位（串流讀取時只讀這些欄位）
+TRAINING_COLUMNS = ('target_name', 'target_age', 'target_bio', 'target_distance', 'target_photos', 'is_match')
+
+
+def swipe_record_to_profile(record: Dict) -> Dict:
+    """
+    將 swipe_records 欄位轉為個人檔案格式
+
+    Args:
+        record: 滑卡記錄（資料庫欄位名稱）
+
+    Returns:
+        個人檔案資料
+    """
+    return {
+        'name': record.get('target_name') or '',
+        'age': record.get('target_age') or 0,
+        'bio': record.get('target_bio') or '',
+        'distance': record.get('target_distance') or 0,
+        'photos': record.get('target_photos') or []
+    }
+
+
+def frame_to_profiles(frame) -> List[Dict]:
+    """
+    將 swipe_records 欄位的 DataFrame 轉為個人檔案列表（逐欄取值，不先建立每列的記錄字典）
+
+    Args:
+        frame: 滑卡記錄 DataFrame（需包含 target_* 欄位）
+
+    Returns:
+        個人檔案資料列表（格式同 swipe_record_to_profile）
+    """
+    return [
+        {'name': name, 'age': age, 'bio': bio, 'distance': distance, 'photos': [] if photos is None else list(photos)}
+        for name, age, bio, distance, photos in zip(
+            frame['target_name'].fillna('').tolist(),
+            frame['target_age'].fillna(0).astype(int).tolist(),
+            frame['target_bio'].fillna('').tolist(),
+            frame['target_distance'].fillna(0).astype(int).tolist(),
+            frame['target_photos'].tolist()
+        )
+    ]
 
 
 class AIScorer:
     """AI 評分系統類別"""
 
-    def __init__(self, model_path: Optional[str] = None):
+    def __init__(self, model_path: Optional[str] = None, cache: Optional[AnalysisCache] = None):
         """
         初始化 AI 評分系統
         
         Args:
             model_path: 已訓練模型的路徑
+            cache: 簡介分析快取
         """
-        self.analyzer = ProfileAnalyzer()
+        self.analyzer = ProfileAnalyzer(cache=cache)
         self.model = None
-        self.scaler = StandardScaler()
+        # scikit-learn 只在訓練或載入模型時才需要，規則評分不匯入
+        self.scaler = None
         self.feature_names = []
         
         if model_path and os.path.exists(model_path):
@@ -35,71 +93,128 @@ class AIScorer:
             # 使用預設的規則基礎評分
             self.use_rule_based = True
 
-    def extract_features(self, profile_data: Dict) -> np.ndarray:
+    def analyze(self, profile_data: Dict) -> ProfileAnalysis:
+        """
+        分析個人檔案，結果可重複傳入各評分步驟
+        
+        Args:
+            profile_data: 個人檔案資料
+            
+        Returns:
+            ProfileAnalysis 分析結果
+        """
+        return self.analyzer.analyze(profile_data)
+
+    def extract_features(
+        self,
+        profile_data: Dict,
+        analysis: Optional[ProfileAnalysis] = None
+    ) -> np.ndarray:
         """
         從個人檔案提取特徵向量
         
         Args:
             profile_data: 個人檔案資料
+            analysis: 已計算的分析結果，未提供時重新分析
             
         Returns:
             特徵向量
         """
-        analysis = self.analyzer.analyze_profile(profile_data)
+        if analysis is None:
+            analysis = self.analyze(profile_data)
         
         features = []
         
         # 1. 年齡特徵
-        features.append(analysis.get('age', 0))
+        features.append(analysis.age)
         
         # 2. 距離特徵
-        features.append(analysis.get('distance', 0))
+        features.append(analysis.distance)
         
         # 3. 簡介長度
-        features.append(analysis.get('bio_length', 0))
+        features.append(analysis.bio_length)
         
         # 4. 照片數量
-        features.append(analysis.get('photo_count', 0))
+        features.append(analysis.photo_count)
         
         # 5. 情感分數
-        sentiment = analysis.get('sentiment', {})
-        features.append(sentiment.get('polarity', 0))
-        features.append(sentiment.get('subjectivity', 0))
+        features.append(analysis.polarity)
+        features.append(analysis.subjectivity)
         
         # 6. 興趣數量
-        features.append(len(analysis.get('interests', [])))
+        features.append(len(analysis.interests))
         
         # 7. Emoji 使用
-        features.append(len(analysis.get('emojis', [])))
+        features.append(len(analysis.emojis))
         
         # 8. 關鍵字多樣性
-        features.append(len(analysis.get('keywords', [])))
+        features.append(len(analysis.keywords))
         
         return np.array(features).reshape(1, -1)
 
-    def rule_based_score(self, profile_data: Dict) -> float:
+    def extract_features_batch(
+        self,
+        profiles: List[Dict],
+        analyses: Optional[List[ProfileAnalysis]] = None
+    ) -> np.ndarray:
+        """
+        批次提取特徵矩陣
+        
+        Args:
+            profiles: 個人檔案資料列表
+            analyses: 與 profiles 對應的已計算分析結果，未提供時重新分析
+            
+        Returns:
+            特徵矩陣，形狀為 (len(profiles), len(FEATURE_NAMES))
+        """
+        if analyses is None:
+            analyses = [self.analyze(profile) for profile in profiles]
+
+        matrix = np.empty((len(analyses), len(FEATURE_NAMES)), dtype=float)
+        for i, analysis in enumerate(analyses):
+            matrix[i] = (
+                analysis.age,
+                analysis.distance,
+                analysis.bio_length,
+                analysis.photo_count,
+                analysis.polarity,
+                analysis.subjectivity,
+                len(analysis.interests),
+                len(analysis.emojis),
+                len(analysis.keywords),
+            )
+
+        return matrix
+
+    def rule_based_score(
+        self,
+        profile_data: Dict,
+        analysis: Optional[ProfileAnalysis] = None
+    ) -> float:
         """
         基於規則的評分系統
         
         Args:
             profile_data: 個人檔案資料
+            analysis: 已計算的分析結果，未提供時重新分析
             
         Returns:
             評分 (0-100)
         """
         score = 50.0  # 基礎分數
         
-        analysis = self.analyzer.analyze_profile(profile_data)
+        if analysis is None:
+            analysis = self.analyze(profile_data)
         
         # 年齡偏好 (假設偏好 24-32 歲)
-        age = analysis.get('age', 0)
+        age = analysis.age
         if 24 <= age <= 32:
             score += 10
         elif 20 <= age <= 35:
             score += 5
         
         # 距離偏好 (越近越好，但不要太近)
-        distance = analysis.get('distance', 0)
+        distance = analysis.distance
         if 2 <= distance <= 10:
             score += 10
         elif distance <= 20:
@@ -108,7 +223,7 @@ class AIScorer:
             score -= 10
         
         # 簡介品質
-        bio_length = analysis.get('bio_length', 0)
+        bio_length = analysis.bio_length
         if 50 <= bio_length <= 300:
             score += 10
         elif 20 <= bio_length <= 500:
@@ -117,7 +232,7 @@ class AIScorer:
             score -= 15
         
         # 照片數量
-        photo_count = analysis.get('photo_count', 0)
+        photo_count = analysis.photo_count
         if photo_count >= 4:
             score += 10
         elif photo_count >= 2:
@@ -126,22 +241,21 @@ class AIScorer:
             score -= 10
         
         # 情感分析
-        sentiment = analysis.get('sentiment', {})
-        polarity = sentiment.get('polarity', 0)
+        polarity = analysis.polarity
         if polarity > 0.2:  # 正面情緒
             score += 10
         elif polarity < -0.2:  # 負面情緒
             score -= 5
         
         # 興趣豐富度
-        interests_count = len(analysis.get('interests', []))
+        interests_count = len(analysis.interests)
         if interests_count >= 3:
             score += 10
         elif interests_count >= 1:
             score += 5
         
         # Emoji 使用適度性
-        emoji_count = len(analysis.get('emojis', []))
+        emoji_count = len(analysis.emojis)
         if 1 <= emoji_count <= 5:
             score += 5
         elif emoji_count > 10:
@@ -150,18 +264,110 @@ class AIScorer:
         # 確保分數在 0-100 範圍內
         return max(0, min(100, score))
 
-    def predict_score(self, profile_data: Dict) -> Dict:
+    def rule_based_scores(self, features: np.ndarray) -> np.ndarray:
+        """
+        以陣列運算對特徵矩陣套用規則評分，結果與 rule_based_score 逐筆一致
+        
+        Args:
+            features: extract_features_batch 產生的特徵矩陣
+            
+        Returns:
+            評分陣列 (0-100)
+        """
+        columns = dict(zip(FEATURE_NAMES, features.T))
+        age = columns['age']
+        distance = columns['distance']
+        bio_length = columns['bio_length']
+        photo_count = columns['photo_count']
+        polarity = columns['polarity']
+        interests_count = columns['interest_count']
+        emoji_count = columns['emoji_count']
+
+        score = np.full(len(features), 50.0)
+
+        # 年齡偏好 (假設偏好 24-32 歲)
+        score += np.select(
+            [(age >= 24) & (age <= 32), (age >= 20) & (age <= 35)],
+            [10, 5], 0
+        )
+
+        # 距離偏好
+        score += np.select(
+            [(distance >= 2) & (distance <= 10), distance <= 20, distance > 50],
+            [10, 5, -10], 0
+        )
+
+        # 簡介品質
+        score += np.select(
+            [(bio_length >= 50) & (bio_length <= 300), (bio_length >= 20) & (bio_length <= 500), bio_length == 0],
+            [10, 5, -15], 0
+        )
+
+        # 照片數量
+        score += np.select([photo_count >= 4, photo_count >= 2, photo_count <= 1], [10, 5, -10], 0)
+
+        # 情感分析
+        score += np.select([polarity > 0.2, polarity < -0.2], [10, -5], 0)
+
+        # 興趣豐富度
+        score += np.select([interests_count >= 3, interests_count >= 1], [10, 5], 0)
+
+        # Emoji 使用適度性
+        score += np.select([(emoji_count >= 1) & (emoji_count <= 5), emoji_count > 10], [5, -5], 0)
+
+        return np.clip(score, 0, 100)
+
+    def predict_scores(
+        self,
+        profiles: List[Dict],
+        analyses: Optional[List[ProfileAnalysis]] = None
+    ) -> np.ndarray:
+        """
+        批次預測評分
+        
+        一次建立特徵矩陣，模型只呼叫一次 transform/predict_proba；
+        規則評分以陣列運算完成。結果與 predict_score 逐筆計算的分數
+        （四捨五入前）一致。
+        
+        Args:
+            profiles: 個人檔案資料列表
+            analyses: 與 profiles 對應的已計算分析結果，未提供時重新分析
+            
+        Returns:
+            評分陣列 (0-100)
+        """
+        features = self.extract_features_batch(profiles, analyses)
+
+        if len(features) == 0:
+            return np.empty(0)
+
+        if self.model is not None and not self.use_rule_based:
+            features_scaled = self.scaler.transform(features)
+            return self.model.predict_proba(features_scaled)[:, 1] * 100
+
+        return self.rule_based_scores(features)
+
+    def predict_score(
+        self,
+        profile_data: Dict,
+        analysis: Optional[ProfileAnalysis] = None
+    ) -> Dict:
         """
         預測評分
         
         Args:
             profile_data: 個人檔案資料
+            analysis: 已計算的分析結果，未提供時重新分析
             
         Returns:
             包含分數和理由的字典
         """
+        # 只分析一次，後續步驟共用同一份結果
+        if analysis is None:
+            analysis = self.analyze(profile_data)
+        
         # 提取特徵
-        features = self.extract_features(profile_data)
+        features = self.extract_features(profile_data, analysis)
         
         # 計算分數
         if self.model is not None and not self.use_rule_based:
@@ -172,11 +378,11 @@ class AIScorer:
             method = 'ml_model'
         else:
             # 使用規則基礎評分
-            score = self.rule_based_score(profile_data)
+            score = self.rule_based_score(profile_data, analysis)
             method = 'rule_based'
         
         # 生成決策理由
-        reason = self._generate_decision_reason(profile_data, score)
+        reason = self._generate_decision_reason(profile_data, score, analysis)
         
         return {
             'score': round(score, 2),
@@ -185,44 +391,73 @@ class AIScorer:
             'recommendation': 'right' if score >= 60 else 'left'
         }
 
-    def _generate_decision_reason(self, profile_data: Dict, score: float) -> str:
+    def fallback_score(self, profile_data: Dict) -> Dict:
+        """
+        快速規則評分，用於評分超過延遲預算時的備援
+        
+        不執行分詞與情感分析（快取命中時仍使用完整分析結果），
+        回傳格式與 predict_score 相同。
+        
+        Args:
+            profile_data: 個人檔案資料
+            
+        Returns:
+            包含分數和理由的字典
+        """
+        analysis = self.analyzer.analyze(profile_data, nlp=False)
+        score = self.rule_based_score(profile_data, analysis)
+
+        return {
+            'score': round(score, 2),
+            'method': 'rule_based_fallback',
+            'reason': self._generate_decision_reason(profile_data, score, analysis),
+            'recommendation': 'right' if score >= 60 else 'left'
+        }
+
+    def _generate_decision_reason(
+        self,
+        profile_data: Dict,
+        score: float,
+        analysis: Optional[ProfileAnalysis] = None
+    ) -> str:
         """
         生成決策理由
         
         Args:
             profile_data: 個人檔案資料
             score: 評分
+            analysis: 已計算的分析結果，未提供時重新分析
             
         Returns:
             決策理由文字
         """
-        analysis = self.analyzer.analyze_profile(profile_data)
+        if analysis is None:
+            analysis = self.analyze(profile_data)
         reasons = []
         
         # 正面因素
-        if analysis.get('photo_count', 0) >= 4:
+        if analysis.photo_count >= 4:
             reasons.append("照片數量充足")
         
-        if 50 <= analysis.get('bio_length', 0) <= 300:
+        if 50 <= analysis.bio_length <= 300:
             reasons.append("簡介詳細適中")
         
-        interests = analysis.get('interests', [])
+        interests = analysis.interests
         if len(interests) >= 3:
             reasons.append(f"興趣廣泛 ({', '.join(interests[:3])})")
         
-        sentiment = analysis.get('sentiment', {})
-        if sentiment.get('polarity', 0) > 0.2:
+        if analysis.polarity > 0.2:
             reasons.append("態度積極正面")
         
-        distance = analysis.get('distance', 0)
+        distance = analysis.distance
         if distance <= 10:
             reasons.append(f"距離適中 ({distance}km)")
         
         # 負面因素
-        if analysis.get('bio_length', 0) == 0:
+        if analysis.bio_length == 0:
             reasons.append("缺少個人簡介")
         
-        if analysis.get('photo_count', 0) <= 1:
+        if analysis.photo_count <= 1:
             reasons.append("照片數量不足")
         
         if not reasons:
@@ -239,16 +474,75 @@ class AIScorer:
             labels: 標籤列表 (1=配對成功, 0=未配對)
         """
         # 提取特徵
-        X = np.vstack([self.extract_features(data) for data in training_data])
+        X = self.extract_features_batch(training_data)
         y = np.array(labels)
+        self._fit(X, y)
+
+    def train_model_from_records(self, record_batches: Iterable[List[Dict]]):
+        """
+        以分批讀取的滑卡記錄訓練模型
         
+        Args:
+            record_batches: 分批的滑卡記錄（需包含 TRAINING_COLUMNS），
+                如 DatabaseClient.stream_swipe_records 的輸出；標籤為 is_match
+        """
+        import pandas as pd
+
+        self.train_model_from_frames(pd.DataFrame.from_records(batch) for batch in record_batches)
+
+    def train_model_from_frames(self, frames: Iterable['pd.DataFrame']):
+        """
+        以分批的滑卡記錄 DataFrame 訓練模型，每批只保留特徵矩陣，不保留原始記錄
+        
+        Args:
+            frames: 分批的滑卡記錄（需包含 TRAINING_COLUMNS），
+                如 DatabaseClient.stream_swipe_frames 或 swipe_dataset.iter_swipe_frames 的輸出；標籤為 is_match
+        """
+        features = []
+        labels = []
+        for frame in frames:
+            if not len(frame):
+                continue
+            features.append(self.extract_features_batch(frame_to_profiles(frame)))
+            labels.append(frame['is_match'].eq(True).to_numpy(dtype=np.int8))
+
+        if not features:
+            raise ValueError("沒有可供訓練的記錄")
+
+        self._fit(np.vstack(features), np.concatenate(labels))
+
+    def train_model_from_parquet(self, root: str, dating_account_id: Optional[int] = None):
+        """
+        以 Parquet 資料集中的右滑記錄訓練模型（不連線資料庫）
+        
+        Args:
+            root: 資料集根目錄（swipe_dataset.write_swipe_dataset 的輸出）
+            dating_account_id: 社交帳號 ID，未提供時使用所有帳號
+        """
+        from swipe_dataset import iter_swipe_frames
+
+        # 只有右滑（含超級喜歡）才可能配對
+        self.train_model_from_frames(iter_swipe_frames(
+            root,
+            columns=TRAINING_COLUMNS,
+            dating_account_id=dating_account_id,
+            directions=('right', 'super')
+        ))
+
+    def _fit(self, X: np.ndarray, y: np.ndarray):
+        """標準化特徵並訓練隨機森林"""
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.preprocessing import StandardScaler
+
         # 標準化特徵
+        self.scaler = StandardScaler()
         X_scaled = self.scaler.fit_transform(X)
         
         # 訓練模型
         self.model = RandomForestClassifier(n_estimators=100, random_state=42)
         self.model.fit(X_scaled, y)
         
+        self.feature_names = list(FEATURE_NAMES)
         self.use_rule_based = False
         
         # 計算準確率
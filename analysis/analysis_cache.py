@@ -0,0 +1,163 @@
+"""
+個人檔案分析快取
+以簡介文字的雜湊為鍵，快取關鍵字、情感、興趣與 emoji 分析結果
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+class AnalysisCache:
+    """
+    內容定址的分析快取
+
+    記憶體層為容量有限的 LRU；可選的 SQLite 層在程式重啟後仍保留結果。
+    鍵包含分析器版本，版本變更時舊項目不會再命中，並會在開啟時清除。
+    """
+
+    def __init__(self, version: str, max_entries: int = 10000, db_path: Optional[str] = None):
+        """
+        初始化分析快取
+
+        Args:
+            version: 分析器版本，變更時既有快取失效
+            max_entries: 記憶體 LRU 的最大項目數
+            db_path: SQLite 檔案路徑，未提供時僅使用記憶體
+        """
+        self.version = version
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        if db_path:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS analysis_cache ('
+                'key TEXT PRIMARY KEY, version TEXT NOT NULL, payload TEXT NOT NULL)'
+            )
+            self._conn.execute('DELETE FROM analysis_cache WHERE version != ?', (version,))
+            self._conn.commit()
+
+    def make_key(self, text: str) -> str:
+        """
+        計算文字的快取鍵
+
+        Args:
+            text: 簡介文字
+
+        Returns:
+            SHA-256 十六進位字串
+        """
+        return hashlib.sha256(f'{self.version}\0{text}'.encode('utf-8')).hexdigest()
+
+    def get(self, text: str) -> Optional[Dict]:
+        """
+        讀取快取的分析結果
+
+        Args:
+            text: 簡介文字
+
+        Returns:
+            分析結果字典，未命中時為 None
+        """
+        key = self.make_key(text)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    'SELECT payload FROM analysis_cache WHERE key = ?', (key,)
+                ).fetchone()
+                if row is not None:
+                    entry = self._decode(row[0])
+                    self._remember(key, entry)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return entry
+
+            self.misses += 1
+            return None
+
+    def put(self, text: str, entry: Dict):
+        """
+        寫入分析結果
+
+        Args:
+            text: 簡介文字
+            entry: 分析結果字典 (keywords, sentiment, interests, emojis)
+        """
+        key = self.make_key(text)
+
+        with self._lock:
+            self._remember(key, entry)
+            if self._conn is not None:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO analysis_cache (key, version, payload) VALUES (?, ?, ?)',
+                    (key, self.version, json.dumps(entry, ensure_ascii=False))
+                )
+                self._conn.commit()
+
+    def invalidate(self, version: Optional[str] = None):
+        """
+        清除快取；提供新版本時改用新版本並清除所有舊項目
+
+        Args:
+            version: 新的分析器版本
+        """
+        with self._lock:
+            if version is not None:
+                self.version = version
+            self._entries.clear()
+            if self._conn is not None:
+                self._conn.execute('DELETE FROM analysis_cache')
+                self._conn.commit()
+
+    def stats(self) -> Dict:
+        """
+        取得快取統計
+
+        Returns:
+            命中、未命中與容量資訊
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'disk_hits': self.disk_hits,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'entries': len(self._entries),
+            'max_entries': self.max_entries
+        }
+
+    def close(self):
+        """關閉 SQLite 連線"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _remember(self, key: str, entry: Dict):
+        """寫入記憶體 LRU 並淘汰最久未使用的項目"""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    @staticmethod
+    def _decode(payload: str) -> Dict:
+        """還原 JSON 序列化後的分析結果"""
+        entry = json.loads(payload)
+        entry['keywords'] = [tuple(item) for item in entry.get('keywords', [])]
+        return entry
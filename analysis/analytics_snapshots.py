@@ -0,0 +1,258 @@
+"""
+每日分析快照
+將已結束日期的滑卡記錄彙總寫入 analytics_snapshots，報告只需讀取快照，
+並僅掃描最後一筆快照之後（通常只有今天）的原始記錄
+"""
+
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from stats_generator import STATS_COLUMNS
+from stats_state import SwipeStatsState, ValueStats
+
+# 快照需要的 swipe_records 欄位
+SNAPSHOT_COLUMNS = STATS_COLUMNS + ('ai_score',)
+
+
+def _percent(part: int, total: int) -> Optional[float]:
+    return round(part / total * 100, 2) if total else None
+
+
+def _floor_day(moment: datetime) -> datetime:
+    """當天的午夜"""
+    return datetime.combine(moment.date(), time.min)
+
+
+def _ceil_day(moment: datetime) -> datetime:
+    """不早於指定時間的第一個午夜"""
+    midnight = _floor_day(moment)
+    return midnight if midnight == moment else midnight + timedelta(days=1)
+
+
+def build_snapshots(frames: Iterable[pd.DataFrame], dating_account_id: int) -> List[Dict]:
+    """
+    將一個帳號的滑卡記錄依日期彙總為快照
+
+    Args:
+        frames: 分批的滑卡記錄（至少包含 SNAPSHOT_COLUMNS）
+        dating_account_id: 社交帳號 ID
+
+    Returns:
+        快照列表（analytics_snapshots 欄位名稱），依日期排序
+    """
+    states: Dict[date, SwipeStatsState] = {}
+    ai_scores: Dict[date, Tuple[float, int]] = {}
+
+    for frame in frames:
+        if frame.empty:
+            continue
+        days = pd.to_datetime(frame['swiped_at']).dt.date
+        for day, group in frame.groupby(days):
+            states.setdefault(day, SwipeStatsState()).update(group)
+            scores = pd.to_numeric(group['ai_score'], errors='coerce').dropna()
+            total, count = ai_scores.get(day, (0.0, 0))
+            ai_scores[day] = (total + float(scores.sum()), count + len(scores))
+
+    return [
+        snapshot_from_state(dating_account_id, day, states[day], *ai_scores[day])
+        for day in sorted(states)
+    ]
+
+
+def snapshot_from_state(
+    dating_account_id: int,
+    snapshot_date: date,
+    state: SwipeStatsState,
+    ai_score_sum: float = 0.0,
+    ai_score_count: int = 0
+) -> Dict:
+    """
+    將單日的統計狀態轉為快照
+
+    固定欄位存放次數與比率；年齡、距離、時段分布等可合併的統計存放於 metadata，
+    讓多日快照能還原為 SwipeStatsState 後合併。
+
+    Args:
+        dating_account_id: 社交帳號 ID
+        snapshot_date: 快照日期
+        state: 該日的統計狀態
+        ai_score_sum: 該日 AI 評分總和
+        ai_score_count: 該日有 AI 評分的記錄數
+
+    Returns:
+        快照（analytics_snapshots 欄位名稱）
+    """
+    right_swipes = state.direction_counts.get('right', 0)
+    data = state.to_dict()
+
+    return {
+        'dating_account_id': dating_account_id,
+        'profile_id': None,
+        'ab_test_id': None,
+        'snapshot_date': snapshot_date,
+        'total_swipes': state.total,
+        'right_swipes': right_swipes,
+        'left_swipes': state.direction_counts.get('left', 0),
+        'matches_count': state.match_count,
+        'match_rate': _percent(state.match_count, state.total),
+        'message_response_rate': None,
+        'avg_ai_score': round(ai_score_sum / ai_score_count, 2) if ai_score_count else None,
+        'metadata': {
+            'right_swipe_rate': _percent(right_swipes, state.total),
+            'direction_counts': data['direction_counts'],
+            'hourly': data['hourly'],
+            'age': data['age'],
+            'distance': data['distance'],
+            'first_swiped_at': data['first_swiped_at'],
+            'last_swiped_at': data['last_swiped_at']
+        }
+    }
+
+
+def state_from_snapshot(snapshot: Dict) -> SwipeStatsState:
+    """
+    將快照還原為統計狀態
+
+    Args:
+        snapshot: get_analytics_snapshots 回傳的快照
+
+    Returns:
+        該日的統計狀態
+    """
+    metadata = snapshot.get('metadata') or {}
+    snapshot_date = snapshot['snapshot_date']
+    day = snapshot_date.isoformat() if isinstance(snapshot_date, date) else str(snapshot_date)
+
+    # 沒有 metadata 的快照（如其他程式寫入）只還原次數
+    direction_counts = metadata.get('direction_counts') or {
+        'right': snapshot.get('right_swipes') or 0,
+        'left': snapshot.get('left_swipes') or 0
+    }
+    return SwipeStatsState(
+        total=snapshot.get('total_swipes') or 0,
+        direction_counts={direction: count for direction, count in direction_counts.items() if count},
+        match_count=snapshot.get('matches_count') or 0,
+        daily={day: [snapshot.get('total_swipes') or 0, snapshot.get('matches_count') or 0]},
+        hourly={int(hour): count for hour, count in metadata.get('hourly', {}).items()},
+        age=ValueStats.from_dict(metadata.get('age', {})),
+        distance=ValueStats.from_dict(metadata.get('distance', {})),
+        first_swiped_at=metadata.get('first_swiped_at'),
+        last_swiped_at=metadata.get('last_swiped_at')
+    )
+
+
+class SnapshotJob:
+    """
+    每日快照工作
+
+    只彙總已結束的日期（今天之前），每次由各帳號最後一筆快照的隔天開始，
+    重複執行不會重複計算已彙總的日期。
+    """
+
+    def __init__(self, db_client, batch_size: int = 10000):
+        """
+        Args:
+            db_client: DatabaseClient
+            batch_size: 讀取原始記錄的每批筆數
+        """
+        self.db_client = db_client
+        self.batch_size = batch_size
+
+    def _account_ids(self, dating_account_id: Optional[int]) -> List[int]:
+        if dating_account_id is not None:
+            return [dating_account_id]
+        return self.db_client.swipe_account_ids()
+
+    def _open_start(self, dating_account_id: int) -> Optional[datetime]:
+        """最後一筆快照之後的起始時間，尚無快照時為 None（由第一筆記錄開始）"""
+        last_date = self.db_client.last_snapshot_date(dating_account_id)
+        if last_date is None:
+            return None
+        return datetime.combine(last_date + timedelta(days=1), time.min)
+
+    def run(
+        self,
+        dating_account_id: Optional[int] = None,
+        until: Optional[date] = None,
+        since: Optional[date] = None
+    ) -> int:
+        """
+        彙總尚未建立快照的日期
+
+        Args:
+            dating_account_id: 社交帳號 ID，未提供時處理所有帳號
+            until: 彙總到此日期之前（不含），預設為今天
+            since: 由此日期起重新彙總（含），用於補寫遲到的記錄；預設由最後一筆快照的隔天開始
+
+        Returns:
+            寫入的快照筆數
+        """
+        end = datetime.combine(until or date.today(), time.min)
+        written = 0
+
+        for account_id in self._account_ids(dating_account_id):
+            start = datetime.combine(since, time.min) if since else self._open_start(account_id)
+            if start is not None and start >= end:
+                continue
+
+            frames = self.db_client.stream_swipe_frames(
+                dating_account_id=account_id,
+                start=start,
+                end=end,
+                columns=SNAPSHOT_COLUMNS,
+                batch_size=self.batch_size
+            )
+            written += self.db_client.save_analytics_snapshots(build_snapshots(frames, account_id))
+
+        return written
+
+    def load_state(
+        self,
+        dating_account_id: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> SwipeStatsState:
+        """
+        合併快照與尚未彙總的原始記錄，取得完整的統計狀態
+
+        Args:
+            dating_account_id: 社交帳號 ID，未提供時合併所有帳號
+            start: 起始時間（含）
+            end: 結束時間（不含）
+
+        Returns:
+            可交給 StatsGenerator.generate_comprehensive_report 的統計狀態
+        """
+        state = SwipeStatsState()
+        for account_id in self._account_ids(dating_account_id):
+            raw_ranges = [(start, end)]
+            open_start = self._open_start(account_id)
+
+            # 完整落在範圍內且已彙總的日期讀取快照，範圍頭尾不滿一天的部分與最後一筆快照之後掃描原始記錄
+            if open_start is not None:
+                snapshot_start = _ceil_day(start) if start is not None else None
+                snapshot_end = open_start if end is None else min(_floor_day(end), open_start)
+                if snapshot_start is None or snapshot_start < snapshot_end:
+                    for snapshot in self.db_client.get_analytics_snapshots(
+                        account_id,
+                        start=snapshot_start.date() if snapshot_start is not None else None,
+                        end=snapshot_end.date()
+                    ):
+                        state.merge(state_from_snapshot(snapshot))
+                    raw_ranges = [(start, snapshot_start), (snapshot_end, end)] if start is not None else [(snapshot_end, end)]
+
+            for raw_start, raw_end in raw_ranges:
+                if raw_start is not None and raw_end is not None and raw_start >= raw_end:
+                    continue
+                for frame in self.db_client.stream_swipe_frames(
+                    dating_account_id=account_id,
+                    start=raw_start,
+                    end=raw_end,
+                    columns=STATS_COLUMNS,
+                    batch_size=self.batch_size
+                ):
+                    state.update(frame)
+
+        return state
@@ -0,0 +1,118 @@
+"""
+興趣關鍵字比對器
+將興趣分類的關鍵字預先編譯為單一正規表示式，一次掃描即可找出所有分類
+"""
+
+import hashlib
+import json
+import re
+from typing import Dict, List, Optional
+
+# 常見興趣關鍵字
+DEFAULT_INTEREST_TAXONOMY = {
+    'sports': ['gym', 'fitness', 'yoga', 'running', 'swimming', 'sports', 'workout'],
+    'music': ['music', 'concert', 'guitar', 'piano', 'singing', 'band'],
+    'food': ['foodie', 'cooking', 'chef', 'food', 'wine', 'coffee', 'restaurant'],
+    'travel': ['travel', 'adventure', 'explore', 'wanderlust', 'hiking', 'backpacking'],
+    'arts': ['art', 'painting', 'drawing', 'photography', 'design', 'creative'],
+    'reading': ['books', 'reading', 'literature', 'novel', 'writer'],
+    'technology': ['tech', 'coding', 'programming', 'developer', 'engineer', 'startup'],
+    'pets': ['dog', 'cat', 'pet', 'puppy', 'kitten', 'animal'],
+    'movies': ['movie', 'film', 'cinema', 'netflix', 'series', 'tv'],
+    'nature': ['nature', 'outdoors', 'camping', 'beach', 'mountains', 'forest']
+}
+
+# 標記 trie 節點為關鍵字結尾的鍵
+_END = ''
+
+
+class InterestMatcher:
+    """
+    興趣關鍵字比對器
+
+    關鍵字依字首建成 trie 後轉為正規表示式，比對成本取決於文字長度與關鍵字
+    長度，而非關鍵字數量。關鍵字須出現在單字開頭（'dogs' 會命中 'dog'，
+    'party' 不會命中 'art'）。
+    """
+
+    def __init__(self, taxonomy: Optional[Dict[str, List[str]]] = None):
+        """
+        初始化比對器
+
+        Args:
+            taxonomy: 興趣分類與關鍵字，未提供時使用 DEFAULT_INTEREST_TAXONOMY
+        """
+        self.taxonomy = taxonomy if taxonomy is not None else DEFAULT_INTEREST_TAXONOMY
+        self._category_order = {category: i for i, category in enumerate(self.taxonomy)}
+        self._trie: Dict = {}
+        self._match_categories: Dict[str, frozenset] = {}
+
+        for category, keywords in self.taxonomy.items():
+            for keyword in keywords:
+                keyword = keyword.lower()
+                if not keyword:
+                    continue
+                node = self._trie
+                for char in keyword:
+                    node = node.setdefault(char, {})
+                node.setdefault(_END, set()).add(category)
+
+        trie_pattern = self._to_pattern(self._trie) if self._trie else '(?!)'
+        # 以 lookahead 擷取，讓每個單字開頭都能獨立比對（含重疊的多字關鍵字）
+        self._pattern = re.compile(r'(?<!\w)(?=(' + trie_pattern + '))')
+
+    @property
+    def fingerprint(self) -> str:
+        """分類內容的雜湊，用於區分不同的分類設定"""
+        payload = json.dumps(self.taxonomy, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:12]
+
+    def match(self, text: str) -> List[str]:
+        """
+        找出文字中出現的興趣分類
+
+        Args:
+            text: 待比對文字
+
+        Returns:
+            興趣分類列表，依分類設定的順序排列
+        """
+        found = set()
+
+        for matched in set(self._pattern.findall(text.lower())):
+            categories = self._match_categories.get(matched)
+            if categories is None:
+                categories = self._categories_for(matched)
+            found.update(categories)
+
+        return sorted(found, key=self._category_order.__getitem__)
+
+    def _categories_for(self, matched: str) -> frozenset:
+        """最長比對結果的所有字首關鍵字都算命中，結果記憶化"""
+        categories = set()
+        node = self._trie
+        for char in matched:
+            node = node[char]
+            categories.update(node.get(_END, ()))
+
+        categories = frozenset(categories)
+        self._match_categories[matched] = categories
+        return categories
+
+    def _to_pattern(self, node: Dict) -> str:
+        """將 trie 節點轉為正規表示式"""
+        branches = [
+            re.escape(char) + self._to_pattern(child)
+            for char, child in sorted(node.items())
+            if char != _END
+        ]
+
+        if not branches:
+            return ''
+
+        pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+
+        if _END in node:
+            pattern = '(?:' + pattern + ')?'
+
+        return pattern
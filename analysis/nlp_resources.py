@@ -0,0 +1,131 @@
+"""
+NLP 資源載入
+延遲載入 NLTK/TextBlob，並只從本機資料目錄解析 NLTK 資料，不在執行期下載
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Dict, FrozenSet, List
+
+# 專案內建的 NLTK 資料目錄（make setup-python 會下載至此）
+BUNDLED_NLTK_DATA_DIR = Path(__file__).resolve().parent.parent / 'nltk_data'
+
+# 所需的 NLTK 資源；分詞器在新版 NLTK 為 punkt_tab，舊版為 punkt
+REQUIRED_RESOURCES = {
+    'tokenizer': ['tokenizers/punkt_tab', 'tokenizers/punkt'],
+    'stopwords': ['corpora/stopwords'],
+}
+
+_lock = threading.Lock()
+_ready = False
+_stop_words: FrozenSet[str] = frozenset()
+
+
+class NLPResourceError(RuntimeError):
+    """找不到必要的 NLTK 資料"""
+
+
+def nltk_data_dirs() -> List[str]:
+    """
+    取得額外的 NLTK 資料目錄
+
+    Returns:
+        NLTK_DATA_DIR 環境變數（以路徑分隔符號分隔）與內建目錄
+    """
+    dirs = [d for d in os.getenv('NLTK_DATA_DIR', '').split(os.pathsep) if d]
+    dirs.append(str(BUNDLED_NLTK_DATA_DIR))
+    return dirs
+
+
+def ensure_resources():
+    """
+    確認 NLTK 資料可用，只在第一次呼叫時檢查
+
+    Raises:
+        NLPResourceError: 本機找不到必要資源
+    """
+    global _ready, _stop_words
+
+    if _ready:
+        return
+
+    with _lock:
+        if _ready:
+            return
+
+        import nltk
+
+        for data_dir in reversed(nltk_data_dirs()):
+            if data_dir not in nltk.data.path:
+                nltk.data.path.insert(0, data_dir)
+
+        missing = []
+        for name, candidates in REQUIRED_RESOURCES.items():
+            if not any(_has_resource(nltk, candidate) for candidate in candidates):
+                missing.append(candidates[0].split('/')[-1])
+
+        if missing:
+            raise NLPResourceError(
+                f"找不到 NLTK 資料: {', '.join(missing)}。"
+                f"請執行 `python -m nltk.downloader -d {BUNDLED_NLTK_DATA_DIR} punkt punkt_tab stopwords`，"
+                f"或將 NLTK_DATA_DIR 指向已下載的資料目錄"
+            )
+
+        from nltk.corpus import stopwords
+        _stop_words = frozenset(stopwords.words('english'))
+        _ready = True
+
+
+def get_stop_words() -> FrozenSet[str]:
+    """
+    取得英文停用詞
+
+    Returns:
+        停用詞集合
+    """
+    ensure_resources()
+    return _stop_words
+
+
+def word_tokenize(text: str) -> List[str]:
+    """
+    分詞
+
+    Args:
+        text: 待分詞文字
+
+    Returns:
+        詞彙列表
+    """
+    ensure_resources()
+    from nltk.tokenize import word_tokenize as nltk_word_tokenize
+    return nltk_word_tokenize(text)
+
+
+def sentiment(text: str) -> Dict[str, float]:
+    """
+    以 TextBlob 分析情感
+
+    Args:
+        text: 待分析文字
+
+    Returns:
+        包含 polarity 與 subjectivity 的字典
+    """
+    from textblob import TextBlob
+
+    result = TextBlob(text).sentiment
+    return {
+        'polarity': result.polarity,
+        'subjectivity': result.subjectivity
+    }
+
+
+def _has_resource(nltk_module, resource: str) -> bool:
+    """檢查單一 NLTK 資源是否存在"""
+    try:
+        nltk_module.data.find(resource)
+        return True
+    except LookupError:
+        return False
@@ -5,31 +5,82 @@
 
 import re
 from collections import Counter
-from typing import Dict, List, Tuple
+from dataclasses import asdict, dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from textblob import TextBlob
+from analysis_cache import AnalysisCache
+from interest_matcher import DEFAULT_INTEREST_TAXONOMY, InterestMatcher
+import nlp_resources
 
-# 下載必要的 NLTK 資料
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+# 分析邏輯版本；修改關鍵字、情感或興趣規則時遞增，使既有快取失效
+ANALYZER_VERSION = '2'
 
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
+
+@dataclass
+class ProfileAnalysis:
+    """
+    單一個人檔案的分析結果
+
+    由 ProfileAnalyzer.analyze 計算一次後，可直接傳給 AIScorer 的特徵提取、
+    規則評分與決策理由生成，避免重複分詞與情感分析。
+    """
+
+    name: str = ''
+    age: int = 0
+    distance: int = 0
+    bio_length: int = 0
+    keywords: List[Tuple[str, int]] = field(default_factory=list)
+    sentiment: Dict[str, float] = field(default_factory=lambda: {'polarity': 0.0, 'subjectivity': 0.0})
+    interests: List[str] = field(default_factory=list)
+    emojis: List[str] = field(default_factory=list)
+    photo_count: int = 0
+
+    @property
+    def polarity(self) -> float:
+        """情感極性"""
+        return self.sentiment.get('polarity', 0.0)
+
+    @property
+    def subjectivity(self) -> float:
+        """情感主觀性"""
+        return self.sentiment.get('subjectivity', 0.0)
+
+    def to_dict(self) -> Dict:
+        """轉換為 analyze_profile 的字典格式"""
+        return asdict(self)
 
 
 class ProfileAnalyzer:
     """個人檔案分析器類別"""
 
-    def __init__(self):
-        """初始化分析器"""
-        self.stop_words = set(stopwords.words('english'))
+    def __init__(
+        self,
+        cache: Optional[AnalysisCache] = None,
+        interest_taxonomy: Optional[Dict[str, List[str]]] = None
+    ):
+        """
+        初始化分析器
+        
+        Args:
+            cache: 簡介分析快取，未提供時每次重新分析
+            interest_taxonomy: 自訂興趣分類與關鍵字，未提供時使用預設分類
+        """
+        self.interest_matcher = InterestMatcher(interest_taxonomy)
+        self.cache = cache
+
+        # 自訂分類會改變興趣結果，需納入快取版本
+        self.version = ANALYZER_VERSION
+        if interest_taxonomy is not None and interest_taxonomy != DEFAULT_INTEREST_TAXONOMY:
+            self.version = f'{ANALYZER_VERSION}+{self.interest_matcher.fingerprint}'
+
+        # 快取由其他版本的分析器產生時全部作廢
+        if cache is not None and cache.version != self.version:
+            cache.invalidate(self.version)
+
+    @property
+    def stop_words(self) -> FrozenSet[str]:
+        """英文停用詞，第一次使用時才載入 NLTK 資料"""
+        return nlp_resources.get_stop_words()
 
     def extract_keywords(self, text: str, top_n: int = 10) -> List[Tuple[str, int]]:
         """
@@ -46,12 +97,13 @@ class ProfileAnalyzer:
             return []
 
         # 轉換為小寫並分詞
-        words = word_tokenize(text.lower())
+        words = nlp_resources.word_tokenize(text.lower())
 
         # 過濾停用詞和標點符號
+        stop_words = self.stop_words
         filtered_words = [
             word for word in words 
-            if word.isalnum() and word not in self.stop_words and len(word) > 2
+            if word.isalnum() and word not in stop_words and len(word) > 2
         ]
 
         # 統計詞頻
@@ -72,12 +124,9 @@ class ProfileAnalyzer:
         if not text:
             return {'polarity': 0.0, 'subjectivity': 0.0}
 
-        blob = TextBlob(text)
-        
-        return {
-            'polarity': blob.sentiment.polarity,  # -1 (negative) to 1 (positive)
-            'subjectivity': blob.sentiment.subjectivity  # 0 (objective) to 1 (subjective)
-        }
+        # polarity: -1 (negative) to 1 (positive)
+        # subjectivity: 0 (objective) to 1 (subjective)
+        return nlp_resources.sentiment(text)
 
     def detect_interests(self, bio: str) -> List[str]:
         """
@@ -89,28 +138,7 @@ class ProfileAnalyzer:
         Returns:
             興趣列表
         """
-        # 常見興趣關鍵字
-        interest_keywords = {
-            'sports': ['gym', 'fitness', 'yoga', 'running', 'swimming', 'sports', 'workout'],
-            'music': ['music', 'concert', 'guitar', 'piano', 'singing', 'band'],
-            'food': ['foodie', 'cooking', 'chef', 'food', 'wine', 'coffee', 'restaurant'],
-            'travel': ['travel', 'adventure', 'explore', 'wanderlust', 'hiking', 'backpacking'],
-            'arts': ['art', 'painting', 'drawing', 'photography', 'design', 'creative'],
-            'reading': ['books', 'reading', 'literature', 'novel', 'writer'],
-            'technology': ['tech', 'coding', 'programming', 'developer', 'engineer', 'startup'],
-            'pets': ['dog', 'cat', 'pet', 'puppy', 'kitten', 'animal'],
-            'movies': ['movie', 'film', 'cinema', 'netflix', 'series', 'tv'],
-            'nature': ['nature', 'outdoors', 'camping', 'beach', 'mountains', 'forest']
-        }
-
-        detected_interests = []
-        bio_lower = bio.lower()
-
-        for category, keywords in interest_keywords.items():
-            if any(keyword in bio_lower for keyword in keywords):
-                detected_interests.append(category)
-
-        return detected_interests
+        return self.interest_matcher.match(bio)
 
     def extract_emojis(self, text: str) -> List[str]:
         """
@@ -133,6 +161,71 @@ class ProfileAnalyzer:
 
         return emoji_pattern.findall(text)
 
+    def analyze_bio(self, bio: str, nlp: bool = True) -> Dict:
+        """
+        分析簡介文字，有快取時優先讀取快取
+        
+        Args:
+            bio: 個人簡介
+            nlp: 是否執行分詞與情感分析；為 False 且快取未命中時，
+                keywords 為空、sentiment 為中性，只計算興趣與 emoji
+            
+        Returns:
+            包含 keywords、sentiment、interests、emojis 的字典
+        """
+        entry = self.cache.get(bio) if self.cache is not None else None
+
+        if entry is None and not nlp:
+            entry = {
+                'keywords': [],
+                'sentiment': {'polarity': 0.0, 'subjectivity': 0.0},
+                'interests': self.detect_interests(bio),
+                'emojis': self.extract_emojis(bio)
+            }
+        elif entry is None:
+            entry = {
+                'keywords': self.extract_keywords(bio),
+                'sentiment': self.analyze_sentiment(bio),
+                'interests': self.detect_interests(bio),
+                'emojis': self.extract_emojis(bio)
+            }
+            if self.cache is not None:
+                self.cache.put(bio, entry)
+
+        # 回傳副本，避免呼叫端修改到快取內容
+        return {
+            'keywords': list(entry['keywords']),
+            'sentiment': dict(entry['sentiment']),
+            'interests': list(entry['interests']),
+            'emojis': list(entry['emojis'])
+        }
+
+    def analyze(self, profile_data: Dict, nlp: bool = True) -> ProfileAnalysis:
+        """
+        全面分析個人檔案，回傳型別化的分析結果
+        
+        Args:
+            profile_data: 個人檔案資料
+            nlp: 是否執行分詞與情感分析（見 analyze_bio）
+            
+        Returns:
+            ProfileAnalysis 分析結果
+        """
+        bio = profile_data.get('bio', '')
+        bio_analysis = self.analyze_bio(bio, nlp=nlp)
+
+        return ProfileAnalysis(
+            name=profile_data.get('name', ''),
+            age=profile_data.get('age', 0),
+            distance=profile_data.get('distance', 0),
+            bio_length=len(bio),
+            keywords=bio_analysis['keywords'],
+            sentiment=bio_analysis['sentiment'],
+            interests=bio_analysis['interests'],
+            emojis=bio_analysis['emojis'],
+            photo_count=len(profile_data.get('photos', []))
+        )
+
     def analyze_profile(self, profile_data: Dict) -> Dict:
         """
         全面分析個人檔案
@@ -143,21 +236,7 @@ class ProfileAnalyzer:
         Returns:
             分析結果
         """
-        bio = profile_data.get('bio', '')
-        
-        analysis = {
-            'name': profile_data.get('name', ''),
-            'age': profile_data.get('age', 0),
-            'distance': profile_data.get('distance', 0),
-            'bio_length': len(bio),
-            'keywords': self.extract_keywords(bio),
-            'sentiment': self.analyze_sentiment(bio),
-            'interests': self.detect_interests(bio),
-            'emojis': self.extract_emojis(bio),
-            'photo_count': len(profile_data.get('photos', []))
-        }
-
-        return analysis
+        return self.analyze(profile_data).to_dict()
 
     def analyze_batch(self, profiles: List[Dict]) -> Dict:
         """
@@ -176,12 +255,12 @@ class ProfileAnalyzer:
         avg_distance = 0
 
         for profile in profiles:
-            analysis = self.analyze_profile(profile)
-            all_keywords.extend([kw for kw, _ in analysis['keywords']])
-            all_interests.extend(analysis['interests'])
-            all_sentiments.append(analysis['sentiment']['polarity'])
-            avg_age += analysis['age']
-            avg_distance += analysis['distance']
+            analysis = self.analyze(profile)
+            all_keywords.extend([kw for kw, _ in analysis.keywords])
+            all_interests.extend(analysis.interests)
+            all_sentiments.append(analysis.polarity)
+            avg_age += analysis.age
+            avg_distance += analysis.distance
 
         profile_count = len(profiles)
 
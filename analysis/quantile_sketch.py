@@ -0,0 +1,222 @@
+"""
+近似分位數草圖（KLL）
+以固定記憶體串流估計分位數與直方圖，不同分片的草圖可合併
+"""
+
+import math
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# 預設 k：約保留 3k 個樣本，正規化排名誤差約 1.65%
+DEFAULT_K = 200
+
+
+class KLLSketch:
+    """
+    KLL 分位數草圖（Karnin, Lang, Liberty 2016）
+
+    第 h 層的每個樣本代表 2^h 筆原始資料；某層超過容量時排序後隨機保留奇數或偶數位置，
+    晉升至上一層。保留的樣本數約為 3k，與資料筆數無關。
+
+    誤差界限：分位數以「排名」衡量誤差，對任一分位 q，回傳值 x 在原始資料中的排名
+    rank(x)/n 與 q 的差距在 99% 機率下不超過 rank_error（k=200 約 1.65%）；
+    直方圖各區間的比例為兩個排名之差，誤差不超過 2 × rank_error。筆數、總和（平均）、最小值與最大值為精確值。
+    """
+
+    def __init__(self, k: int = DEFAULT_K, seed: Optional[int] = None):
+        """
+        Args:
+            k: 精確度參數，越大越精確但保留越多樣本
+            seed: 壓縮時隨機選擇的種子（測試用）
+        """
+        if k < 8:
+            raise ValueError('k 至少為 8')
+
+        self.k = k
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self._levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def rank_error(self) -> float:
+        """99% 機率下的正規化排名誤差上限（DataSketches 對 KLL 的經驗公式）"""
+        return 2.446 / self.k ** 0.9433
+
+    @property
+    def size(self) -> int:
+        """目前保留的樣本數"""
+        return sum(items.size for items in self._levels)
+
+    @property
+    def mean(self) -> Optional[float]:
+        """平均值（精確）"""
+        return self.total / self.count if self.count else None
+
+    def _capacity(self, level: int) -> int:
+        # 越低的層容量越小（每往下一層乘以 2/3），最上層為 k
+        depth = len(self._levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def update(self, values: Sequence[float]) -> 'KLLSketch':
+        """
+        加入一批數值（缺值會被忽略）
+
+        Args:
+            values: 數值陣列、Series 或列表
+
+        Returns:
+            自身，方便串接
+        """
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if not values.size:
+            return self
+
+        self.count += int(values.size)
+        self.total += float(values.sum())
+        low, high = float(values.min()), float(values.max())
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+
+        self._levels[0] = np.concatenate([self._levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other: 'KLLSketch') -> 'KLLSketch':
+        """
+        合併另一個草圖（就地更新），合併後的誤差界限同單一草圖
+
+        Args:
+            other: 另一個草圖（如其他分片或工作程序的結果）
+
+        Returns:
+            自身
+        """
+        if not other.count:
+            return self
+
+        self.count += other.count
+        self.total += other.total
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0))
+        for level, items in enumerate(other._levels):
+            self._levels[level] = np.concatenate([self._levels[level], items])
+        self._compress()
+        return self
+
+    def _compress(self):
+        """由下往上壓縮超過容量的層"""
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            if items.size > self._capacity(level):
+                if level + 1 == len(self._levels):
+                    self._levels.append(np.empty(0))
+                items = np.sort(items)
+                # 奇數筆時留下一筆在本層，其餘兩兩一組隨機保留其一並晉升
+                odd = items.size % 2
+                promoted = items[odd:][self._rng.integers(2)::2]
+                self._levels[level + 1] = np.concatenate([self._levels[level + 1], promoted])
+                self._levels[level] = items[:odd]
+            level += 1
+
+    def _weighted_items(self):
+        """回傳排序後的樣本與累積權重"""
+        items = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(level.size, 2 ** h, dtype=np.int64) for h, level in enumerate(self._levels)])
+        order = np.argsort(items, kind='stable')
+        return items[order], np.cumsum(weights[order])
+
+    def quantiles(self, qs: Sequence[float]) -> List[Optional[float]]:
+        """
+        估計多個分位數
+
+        Args:
+            qs: 0~1 之間的分位
+
+        Returns:
+            各分位的估計值，沒有資料時為 None
+        """
+        if not self.count:
+            return [None] * len(qs)
+
+        items, cumulative = self._weighted_items()
+        results = []
+        for q in qs:
+            if q <= 0:
+                results.append(self.min)
+            elif q >= 1:
+                results.append(self.max)
+            else:
+                index = int(np.searchsorted(cumulative, q * self.count, side='left'))
+                results.append(float(items[min(index, items.size - 1)]))
+        return results
+
+    def quantile(self, q: float) -> Optional[float]:
+        """估計單一分位數"""
+        return self.quantiles([q])[0]
+
+    def rank(self, value: float) -> float:
+        """
+        估計小於 value 的資料比例
+
+        Args:
+            value: 數值
+
+        Returns:
+            0~1 之間的比例
+        """
+        if not self.count:
+            return 0.0
+        items, cumulative = self._weighted_items()
+        index = int(np.searchsorted(items, value, side='left'))
+        return float(cumulative[index - 1]) / self.count if index else 0.0
+
+    def histogram(self, edges: Sequence[float]) -> List[int]:
+        """
+        估計各區間的筆數（區間為左閉右開，最後一個區間包含右端點，同 numpy.histogram）
+
+        Args:
+            edges: 遞增的區間端點
+
+        Returns:
+            各區間的估計筆數
+        """
+        if not self.count:
+            return [0] * (len(edges) - 1)
+
+        items, cumulative = self._weighted_items()
+        indices = np.searchsorted(items, edges[:-1], side='left')
+        below = [int(cumulative[index - 1]) if index else 0 for index in indices]
+        last = int(np.searchsorted(items, edges[-1], side='right'))
+        below.append(int(cumulative[last - 1]) if last else 0)
+        return [high - low for low, high in zip(below, below[1:])]
+
+    def to_dict(self) -> Dict:
+        """轉為可 JSON 序列化的字典"""
+        return {
+            'k': self.k,
+            'count': self.count,
+            'total': self.total,
+            'min': self.min,
+            'max': self.max,
+            'levels': [items.tolist() for items in self._levels]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'KLLSketch':
+        """由 to_dict 的輸出還原"""
+        sketch = cls(k=data['k'])
+        sketch.count = data['count']
+        sketch.total = data['total']
+        sketch.min = data['min']
+        sketch.max = data['max']
+        sketch._levels = [np.asarray(items, dtype=float) for items in data['levels']] or [np.empty(0)]
+        return sketch
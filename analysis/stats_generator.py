@@ -4,11 +4,29 @@
 """
 
 import json
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Union
 
+import numpy as np
 import pandas as pd
 
+from quantile_sketch import DEFAULT_K, KLLSketch
+from stats_state import SwipeStatsState
+
+# 統計報告用到的 swipe_records 欄位（串流讀取時只讀這些欄位）
+STATS_COLUMNS = ('target_age', 'target_distance', 'swipe_direction', 'is_match', 'swiped_at')
+
+# generate_comprehensive_report 可選的報告區塊（summary 一律產生）
+REPORT_SECTIONS = ('swipe_stats', 'age_stats', 'distance_stats', 'time_stats', 'daily_stats')
+
+# 近似模式回報的分位數
+APPROXIMATE_QUANTILES = (0.5, 0.9, 0.99)
+
+# 近似模式以草圖統計的欄位
+_SKETCH_COLUMNS = ('target_age', 'target_distance')
+
+_DIRECTION_DTYPE = pd.CategoricalDtype(['left', 'right', 'super'])
+
 
 class StatsGenerator:
     """統計報告生成器類別"""
@@ -29,6 +47,82 @@ class StatsGenerator:
         """
         return pd.DataFrame(records)
 
+    def frames_to_dataframe(self, frames: Iterable[pd.DataFrame]) -> pd.DataFrame:
+        """
+        將分批讀取的 DataFrame 合併，並逐批轉為精簡型別
+
+        每批在合併前就轉為數值與類別欄位，記憶體用量約為每列數十位元組，
+        不需先把所有記錄載入為字典。
+
+        Args:
+            frames: 分批的滑卡記錄（如 DatabaseClient.stream_swipe_frames 的輸出）
+
+        Returns:
+            合併後的 DataFrame
+        """
+        chunks = [self._compact(frame) for frame in frames]
+        if not chunks:
+            return pd.DataFrame()
+        return pd.concat(chunks, ignore_index=True)
+
+    def load_parquet(
+        self,
+        root: str,
+        dating_account_id: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """
+        由 Parquet 資料集載入統計所需欄位（不連線資料庫）
+
+        Args:
+            root: 資料集根目錄（swipe_dataset.write_swipe_dataset 的輸出）
+            dating_account_id: 社交帳號 ID
+            start: 起始時間（含）
+            end: 結束時間（不含）
+
+        Returns:
+            精簡型別的 DataFrame，可直接傳入 generate_comprehensive_report
+        """
+        from swipe_dataset import read_swipe_dataset
+
+        frame = read_swipe_dataset(
+            root, columns=STATS_COLUMNS, dating_account_id=dating_account_id, start=start, end=end
+        )
+        return self._compact(frame)
+
+    @staticmethod
+    def _compact(frame: pd.DataFrame) -> pd.DataFrame:
+        """轉為精簡型別；年齡與距離缺值視為 0（統計時會排除）"""
+        frame = frame.copy()
+        for column in ('target_age', 'target_distance'):
+            if column in frame.columns:
+                frame[column] = pd.to_numeric(frame[column]).fillna(0).astype('int32')
+        if 'swipe_direction' in frame.columns:
+            frame['swipe_direction'] = frame['swipe_direction'].astype(_DIRECTION_DTYPE)
+        if 'is_match' in frame.columns:
+            frame['is_match'] = frame['is_match'].fillna(False).astype(bool)
+        if 'swiped_at' in frame.columns:
+            frame['swiped_at'] = pd.to_datetime(frame['swiped_at'])
+        return frame
+
+    def prepare(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        將 swiped_at 解析為 datetime 欄位，回傳新的 DataFrame，不修改輸入
+
+        已解析過的 DataFrame 直接回傳，各統計方法都會先呼叫此方法，
+        因此同一份資料只會解析一次。
+
+        Args:
+            df: 滑卡記錄 DataFrame
+
+        Returns:
+            swiped_at 為 datetime64 的 DataFrame
+        """
+        if 'swiped_at' not in df.columns or pd.api.types.is_datetime64_any_dtype(df['swiped_at']):
+            return df
+        return df.assign(swiped_at=pd.to_datetime(df['swiped_at']))
+
     def generate_daily_stats(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         生成每日統計
@@ -42,15 +136,15 @@ class StatsGenerator:
         if 'swiped_at' not in df.columns:
             return pd.DataFrame()
 
-        df['date'] = pd.to_datetime(df['swiped_at']).dt.date
-        
-        daily_stats = df.groupby('date').agg({
-            'id': 'count',  # 總滑卡數
-            'is_match': 'sum'  # 配對數
-        }).rename(columns={
-            'id': 'total_swipes',
-            'is_match': 'matches'
+        df = self.prepare(df)
+        is_match = df['is_match'].fillna(False).astype(bool)
+
+        # 以 datetime64 分組，只有分組後的少數日期才轉為 date
+        daily_stats = is_match.groupby(df['swiped_at'].dt.normalize()).agg(['size', 'sum']).rename(columns={
+            'size': 'total_swipes',  # 總滑卡數
+            'sum': 'matches'  # 配對數
         })
+        daily_stats.index = pd.Index(daily_stats.index.date, name='date')
 
         daily_stats['match_rate'] = (daily_stats['matches'] / daily_stats['total_swipes'] * 100).round(2)
         
@@ -69,25 +163,27 @@ class StatsGenerator:
         if 'swiped_at' not in df.columns:
             return {}
 
-        df['hour'] = pd.to_datetime(df['swiped_at']).dt.hour
-        
-        hourly_stats = df.groupby('hour').size().to_dict()
+        df = self.prepare(df)
+        hourly_stats = df.groupby(df['swiped_at'].dt.hour.rename('hour')).size().to_dict()
         
         return {
             'hourly_distribution': hourly_stats,
             'peak_hour': max(hourly_stats, key=hourly_stats.get) if hourly_stats else None
         }
 
-    def generate_age_stats(self, df: pd.DataFrame) -> Dict:
+    def generate_age_stats(self, df: Union[pd.DataFrame, KLLSketch]) -> Dict:
         """
         生成年齡統計
         
         Args:
-            df: 滑卡記錄 DataFrame
+            df: 滑卡記錄 DataFrame，或串流建立的年齡草圖（近似模式，見 build_sketches）
             
         Returns:
             年齡統計字典
         """
+        if isinstance(df, KLLSketch):
+            return self._sketch_stats(df, 'age')
+
         if 'target_age' not in df.columns:
             return {}
 
@@ -104,16 +200,19 @@ class StatsGenerator:
             'age_distribution': age_data.value_counts().to_dict()
         }
 
-    def generate_distance_stats(self, df: pd.DataFrame) -> Dict:
+    def generate_distance_stats(self, df: Union[pd.DataFrame, KLLSketch]) -> Dict:
         """
         生成距離統計
         
         Args:
-            df: 滑卡記錄 DataFrame
+            df: 滑卡記錄 DataFrame，或串流建立的距離草圖（近似模式，見 build_sketches）
             
         Returns:
             距離統計字典
         """
+        if isinstance(df, KLLSketch):
+            return self._sketch_stats(df, 'distance')
+
         if 'target_distance' not in df.columns:
             return {}
 
@@ -129,6 +228,82 @@ class StatsGenerator:
             'median_distance': int(distance_data.median())
         }
 
+    @staticmethod
+    def _sketch_stats(sketch: KLLSketch, name: str, bins: int = 10) -> Dict:
+        """由草圖產生近似統計；平均、最小與最大值為精確值，分位數與直方圖誤差見 rank_error"""
+        if not sketch.count:
+            return {}
+
+        p50, p90, p99 = sketch.quantiles(APPROXIMATE_QUANTILES)
+        edges = np.linspace(sketch.min, sketch.max, bins + 1).round(2).tolist()
+        return {
+            f'avg_{name}': round(sketch.mean, 1),
+            f'min_{name}': int(sketch.min),
+            f'max_{name}': int(sketch.max),
+            f'median_{name}': int(p50),
+            f'{name}_quantiles': {'p50': p50, 'p90': p90, 'p99': p99},
+            f'{name}_histogram': {'edges': edges, 'counts': sketch.histogram(edges)},
+            'rank_error': round(sketch.rank_error, 4)
+        }
+
+    def build_sketches(self, frames: Iterable[pd.DataFrame], k: int = DEFAULT_K) -> Dict[str, KLLSketch]:
+        """
+        串流建立年齡與距離草圖，記憶體用量與記錄筆數無關
+
+        各分片（帳號、工作程序）建立的草圖可用 KLLSketch.merge 合併後再產生統計。
+
+        Args:
+            frames: 分批的滑卡記錄（如 DatabaseClient.stream_swipe_frames 的輸出）
+            k: 草圖精確度參數
+
+        Returns:
+            {'target_age': 草圖, 'target_distance': 草圖}
+        """
+        sketches = {column: KLLSketch(k) for column in _SKETCH_COLUMNS}
+        for frame in frames:
+            for column, sketch in sketches.items():
+                if column in frame.columns:
+                    values = pd.to_numeric(frame[column])
+                    # 0 代表未知，與精確統計一致不列入
+                    sketch.update(values[values > 0].to_numpy(dtype=float))
+        return sketches
+
+    def generate_approximate_report(
+        self,
+        frames: Iterable[pd.DataFrame],
+        k: int = DEFAULT_K,
+        sections: Optional[Iterable[str]] = None
+    ) -> Dict:
+        """
+        串流生成綜合統計報告（近似模式）
+
+        只讀取一次分批記錄：次數與分桶由 SwipeStatsState 累加，年齡與距離改用 KLL 草圖，
+        提供 p50/p90/p99 與直方圖，記憶體用量固定。
+
+        Args:
+            frames: 分批的滑卡記錄
+            k: 草圖精確度參數
+            sections: 只產生的報告區塊（見 REPORT_SECTIONS）
+
+        Returns:
+            綜合統計報告字典，格式同 generate_comprehensive_report，年齡與距離統計多了分位數與直方圖
+        """
+        state = SwipeStatsState()
+
+        def counted(frames):
+            for frame in frames:
+                # 年齡與距離只交給草圖，狀態不保留其直方圖
+                state.update(frame.drop(columns=list(_SKETCH_COLUMNS), errors='ignore'))
+                yield frame
+
+        sketches = self.build_sketches(counted(frames), k)
+        report = self.generate_comprehensive_report(state, sections)
+        if 'age_stats' in report:
+            report['age_stats'] = self.generate_age_stats(sketches['target_age'])
+        if 'distance_stats' in report:
+            report['distance_stats'] = self.generate_distance_stats(sketches['target_distance'])
+        return report
+
     def generate_swipe_direction_stats(self, df: pd.DataFrame) -> Dict:
         """
         生成滑卡方向統計
@@ -142,7 +317,9 @@ class StatsGenerator:
         if 'swipe_direction' not in df.columns:
             return {}
 
-        direction_counts = df['swipe_direction'].value_counts().to_dict()
+        direction_counts = df['swipe_direction'].value_counts()
+        # 類別欄位會列出次數為 0 的方向
+        direction_counts = direction_counts[direction_counts > 0].to_dict()
         total = len(df)
 
         return {
@@ -151,20 +328,44 @@ class StatsGenerator:
             'right_swipe_rate': round(direction_counts.get('right', 0) / total * 100, 2) if total > 0 else 0
         }
 
-    def generate_comprehensive_report(self, records: List[Dict]) -> Dict:
+    def generate_comprehensive_report(
+        self,
+        records: Union[List[Dict], pd.DataFrame, SwipeStatsState],
+        sections: Optional[Iterable[str]] = None
+    ) -> Dict:
         """
         生成綜合統計報告
         
         Args:
-            records: 滑卡記錄列表
+            records: 滑卡記錄列表、已轉換的 DataFrame（如 frames_to_dataframe 的輸出），
+                或累加後的 SwipeStatsState（只依分桶計算，與記錄筆數無關）
+            sections: 只產生的報告區塊（見 REPORT_SECTIONS），未提供時產生全部
             
         Returns:
             綜合統計報告字典
         """
-        if not records:
+        sections = REPORT_SECTIONS if sections is None else tuple(sections)
+        unknown = set(sections) - set(REPORT_SECTIONS)
+        if unknown:
+            raise ValueError(f"未知的報告區塊: {', '.join(sorted(unknown))}")
+
+        if isinstance(records, SwipeStatsState):
+            return self._report_from_state(records, sections)
+
+        if len(records) == 0:
             return {'error': '沒有記錄可供分析'}
 
-        df = self.records_to_dataframe(records)
+        df = records if isinstance(records, pd.DataFrame) else self.records_to_dataframe(records)
+        # 只解析一次時間戳記，所有區塊共用
+        df = self.prepare(df)
+
+        builders = {
+            'swipe_stats': self.generate_swipe_direction_stats,
+            'age_stats': self.generate_age_stats,
+            'distance_stats': self.generate_distance_stats,
+            'time_stats': self.generate_time_distribution,
+            'daily_stats': lambda frame: self.generate_daily_stats(frame).to_dict(),
+        }
 
         report = {
             'summary': {
@@ -173,16 +374,102 @@ class StatsGenerator:
                     'start': str(df['swiped_at'].min()) if 'swiped_at' in df.columns else None,
                     'end': str(df['swiped_at'].max()) if 'swiped_at' in df.columns else None
                 }
-            },
-            'swipe_stats': self.generate_swipe_direction_stats(df),
-            'age_stats': self.generate_age_stats(df),
-            'distance_stats': self.generate_distance_stats(df),
-            'time_stats': self.generate_time_distribution(df),
-            'daily_stats': self.generate_daily_stats(df).to_dict() if not self.generate_daily_stats(df).empty else {}
+            }
+        }
+        for section in sections:
+            report[section] = builders[section](df)
+
+        return report
+
+    def _report_from_state(self, state: SwipeStatsState, sections: Iterable[str]) -> Dict:
+        """由統計狀態產生報告，格式與由 DataFrame 產生的報告相同"""
+        if state.total == 0:
+            return {'error': '沒有記錄可供分析'}
+
+        builders = {
+            'swipe_stats': self._swipe_stats_from_state,
+            'age_stats': self._age_stats_from_state,
+            'distance_stats': self._distance_stats_from_state,
+            'time_stats': self._time_stats_from_state,
+            'daily_stats': self._daily_stats_from_state,
+        }
+
+        report = {
+            'summary': {
+                'total_records': state.total,
+                'date_range': {
+                    'start': state.first_swiped_at,
+                    'end': state.last_swiped_at
+                }
+            }
         }
+        for section in sections:
+            report[section] = builders[section](state)
 
         return report
 
+    @staticmethod
+    def _swipe_stats_from_state(state: SwipeStatsState) -> Dict:
+        if not state.direction_counts:
+            return {}
+
+        counts = dict(sorted(state.direction_counts.items(), key=lambda item: -item[1]))
+        return {
+            'counts': counts,
+            'percentages': {k: round(v / state.total * 100, 2) for k, v in counts.items()},
+            'right_swipe_rate': round(counts.get('right', 0) / state.total * 100, 2)
+        }
+
+    @staticmethod
+    def _age_stats_from_state(state: SwipeStatsState) -> Dict:
+        age = state.age
+        if not age.count:
+            return {}
+
+        return {
+            'avg_age': round(age.mean, 1),
+            'min_age': age.min,
+            'max_age': age.max,
+            'median_age': int(age.quantile(0.5)),
+            'age_distribution': age.distribution()
+        }
+
+    @staticmethod
+    def _distance_stats_from_state(state: SwipeStatsState) -> Dict:
+        distance = state.distance
+        if not distance.count:
+            return {}
+
+        return {
+            'avg_distance': round(distance.mean, 1),
+            'min_distance': distance.min,
+            'max_distance': distance.max,
+            'median_distance': int(distance.quantile(0.5))
+        }
+
+    @staticmethod
+    def _time_stats_from_state(state: SwipeStatsState) -> Dict:
+        if not state.hourly:
+            return {}
+
+        hourly_stats = dict(sorted(state.hourly.items()))
+        return {
+            'hourly_distribution': hourly_stats,
+            'peak_hour': max(hourly_stats, key=hourly_stats.get)
+        }
+
+    @staticmethod
+    def _daily_stats_from_state(state: SwipeStatsState) -> Dict:
+        days = sorted(state.daily)
+        dates = [date.fromisoformat(day) for day in days]
+        return {
+            'total_swipes': {d: state.daily[day][0] for d, day in zip(dates, days)},
+            'matches': {d: state.daily[day][1] for d, day in zip(dates, days)},
+            'match_rate': {
+                d: round(state.daily[day][1] / state.daily[day][0] * 100, 2) for d, day in zip(dates, days)
+            }
+        }
+
     def export_to_json(self, report: Dict, output_path: str):
         """
         匯出報告為 JSON
@@ -230,6 +517,9 @@ class StatsGenerator:
             print("年齡統計:")
             print(f"  平均年齡: {report['age_stats'].get('avg_age', 0)}")
             print(f"  年齡範圍: {report['age_stats'].get('min_age', 0)} ~ {report['age_stats'].get('max_age', 0)}")
+            if 'age_quantiles' in report['age_stats']:
+                quantiles = report['age_stats']['age_quantiles']
+                print(f"  分位數（近似）: p50 {quantiles['p50']}, p90 {quantiles['p90']}, p99 {quantiles['p99']}")
             print()
 
         # 距離統計
@@ -237,6 +527,9 @@ class StatsGenerator:
             print("距離統計:")
             print(f"  平均距離: {report['distance_stats'].get('avg_distance', 0)} km")
             print(f"  距離範圍: {report['distance_stats'].get('min_distance', 0)} ~ {report['distance_stats'].get('max_distance', 0)} km")
+            if 'distance_quantiles' in report['distance_stats']:
+                quantiles = report['distance_stats']['distance_quantiles']
+                print(f"  分位數（近似）: p50 {quantiles['p50']}, p90 {quantiles['p90']}, p99 {quantiles['p99']} km")
             print()
 
         print("=" * 60)
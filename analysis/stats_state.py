@@ -0,0 +1,302 @@
+"""
+可合併的滑卡統計狀態
+以 O(批次) 的成本累加新記錄，可保存於 JSON 並跨帳號或工作程序合併，
+StatsGenerator 直接由狀態產生報告，不需重新掃描全部記錄
+"""
+
+import json
+import math
+from datetime import datetime, timedelta
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
+
+# 增量讀取時依 created_at 往回重讀的時間，涵蓋 ID 與提交順序不一致的記錄（並行寫入、預先取得 ID 的 COPY）；
+# created_at 早於提交時間超過此值的記錄（例如執行更久的寫入交易）仍可能遺漏
+WATERMARK_OVERLAP = timedelta(minutes=10)
+
+
+@dataclass
+class ValueStats:
+    """
+    可合併的數值統計（年齡、距離等整數值）
+
+    筆數、平均與變異數以 Chan 平行演算法合併；另保留每個整數值的次數，
+    分位數由直方圖計算，對整數值為精確結果（與 pandas 的線性內插相同）。
+    """
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    min: Optional[int] = None
+    max: Optional[int] = None
+    histogram: Dict[int, int] = field(default_factory=dict)
+
+    def update(self, values: pd.Series):
+        """
+        加入一批數值
+
+        Args:
+            values: 數值序列（已排除缺值）
+        """
+        if values.empty:
+            return
+
+        values = values.astype(float)
+        mean = float(values.mean())
+        self._combine(len(values), mean, float(((values - mean) ** 2).sum()), int(values.min()), int(values.max()))
+
+        for value, count in values.round().astype(int).value_counts().items():
+            self.histogram[int(value)] = self.histogram.get(int(value), 0) + int(count)
+
+    def merge(self, other: 'ValueStats') -> 'ValueStats':
+        """合併另一份統計（就地更新）"""
+        if other.count:
+            self._combine(other.count, other.mean, other.m2, other.min, other.max)
+            for value, count in other.histogram.items():
+                self.histogram[value] = self.histogram.get(value, 0) + count
+        return self
+
+    def _combine(self, count: int, mean: float, m2: float, low: int, high: int):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+
+    @property
+    def variance(self) -> float:
+        """樣本變異數"""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        """樣本標準差"""
+        return math.sqrt(self.variance)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        計算分位數
+
+        Args:
+            q: 0~1 之間的分位
+
+        Returns:
+            分位數，沒有資料時為 None
+        """
+        if not self.count:
+            return None
+
+        position = q * (self.count - 1)
+        lower_rank, upper_rank = math.floor(position), math.ceil(position)
+        lower = upper = None
+        seen = 0
+        for value in sorted(self.histogram):
+            seen += self.histogram[value]
+            if lower is None and seen > lower_rank:
+                lower = value
+            if seen > upper_rank:
+                upper = value
+                break
+
+        return lower + (upper - lower) * (position - lower_rank)
+
+    def distribution(self) -> Dict[int, int]:
+        """各值的次數，依次數由多到少排序（同 value_counts）"""
+        return dict(sorted(self.histogram.items(), key=lambda item: -item[1]))
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ValueStats':
+        data = dict(data)
+        data['histogram'] = {int(value): count for value, count in data.get('histogram', {}).items()}
+        return cls(**data)
+
+
+@dataclass
+class SwipeStatsState:
+    """
+    滑卡統計狀態
+
+    包含各方向次數、配對數、每日與每小時分桶、年齡與距離統計，以及增量讀取資料庫用的水位：
+    已處理的最大 created_at（下次由此往回 WATERMARK_OVERLAP 開始讀取）與重疊期間內已累加的記錄 ID
+    （重讀時排除，不重複計算）。watermark_id 為已處理的最大記錄 ID。
+    """
+
+    total: int = 0
+    direction_counts: Dict[str, int] = field(default_factory=dict)
+    match_count: int = 0
+    daily: Dict[str, List[int]] = field(default_factory=dict)
+    hourly: Dict[int, int] = field(default_factory=dict)
+    age: ValueStats = field(default_factory=ValueStats)
+    distance: ValueStats = field(default_factory=ValueStats)
+    first_swiped_at: Optional[str] = None
+    last_swiped_at: Optional[str] = None
+    watermark_id: Optional[int] = None
+    watermark_created_at: Optional[str] = None
+    recent_ids: Dict[int, str] = field(default_factory=dict)
+
+    def update(self, records: Union[List[Dict], pd.DataFrame]) -> 'SwipeStatsState':
+        """
+        累加一批滑卡記錄（就地更新）
+
+        Args:
+            records: 滑卡記錄列表或 DataFrame（欄位同 swipe_records）
+
+        Returns:
+            自身，方便串接
+        """
+        df = records if isinstance(records, pd.DataFrame) else pd.DataFrame(records)
+        if not df.empty and self.recent_ids and 'id' in df.columns:
+            # 重疊期間重新讀到的記錄已累加過
+            df = df[~df['id'].isin(list(self.recent_ids))]
+        if df.empty:
+            return self
+
+        self.total += len(df)
+        is_match = df['is_match'].fillna(False).astype(bool) if 'is_match' in df.columns \
+            else pd.Series(False, index=df.index)
+        self.match_count += int(is_match.sum())
+
+        if 'swipe_direction' in df.columns:
+            for direction, count in df['swipe_direction'].value_counts().items():
+                if count:
+                    self.direction_counts[direction] = self.direction_counts.get(direction, 0) + int(count)
+
+        if 'swiped_at' in df.columns:
+            swiped_at = pd.to_datetime(df['swiped_at'])
+            daily = is_match.groupby(swiped_at.dt.normalize()).agg(['size', 'sum'])
+            for day, swipes, matches in zip(daily.index, daily['size'], daily['sum']):
+                bucket = self.daily.setdefault(day.date().isoformat(), [0, 0])
+                bucket[0] += int(swipes)
+                bucket[1] += int(matches)
+            for hour, count in swiped_at.dt.hour.value_counts().items():
+                self.hourly[int(hour)] = self.hourly.get(int(hour), 0) + int(count)
+            self._extend_range(str(swiped_at.min()), str(swiped_at.max()))
+
+        for column, stats in (('target_age', self.age), ('target_distance', self.distance)):
+            if column in df.columns:
+                values = pd.to_numeric(df[column])
+                # 0 代表未知，與 StatsGenerator 一致不列入統計
+                stats.update(values[values > 0])
+
+        if 'id' in df.columns and df['id'].notna().any():
+            self._advance_watermark(int(df['id'].max()))
+            if 'created_at' in df.columns:
+                tracked = df[df['id'].notna() & df['created_at'].notna()]
+                self._track_recent(dict(zip(
+                    tracked['id'].astype(int).tolist(),
+                    pd.to_datetime(tracked['created_at']).astype(str).tolist()
+                )))
+
+        return self
+
+    def merge(self, other: 'SwipeStatsState') -> 'SwipeStatsState':
+        """
+        合併另一份狀態（就地更新），用於跨帳號或跨工作程序彙總
+
+        Args:
+            other: 另一份統計狀態
+
+        Returns:
+            自身
+        """
+        self.total += other.total
+        self.match_count += other.match_count
+        for direction, count in other.direction_counts.items():
+            self.direction_counts[direction] = self.direction_counts.get(direction, 0) + count
+        for day, (swipes, matches) in other.daily.items():
+            bucket = self.daily.setdefault(day, [0, 0])
+            bucket[0] += swipes
+            bucket[1] += matches
+        for hour, count in other.hourly.items():
+            self.hourly[hour] = self.hourly.get(hour, 0) + count
+        self.age.merge(other.age)
+        self.distance.merge(other.distance)
+        if other.first_swiped_at is not None:
+            self._extend_range(other.first_swiped_at, other.last_swiped_at)
+        if other.watermark_id is not None:
+            self._advance_watermark(other.watermark_id)
+        if other.recent_ids:
+            self._track_recent(other.recent_ids)
+        return self
+
+    def incremental_start(self) -> Optional[datetime]:
+        """
+        增量讀取的 created_at 起點
+
+        Returns:
+            created_at 水位減去 WATERMARK_OVERLAP，尚未以 created_at 讀取過時為 None
+        """
+        if self.watermark_created_at is None:
+            return None
+        return (pd.Timestamp(self.watermark_created_at) - WATERMARK_OVERLAP).to_pydatetime()
+
+    def _extend_range(self, first: str, last: str):
+        if self.first_swiped_at is None or pd.Timestamp(first) < pd.Timestamp(self.first_swiped_at):
+            self.first_swiped_at = first
+        if self.last_swiped_at is None or pd.Timestamp(last) > pd.Timestamp(self.last_swiped_at):
+            self.last_swiped_at = last
+
+    def _advance_watermark(self, record_id: int):
+        self.watermark_id = record_id if self.watermark_id is None else max(self.watermark_id, record_id)
+
+    def _track_recent(self, created_at: Dict[int, str]):
+        """推進 created_at 水位，並只保留重疊期間內的記錄 ID"""
+        if not created_at:
+            return
+        recent = pd.to_datetime(pd.Series({**self.recent_ids, **created_at}))
+        latest = recent.max()
+        if self.watermark_created_at is not None:
+            latest = max(latest, pd.Timestamp(self.watermark_created_at))
+        self.watermark_created_at = str(latest)
+        recent = recent[recent >= latest - WATERMARK_OVERLAP]
+        self.recent_ids = dict(zip(recent.index.astype(int).tolist(), recent.astype(str).tolist()))
+
+    def to_dict(self) -> Dict:
+        """轉為可 JSON 序列化的字典"""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'SwipeStatsState':
+        """由 to_dict 的輸出還原"""
+        data = dict(data)
+        data['hourly'] = {int(hour): count for hour, count in data.get('hourly', {}).items()}
+        data['recent_ids'] = {int(record_id): created_at for record_id, created_at in data.get('recent_ids', {}).items()}
+        data['age'] = ValueStats.from_dict(data.get('age', {}))
+        data['distance'] = ValueStats.from_dict(data.get('distance', {}))
+        return cls(**data)
+
+    def save(self, path: str):
+        """
+        保存狀態
+
+        Args:
+            path: JSON 檔路徑
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 先寫入暫存檔再取代，避免中斷時留下損壞的狀態檔
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f)
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: str) -> 'SwipeStatsState':
+        """
+        載入狀態，檔案不存在時回傳空狀態
+
+        Args:
+            path: JSON 檔路徑
+
+        Returns:
+            統計狀態
+        """
+        if not Path(path).exists():
+            return cls()
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
@@ -0,0 +1,231 @@
+"""
+滑卡記錄 Parquet 資料集
+將 swipe_records 匯出為依帳號與日期分區的 Parquet，供離線分析與重新訓練直接讀取
+（欄位裁剪與條件下推，不需連線資料庫，也不建立逐筆字典）
+"""
+
+import os
+import uuid
+from datetime import datetime, time
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+# swipe_records 欄位型別（分區欄位 dating_account_id 另列於 PARTITION_SCHEMA）
+SWIPE_SCHEMA = pa.schema([
+    ('id', pa.int64()),
+    ('profile_id', pa.int64()),
+    ('ab_test_id', pa.int64()),
+    ('target_name', pa.string()),
+    ('target_age', pa.int32()),
+    ('target_bio', pa.string()),
+    ('target_photos', pa.list_(pa.string())),
+    ('target_distance', pa.int32()),
+    ('swipe_direction', pa.string()),
+    ('is_match', pa.bool_()),
+    ('ai_score', pa.float64()),
+    ('decision_reason', pa.string()),
+    ('swiped_at', pa.timestamp('us')),
+    ('created_at', pa.timestamp('us')),
+])
+
+# 目錄分區：<root>/dating_account_id=<id>/swipe_date=<YYYY-MM-DD>/
+PARTITION_SCHEMA = pa.schema([
+    ('dating_account_id', pa.int64()),
+    ('swipe_date', pa.date32()),
+])
+
+_FILE_SCHEMA = pa.schema(list(SWIPE_SCHEMA) + list(PARTITION_SCHEMA))
+
+
+def _partitioning() -> ds.Partitioning:
+    return ds.partitioning(PARTITION_SCHEMA, flavor='hive')
+
+
+def _to_record_batch(frame: pd.DataFrame) -> pa.RecordBatch:
+    """將一批 swipe_records（資料庫欄位）轉為符合 schema 的 RecordBatch"""
+    frame = frame.copy()
+    for column in ('swiped_at', 'created_at'):
+        values = pd.to_datetime(frame[column])
+        # PostgreSQL 的 TIMESTAMPTZ 轉為 UTC 後去除時區
+        if values.dt.tz is not None:
+            values = values.dt.tz_convert('UTC').dt.tz_localize(None)
+        frame[column] = values
+    frame['ai_score'] = pd.to_numeric(frame['ai_score'], errors='coerce')
+    frame['swipe_date'] = frame['swiped_at'].dt.date
+
+    return pa.RecordBatch.from_pandas(frame[_FILE_SCHEMA.names], schema=_FILE_SCHEMA, preserve_index=False)
+
+
+def _is_midnight(moment: Optional[datetime]) -> bool:
+    return moment is None or moment == datetime.combine(moment.date(), time.min)
+
+
+def _kept_batches(
+    root: str,
+    dating_account_id: Optional[int],
+    start: Optional[datetime],
+    end: Optional[datetime]
+) -> List[pa.RecordBatch]:
+    """
+    讀取匯出範圍頭尾不滿一天的日期分區中，範圍外的既有記錄
+
+    這些分區寫入時會整個取代，需將範圍外的記錄一併寫回，否則會遺失
+    """
+    if not os.path.isdir(root):
+        return []
+
+    outside = []
+    if not _is_midnight(start):
+        outside.append((ds.field('swipe_date') == start.date()) & (ds.field('swiped_at') < start))
+    if not _is_midnight(end):
+        outside.append((ds.field('swipe_date') == end.date()) & (ds.field('swiped_at') >= end))
+    if not outside:
+        return []
+
+    expression = outside[0] if len(outside) == 1 else outside[0] | outside[1]
+    if dating_account_id is not None:
+        expression = expression & (ds.field('dating_account_id') == dating_account_id)
+
+    dataset = ds.dataset(root, format='parquet', partitioning=_partitioning())
+    table = dataset.to_table(columns=_FILE_SCHEMA.names, filter=expression)
+    return table.cast(_FILE_SCHEMA).to_batches()
+
+
+def write_swipe_dataset(
+    frames: Iterable[pd.DataFrame],
+    root: str,
+    dating_account_id: Optional[int] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> int:
+    """
+    將分批的滑卡記錄寫入分區 Parquet 資料集
+
+    寫入的分區（帳號 + 日期）會整個取代，重複匯出同一範圍不會產生重複記錄。
+    匯出範圍的起訖時間不在午夜時，頭尾日期分區中範圍外的既有記錄會保留並一併寫回，
+    不會被只含部分時段的匯出覆蓋。
+
+    Args:
+        frames: 分批的 swipe_records（所有欄位），如 DatabaseClient.stream_swipe_frames 的輸出
+        root: 資料集根目錄
+        dating_account_id: frames 的帳號範圍，未提供時為所有帳號
+        start: frames 的起始時間（含），未提供時不限
+        end: frames 的結束時間（不含），未提供時不限
+
+    Returns:
+        寫入筆數（不含保留的既有記錄）
+    """
+    written = 0
+    # 必須在寫入（刪除分區）前讀出
+    kept = _kept_batches(root, dating_account_id, start, end)
+
+    def batches() -> Iterator[pa.RecordBatch]:
+        nonlocal written
+        yield from kept
+        for frame in frames:
+            if len(frame):
+                written += len(frame)
+                yield _to_record_batch(frame)
+
+    ds.write_dataset(
+        batches(),
+        root,
+        schema=_FILE_SCHEMA,
+        format='parquet',
+        partitioning=_partitioning(),
+        basename_template=f'part-{uuid.uuid4().hex[:8]}-{{i}}.parquet',
+        existing_data_behavior='delete_matching'
+    )
+    return written
+
+
+def _filter(
+    dating_account_id: Optional[int],
+    start: Optional[datetime],
+    end: Optional[datetime],
+    directions: Optional[Sequence[str]]
+) -> Optional[ds.Expression]:
+    """組成篩選條件；帳號與日期只需讀取目錄即可排除分區，時間與方向依 row group 統計下推"""
+    conditions = []
+    if dating_account_id is not None:
+        conditions.append(ds.field('dating_account_id') == dating_account_id)
+    if start is not None:
+        conditions.append(ds.field('swipe_date') >= start.date())
+        conditions.append(ds.field('swiped_at') >= start)
+    if end is not None:
+        conditions.append(ds.field('swipe_date') <= end.date())
+        conditions.append(ds.field('swiped_at') < end)
+    if directions:
+        conditions.append(ds.field('swipe_direction').isin(list(directions)))
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def read_swipe_dataset(
+    root: str,
+    columns: Optional[Sequence[str]] = None,
+    dating_account_id: Optional[int] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    directions: Optional[Sequence[str]] = None
+) -> pd.DataFrame:
+    """
+    讀取 Parquet 資料集為 DataFrame
+
+    Args:
+        root: 資料集根目錄
+        columns: 只讀取的欄位，未提供時讀取全部
+        dating_account_id: 社交帳號 ID
+        start: 起始時間（含）
+        end: 結束時間（不含）
+        directions: 只讀取的滑卡方向
+
+    Returns:
+        滑卡記錄 DataFrame
+    """
+    dataset = ds.dataset(root, format='parquet', partitioning=_partitioning())
+    table = dataset.to_table(
+        columns=list(columns) if columns else None,
+        filter=_filter(dating_account_id, start, end, directions)
+    )
+    return table.to_pandas()
+
+
+def iter_swipe_frames(
+    root: str,
+    columns: Optional[Sequence[str]] = None,
+    dating_account_id: Optional[int] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    directions: Optional[Sequence[str]] = None,
+    batch_size: int = 10000
+) -> Iterator[pd.DataFrame]:
+    """
+    分批讀取 Parquet 資料集，格式同 DatabaseClient.stream_swipe_frames（不建立每列的字典）
+
+    Args:
+        root: 資料集根目錄
+        columns: 只讀取的欄位
+        dating_account_id: 社交帳號 ID
+        start: 起始時間（含）
+        end: 結束時間（不含）
+        directions: 只讀取的滑卡方向
+        batch_size: 每批筆數
+
+    Yields:
+        每批滑卡記錄的 DataFrame
+    """
+    dataset = ds.dataset(root, format='parquet', partitioning=_partitioning())
+    for batch in dataset.to_batches(
+        columns=list(columns) if columns else None,
+        filter=_filter(dating_account_id, start, end, directions),
+        batch_size=batch_size
+    ):
+        if batch.num_rows:
+            yield batch.to_pandas()
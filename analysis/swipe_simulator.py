@@ -0,0 +1,317 @@
+"""
+離線滑卡模擬器
+產生與 TinderBot.get_current_profile_data 相同格式的合成個人檔案，並以可設定的配對機率模型決定配對結果，
+不需瀏覽器即可每秒模擬數千次滑卡，用於測試滑卡策略、AIScorer 與 A/B 測試邏輯
+"""
+
+import math
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from interest_matcher import InterestMatcher
+from swipe_strategy import build_record, choose_direction
+
+NAMES = [
+    'Amy', 'Bella', 'Chloe', 'Daisy', 'Emma', 'Fiona', 'Grace', 'Hannah', 'Iris', 'Jenny',
+    'Kelly', 'Lily', 'Mia', 'Nina', 'Olivia', 'Penny', 'Queenie', 'Ruby', 'Sophie', 'Tina',
+    'Alex', 'Ben', 'Chris', 'David', 'Eric', 'Frank', 'George', 'Henry', 'Ivan', 'Jack'
+]
+
+# 簡介片段：興趣關鍵字（配合 DEFAULT_INTEREST_TAXONOMY）、一般描述、emoji 與負面語句
+INTEREST_PHRASES = [
+    'Love hiking and camping in the mountains', 'Gym and yoga every morning', 'Coffee addict and foodie',
+    'Guitar player, concert lover', 'Always planning the next travel adventure', 'Photography and design nerd',
+    'Reading novels on rainy days', 'Software engineer at a startup', 'Dog mom with two puppies',
+    'Netflix and movie marathons', 'Cooking Italian food for friends', 'Beach walks and swimming',
+]
+NEUTRAL_PHRASES = [
+    'Looking for someone to share good conversations with', 'Just moved to the city',
+    'Ask me about my favorite place', 'Here for something real', 'Work hard, laugh harder',
+    'Tell me your best joke',
+]
+NEGATIVE_PHRASES = ['No drama please', 'Tired of boring small talk', 'Hate people who are always late']
+EMOJIS = ['😊', '🌿', '☕', '✈️', '🐶', '🎸', '📚', '🏔️']
+
+# 配對機率模型的預設權重：每單位特徵偏離參考值時 log-odds 的變化
+DEFAULT_MATCH_WEIGHTS = {
+    'photo_count': 0.25,     # 每多一張照片
+    'bio_length': 0.3,       # 每 100 字（超過 300 字不再加分）
+    'interest_count': 0.25,  # 每多一個興趣分類
+    'distance': -0.3,        # 每 10 公里
+    'age_gap': -0.4,         # 與偏好年齡每差 5 歲
+}
+
+# 特徵參考值（此值時機率等於 base_rate）
+_FEATURE_REFERENCE = {'photo_count': 3, 'bio_length': 1.0, 'interest_count': 1, 'distance': 1.5, 'age_gap': 0.0}
+
+
+def _logit(p: float) -> float:
+    return math.log(p / (1 - p))
+
+
+class ProfileGenerator:
+    """
+    合成個人檔案產生器
+
+    欄位與 TinderBot.get_current_profile_data 相同（name、age、bio、distance、photos、timestamp）。
+    簡介由固定數量的候選中抽出，重複出現的簡介與實際滑卡時相同，可命中分析快取；
+    timestamp 由模擬時鐘產生，同一種子的結果完全相同。
+    """
+
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        age_range: Tuple[int, int] = (18, 45),
+        max_distance: int = 80,
+        bio_pool_size: int = 500,
+        start_time: datetime = datetime(2025, 1, 1, 9),
+        seconds_per_swipe: float = 2.0
+    ):
+        """
+        Args:
+            seed: 隨機種子
+            age_range: 年齡範圍（含兩端）
+            max_distance: 最大距離（公里）
+            bio_pool_size: 候選簡介數量
+            start_time: 模擬時鐘的起始時間
+            seconds_per_swipe: 每張卡片推進的模擬秒數
+        """
+        self._rng = random.Random(seed)
+        self.age_range = age_range
+        self.max_distance = max_distance
+        self.start_time = start_time
+        self.seconds_per_swipe = seconds_per_swipe
+        self.count = 0
+        self.bios = [self._make_bio() for _ in range(bio_pool_size)]
+
+    def _make_bio(self) -> str:
+        rng = self._rng
+        # 約 8% 沒有簡介
+        if rng.random() < 0.08:
+            return ''
+        phrases = rng.sample(INTEREST_PHRASES, rng.randint(0, 4)) + rng.sample(NEUTRAL_PHRASES, rng.randint(0, 2))
+        if rng.random() < 0.15:
+            phrases.append(rng.choice(NEGATIVE_PHRASES))
+        rng.shuffle(phrases)
+        bio = '. '.join(phrases)
+        if bio and rng.random() < 0.5:
+            bio += ' ' + ''.join(rng.sample(EMOJIS, rng.randint(1, 3)))
+        return bio
+
+    def generate(self) -> Dict:
+        """
+        產生下一張卡片
+
+        Returns:
+            個人檔案資料（格式同 TinderBot.get_current_profile_data）
+        """
+        rng = self._rng
+        index = self.count
+        self.count += 1
+        # 距離偏向近距離（指數分布）
+        distance = min(self.max_distance, int(rng.expovariate(1 / 15)) + 1)
+        return {
+            'name': rng.choice(NAMES),
+            'age': rng.randint(*self.age_range),
+            'bio': rng.choice(self.bios),
+            'distance': distance,
+            'photos': [f'https://images.example.com/u{index}/{photo}.jpg' for photo in range(rng.randint(0, 6))],
+            'timestamp': (self.start_time + timedelta(seconds=index * self.seconds_per_swipe)).isoformat()
+        }
+
+    def generate_batch(self, count: int) -> List[Dict]:
+        """
+        產生多張卡片
+
+        Args:
+            count: 卡片數
+
+        Returns:
+            個人檔案資料列表
+        """
+        return [self.generate() for _ in range(count)]
+
+
+@dataclass
+class MatchModel:
+    """
+    配對機率模型（logistic）
+
+    logit(p) = logit(base_rate) + Σ weights[特徵] × (特徵 - 參考值)，特徵為照片數、簡介長度、
+    興趣分類數、距離與年齡差（單位見 DEFAULT_MATCH_WEIGHTS）。variant_rates 可為各個人檔案（A/B 測試組）
+    設定不同的基準配對率。可直接呼叫：model(profile, variant) -> 機率；任何相同簽章的函式都可取代本模型。
+    """
+
+    base_rate: float = 0.12
+    variant_rates: Dict[str, float] = field(default_factory=dict)
+    weights: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_MATCH_WEIGHTS))
+    preferred_age: int = 28
+
+    def __post_init__(self):
+        self._interest_matcher = InterestMatcher()
+        self._interest_counts: Dict[str, int] = {}
+
+    def features(self, profile: Dict) -> Dict[str, float]:
+        """
+        計算模型使用的特徵
+
+        Args:
+            profile: 個人檔案資料
+
+        Returns:
+            特徵名稱對應數值
+        """
+        bio = profile.get('bio') or ''
+        interests = self._interest_counts.get(bio)
+        if interests is None:
+            interests = self._interest_counts[bio] = len(self._interest_matcher.match(bio))
+        return {
+            'photo_count': len(profile.get('photos') or []),
+            'bio_length': min(len(bio), 300) / 100,
+            'interest_count': interests,
+            'distance': (profile.get('distance') or 0) / 10,
+            'age_gap': abs((profile.get('age') or self.preferred_age) - self.preferred_age) / 5,
+        }
+
+    def probability(self, profile: Dict, variant: Optional[str] = None) -> float:
+        """
+        右滑後配對成功的機率
+
+        Args:
+            profile: 個人檔案資料
+            variant: 目前使用的個人檔案（A/B 測試組），未設定於 variant_rates 時使用 base_rate
+
+        Returns:
+            0~1 之間的機率
+        """
+        log_odds = _logit(self.variant_rates.get(variant, self.base_rate))
+        for name, value in self.features(profile).items():
+            log_odds += self.weights.get(name, 0.0) * (value - _FEATURE_REFERENCE[name])
+        return 1 / (1 + math.exp(-log_odds))
+
+    __call__ = probability
+
+
+class SwipeSimulator:
+    """
+    離線滑卡模擬器
+
+    以 ProfileGenerator 取代瀏覽器中的卡片，以配對機率模型取代配對結果；滑卡方向與記錄格式
+    與 TinderBot 共用 swipe_strategy（choose_direction、build_record），產生的記錄可直接交給 AIScorer 訓練、
+    ABTestManager 分析或 DatabaseClient 寫入。相同種子的結果完全相同。
+    """
+
+    def __init__(
+        self,
+        generator: Optional[ProfileGenerator] = None,
+        match_model: Optional[Callable[[Dict, Optional[str]], float]] = None,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            generator: 個人檔案產生器，未提供時以 seed 建立
+            match_model: 配對機率模型，接受 (個人檔案, 測試組) 並回傳機率，未提供時使用 MatchModel()
+            seed: 隨機種子（random 策略與配對結果）
+        """
+        self.generator = generator or ProfileGenerator(seed=seed)
+        self.match_model = match_model or MatchModel()
+        self._rng = random.Random(seed)
+
+    def run(
+        self,
+        count: int,
+        strategy: str = 'random',
+        scorer: Optional[Any] = None,
+        variant: Optional[str] = None,
+        nlp: bool = True
+    ) -> List[Dict]:
+        """
+        模擬自動滑卡（同 TinderBot.auto_swipe，但沒有瀏覽器與延遲）
+
+        Args:
+            count: 滑卡次數
+            strategy: 策略 ('random', 'all_right', 'all_left', 'ai')
+            scorer: AIScorer 實例，'ai' 策略必須提供；其他策略提供時僅記錄評分
+            variant: 目前使用的個人檔案（A/B 測試組），傳給配對機率模型
+            nlp: 為 False 時以 fallback_score 評分（不需 NLTK 資料，同 auto_swipe 評分逾時的備援）
+
+        Returns:
+            滑卡記錄列表（格式同 auto_swipe）
+        """
+        if strategy == 'ai' and scorer is None:
+            raise ValueError("'ai' 策略需要提供 scorer")
+
+        records = []
+        for _ in range(count):
+            profile_data = self.generator.generate()
+
+            score_result = None
+            if scorer is not None:
+                score_result = scorer.predict_score(profile_data) if nlp else scorer.fallback_score(profile_data)
+
+            # random 策略使用模擬器的亂數，結果可重現
+            direction = choose_direction(strategy, score_result, rng=self._rng)
+            # 只有右滑可能配對
+            is_match = direction == 'right' and self._rng.random() < self.match_model(profile_data, variant)
+            records.append(build_record(profile_data, direction, is_match, score_result))
+
+        return records
+
+    def run_ab_test(self, manager: Any, arms: List[str], swipes_per_arm: int, **run_options) -> Dict:
+        """
+        固定樣本數的 A/B 測試：每組滑卡 swipes_per_arm 次後以 ABTestManager.analyze_arms 分析
+
+        Args:
+            manager: ABTestManager 實例
+            arms: 測試組名稱
+            swipes_per_arm: 每組滑卡次數
+            **run_options: 傳給 run 的其他參數（strategy、scorer、nlp）
+
+        Returns:
+            analyze_arms 的分析結果
+        """
+        return manager.analyze_arms({
+            arm: self.run(swipes_per_arm, variant=arm, **run_options) for arm in arms
+        })
+
+    def run_sequential(self, test: Any, batch_size: int = 20, max_batches: int = 10000, **run_options) -> Dict:
+        """
+        執行序貫測試直到停止：依 allocation 將每批滑卡分給仍在測試的組
+
+        Args:
+            test: SequentialABTest 實例
+            batch_size: 每組每批的滑卡次數
+            max_batches: 最多執行的批數（未設定預算時避免無限執行）
+            **run_options: 傳給 run 的其他參數
+
+        Returns:
+            最後的決策（同 SequentialABTest.decision）
+        """
+        decision = test.decision()
+        for _ in range(max_batches):
+            if decision['status'] != 'running':
+                break
+            for arm, share in decision['allocation'].items():
+                if share and decision['status'] == 'running':
+                    decision = test.update(arm, self.run(batch_size, variant=arm, **run_options))
+        return decision
+
+    def run_bandit(self, bandit: Any, sessions: int, session_size: int = 25, **run_options) -> Dict:
+        """
+        以個人檔案分配器決定每個時段使用的檔案
+
+        Args:
+            bandit: ProfileBandit 實例
+            sessions: 時段數
+            session_size: 每個時段的滑卡次數
+            **run_options: 傳給 run 的其他參數
+
+        Returns:
+            分配器的後驗摘要（同 ProfileBandit.summary）
+        """
+        for _ in range(sessions):
+            arm = bandit.choose()
+            bandit.update(arm, self.run(session_size, variant=arm, **run_options))
+        return bandit.summary()
@@ -0,0 +1,63 @@
+"""
+測試 A/B 測試統計檢定
+"""
+
+import unittest
+
+import numpy as np
+from scipy import stats
+
+from ab_stats import beta_posterior, compare_proportions, fisher_exact_test, two_proportion_z_test, wilson_interval
+
+
+class TestABStats(unittest.TestCase):
+    """統計檢定測試類別"""
+
+    def test_z_test(self):
+        """測試兩比例 z 檢定與常態分布計算結果一致，且可一次檢定多組"""
+        result = two_proportion_z_test([120, 50], [1000, 500], [90, 50], [1000, 500])
+        pooled = 210 / 2000
+        z = (0.12 - 0.09) / np.sqrt(pooled * (1 - pooled) * 2 / 1000)
+
+        self.assertAlmostEqual(result['z'][0], z)
+        self.assertAlmostEqual(result['p_value'][0], 2 * stats.norm.sf(z))
+        self.assertEqual(result['p_value'][1], 1.0)
+
+    def test_fisher_exact(self):
+        """測試 Fisher 精確檢定與 scipy 結果一致，且小樣本時自動採用"""
+        for a, n, b, m in [(3, 10, 9, 12), (0, 5, 4, 6), (20, 100, 35, 100), (1, 1, 0, 1)]:
+            expected = stats.fisher_exact([[a, n - a], [b, m - b]])[1]
+            self.assertAlmostEqual(fisher_exact_test(a, n, b, m), expected)
+
+        self.assertEqual(compare_proportions(3, 10, 9, 12)['test'], 'fisher')
+        self.assertEqual(compare_proportions(120, 1000, 90, 1000)['test'], 'z')
+
+    def test_wilson_interval(self):
+        """測試 Wilson 區間包含觀察比例，且沒有試驗時為 (0, 1)"""
+        low, high = wilson_interval([10, 0, 0], [40, 30, 0])
+
+        self.assertAlmostEqual(float(low[0]), 0.1419, places=4)
+        self.assertAlmostEqual(float(high[0]), 0.4019, places=4)
+        self.assertEqual(float(low[1]), 0.0)
+        self.assertEqual((float(low[2]), float(high[2])), (0.0, 1.0))
+
+    def test_beta_posterior_vectorized(self):
+        """測試多個測試一次計算的結果與逐一計算相同，可信區間與 Beta 分位數一致"""
+        successes = np.array([[30, 20], [5, 5], [0, 3]])
+        trials = np.array([[100, 100], [50, 50], [10, 10]])
+        batch = beta_posterior(successes, trials, draws=40000, seed=1, chunk_size=2)
+
+        for index in range(len(successes)):
+            single = beta_posterior(successes[index], trials[index], draws=40000, seed=2)
+            np.testing.assert_allclose(batch['prob_best'][index], single['prob_best'], atol=0.02)
+            np.testing.assert_allclose(
+                single['ci_low'], stats.beta.ppf(0.025, 1 + successes[index], 1 + trials[index] - successes[index])
+            )
+
+        np.testing.assert_allclose(batch['prob_best'].sum(axis=1), 1.0)
+        self.assertGreater(batch['prob_best'][0, 0], 0.9)
+        self.assertAlmostEqual(batch['prob_best'][1, 0], 0.5, delta=0.02)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,304 @@
+"""
+測試 A/B 測試管理器
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+sys.path.append(str(Path(__file__).parent.parent / 'automations'))
+
+from ab_stats import msprt_p_value
+from ab_test_manager import ABTestManager, ArmCounts, ProfileBandit, SequentialABTest, count_swipes
+from database_client import Base, DatabaseClient, dispose_engines
+
+
+def make_records(right: int, matches: int, left: int):
+    """產生指定次數的滑卡記錄（配對只出現在右滑）"""
+    return (
+        [{'swipe_direction': 'right', 'is_match': i < matches} for i in range(right)]
+        + [{'swipe_direction': 'left', 'is_match': False} for _ in range(left)]
+        + [{'swipe_direction': 'super', 'is_match': True}]
+    )
+
+
+class TestArmAggregation(unittest.TestCase):
+    """測試組次數彙總測試類別"""
+
+    def setUp(self):
+        """測試前設置"""
+        self.manager = ABTestManager(db_client=None, seed=1)
+        self.records = make_records(right=40, matches=10, left=25)
+        self.expected = ArmCounts(total_swipes=66, right_swipes=40, left_swipes=25, matches=10)
+
+    def test_sources_give_same_counts(self):
+        """測試列表、迭代器、DataFrame、Arrow 與分批來源的結果相同"""
+        frame = pd.DataFrame(self.records)
+        batches = [self.records[start:start + 16] for start in range(0, len(self.records), 16)]
+
+        sources = {
+            'list': self.records,
+            'iterator': iter(self.records),
+            'dataframe': frame,
+            'categorical': frame.astype({'swipe_direction': 'category'}),
+            'arrow': pa.Table.from_pandas(frame),
+            'record batches': pa.Table.from_pandas(frame).to_batches(max_chunksize=10),
+            'dict batches': (batch for batch in batches),
+            'frame batches': (pd.DataFrame(batch) for batch in batches),
+        }
+        for name, source in sources.items():
+            with self.subTest(source=name):
+                self.assertEqual(count_swipes(source), self.expected)
+
+    def test_analyze_test_results_keeps_format(self):
+        """測試兩組分析結果保留原本的欄位"""
+        results = self.manager.analyze_test_results(self.records, make_records(right=40, matches=5, left=25))
+
+        for key in ('total_swipes', 'right_swipes', 'left_swipes', 'matches', 'match_rate'):
+            self.assertEqual(results['profile_a'][key], self.expected.to_dict()[key])
+        self.assertEqual(results['profile_a']['match_rate'], 25.0)
+        self.assertIn('Profile A', self.manager.generate_report(results))
+
+    def test_small_samples_are_not_significant(self):
+        """測試配對率相差一倍但樣本少時不判定勝者（舊版 10% 規則會判定 high）"""
+        results = self.manager.analyze_test_results(self.records, make_records(right=40, matches=5, left=25))
+
+        self.assertEqual(results['winner'], 'tie')
+        self.assertGreater(results['significance']['p_value'], 0.05)
+        self.assertLess(results['significance']['difference_ci'][0], 0)
+        self.assertIn('信賴區間', self.manager.generate_report(results))
+
+    def test_significant_difference(self):
+        """測試樣本足夠時判定勝者，並提供信賴區間與勝出機率"""
+        results = self.manager.analyze_test_results(
+            make_records(right=2000, matches=300, left=10),
+            make_records(right=2000, matches=220, left=10)
+        )
+
+        self.assertEqual(results['winner'], 'profile_a')
+        self.assertEqual(results['confidence'], 'high')
+        significance = results['significance']
+        self.assertEqual(significance['test'], 'z')
+        self.assertAlmostEqual(significance['difference'], 4.0)
+        self.assertGreater(significance['difference_ci'][0], 0)
+        self.assertGreater(significance['prob_beats_runner_up'], 0.99)
+        low, high = results['profile_a']['match_rate_ci']
+        self.assertLess(low, 15.0)
+        self.assertGreater(high, 15.0)
+
+    def test_analyze_n_arms(self):
+        """測試 N 組分析由配對率最高的組勝出"""
+        results = self.manager.analyze_arms({
+            'outdoor': make_records(right=1000, matches=100, left=10),
+            'urban': make_records(right=1000, matches=180, left=10),
+            'artsy': pd.DataFrame(make_records(right=1000, matches=60, left=10)),
+        })
+
+        self.assertEqual(list(results['arms']), ['outdoor', 'urban', 'artsy'])
+        self.assertEqual(results['winner'], 'urban')
+        self.assertEqual(results['significance']['compared'], ['urban', 'outdoor'])
+        self.assertAlmostEqual(sum(arm['prob_best'] for arm in results['arms'].values()), 1.0, places=3)
+        self.assertIn('Artsy 表現', self.manager.generate_report(results))
+
+
+def bernoulli_batch(rng, size: int, match_rate: float):
+    """產生一批右滑記錄，依配對率隨機配對"""
+    return [{'swipe_direction': 'right', 'is_match': bool(rng.random() < match_rate)} for _ in range(size)]
+
+
+class TestSequentialABTest(unittest.TestCase):
+    """序貫測試類別"""
+
+    def setUp(self):
+        """測試前設置"""
+        self.manager = ABTestManager(db_client=None)
+        self.config = {'profiles': {'profile_a': {}, 'profile_b': {}}, 'swipes_per_profile': 3000}
+
+    def run_test(self, test: SequentialABTest, rates: dict, seed: int = 0, batch: int = 20) -> dict:
+        rng = np.random.default_rng(seed)
+        decision = test.decision()
+        while decision['status'] == 'running':
+            for arm, share in decision['allocation'].items():
+                if share and decision['status'] == 'running':
+                    decision = test.update(arm, bernoulli_batch(rng, batch, rates[arm]))
+        return decision
+
+    def test_stops_early_and_saves_budget(self):
+        """測試差異明顯時提早停止並省下滑卡預算"""
+        test = self.manager.create_sequential_test(self.config)
+        decision = self.run_test(test, {'profile_a': 0.10, 'profile_b': 0.22})
+
+        self.assertEqual(decision['winner'], 'profile_b')
+        self.assertEqual(decision['reason'], 'significant')
+        self.assertEqual(decision['allocation'], {'profile_a': 0.0, 'profile_b': 1.0})
+        self.assertGreater(decision['swipes_saved'], 3000)
+
+    def test_drops_losing_arm_and_persists(self):
+        """測試淘汰顯著劣於對照組的組別，且保存後可繼續累加"""
+        test = SequentialABTest(arms=['control', 'worse', 'similar'], budget_per_arm=4000)
+        rates = {'control': 0.20, 'worse': 0.05, 'similar': 0.20}
+        rng = np.random.default_rng(1)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'sequential.json')
+            while 'worse' in test.active:
+                for arm in list(test.active):
+                    test.update(arm, bernoulli_batch(rng, 20, rates[arm]))
+                test.save(path)
+                test = SequentialABTest.load(path)
+
+        self.assertEqual(test.status, 'running')
+        self.assertEqual(test.allocation(), {'control': 0.5, 'worse': 0.0, 'similar': 0.5})
+        self.assertLess(test.counts['worse'].total_swipes, 4000)
+
+        decision = self.run_test(test, rates, seed=2)
+        self.assertIn(decision['reason'], ('budget_exhausted', 'challengers_dropped', 'significant'))
+        self.assertEqual(decision['status'], 'stopped')
+
+    def test_type_one_error_with_continuous_monitoring(self):
+        """測試每批都檢查時，無差異的測試誤判比例仍不超過 alpha"""
+        rng = np.random.default_rng(7)
+        tests, looks, batch = 2000, 100, 20
+        successes = np.zeros((2, tests))
+        p_min = np.ones(tests)
+        for look in range(1, looks + 1):
+            successes += rng.binomial(batch, 0.15, (2, tests))
+            trials = look * batch
+            p_min = np.minimum(p_min, msprt_p_value(successes[0], trials, successes[1], trials))
+
+        self.assertLess((p_min < 0.05).mean(), 0.05)
+
+
+class TestProfileBandit(unittest.TestCase):
+    """個人檔案分配器測試類別"""
+
+    def setUp(self):
+        """測試前設置"""
+        self.manager = ABTestManager(db_client=None, seed=3)
+        self.config = {
+            'profiles': {'outdoor': {}, 'urban': {}, 'artsy': {}, 'minimal': {}},
+            'bandit': {'strategy': 'top_two'}
+        }
+        self.rates = {'outdoor': 0.10, 'urban': 0.12, 'artsy': 0.14, 'minimal': 0.20}
+
+    def run_sessions(self, bandit: ProfileBandit, sessions: int, rng) -> ProfileBandit:
+        for _ in range(sessions):
+            arm = bandit.choose()
+            bandit.update(arm, bernoulli_batch(rng, 25, self.rates[arm]))
+        return bandit
+
+    def test_finds_best_profile_and_persists(self):
+        """測試分配器找出配對率最高的檔案，且保存後可繼續累加"""
+        bandit = self.manager.create_bandit(self.config)
+        rng = np.random.default_rng(0)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'bandit.json')
+            for _ in range(8):
+                self.run_sessions(bandit, 10, rng).save(path)
+                bandit = ProfileBandit.load(path).seed(int(rng.integers(1000)))
+
+        summary = bandit.summary(seed=0)
+        self.assertEqual(bandit.sessions, 80)
+        self.assertEqual(sum(arm['right_swipes'] for arm in summary['arms'].values()), 80 * 25)
+        self.assertEqual(summary['best'], 'minimal')
+        self.assertGreater(summary['arms']['minimal']['prob_best'], 0.9)
+        # 最佳檔案取得最多流量，但仍持續比較次佳檔案
+        right = {name: arm['right_swipes'] for name, arm in summary['arms'].items()}
+        self.assertEqual(max(right, key=right.get), 'minimal')
+
+    def test_ucb_tries_every_profile_first(self):
+        """測試 UCB 先試過每個檔案，再選擇上界最高的檔案"""
+        bandit = self.manager.create_bandit(self.config, strategy='ucb')
+        for name in self.config['profiles']:
+            self.assertEqual(bandit.choose(), name)
+            bandit.update(name, ArmCounts(total_swipes=100, right_swipes=100, matches=10))
+        bandit.update('artsy', ArmCounts(total_swipes=10, right_swipes=10, matches=5))
+        self.assertEqual(bandit.choose(), 'artsy')
+
+        with self.assertRaises(ValueError):
+            ProfileBandit(arms=['a'], strategy='epsilon')
+
+
+
+class TestSessionRecording(unittest.TestCase):
+    """由資料庫累加滑卡時段結果的測試類別（使用暫存 SQLite 檔案）"""
+
+    def setUp(self):
+        """測試前設置"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_client = DatabaseClient(f"sqlite:///{os.path.join(self.tmp_dir.name, 'test.db')}")
+        Base.metadata.create_all(self.db_client.engine)
+        self.manager = ABTestManager(self.db_client, seed=1)
+        self.config = {'profiles': {'profile_a': {}, 'profile_b': {}}, 'swipes_per_profile': 3000}
+        self.start = datetime(2025, 10, 1, 9)
+
+    def tearDown(self):
+        """測試後清理"""
+        dispose_engines()
+        self.tmp_dir.cleanup()
+
+    def swipe(self, start: datetime, right: int, matches: int, left: int = 0, dating_account_id: int = 1):
+        """寫入一個時段的滑卡記錄，每分鐘一筆"""
+        directions = [('right', i < matches) for i in range(right)] + [('left', False)] * left
+        self.db_client.bulk_insert_swipe_records([
+            {'name': f'User{i}', 'swipe_direction': direction, 'is_match': is_match,
+             'timestamp': (start + timedelta(minutes=i)).isoformat()}
+            for i, (direction, is_match) in enumerate(directions)
+        ], dating_account_id)
+
+    def test_sequential_test_reads_each_session(self):
+        """測試序貫測試依時段累加資料庫中的記錄，並在差異顯著時停止"""
+        test = self.manager.create_sequential_test(self.config)
+        now = self.start
+        self.assertIsNone(self.manager.record_session(test, now=now))
+
+        rates = {'profile_a': 10, 'profile_b': 30}
+        for session in range(20):
+            arm = test.choose()
+            if arm is None or test.status != 'running':
+                break
+            self.swipe(now, right=100, matches=rates[arm], left=20)
+            self.swipe(now, right=50, matches=25, dating_account_id=2)
+            now += timedelta(hours=12)
+            counts = self.manager.record_session(test, dating_account_id=1, now=now)
+            self.assertEqual((counts.right_swipes, counts.left_swipes, counts.matches), (100, 20, rates[arm]))
+
+        self.assertEqual(test.status, 'stopped')
+        self.assertEqual(test.winner, 'profile_b')
+        self.assertEqual(test.choose(), 'profile_b')
+        self.assertEqual(test.session_started_at, now.isoformat())
+
+    def test_bandit_learns_from_sessions(self):
+        """測試分配器的後驗隨資料庫中各時段的記錄更新，並把流量集中到較佳的檔案"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'bandit.json')
+            bandit = self.manager.create_bandit(self.config)
+            now = self.start
+            self.manager.record_session(bandit, now=now)
+            chosen = []
+            for session in range(30):
+                arm = bandit.choose()
+                chosen.append(arm)
+                bandit.save(path)
+                self.swipe(now, right=40, matches=4 if arm == 'profile_a' else 16)
+                now += timedelta(hours=12)
+                bandit = ProfileBandit.load(path).seed(session)
+                self.manager.record_session(bandit, now=now)
+
+        summary = bandit.summary(seed=0)
+        self.assertEqual(sum(arm['right_swipes'] for arm in summary['arms'].values()), 30 * 40)
+        self.assertEqual(summary['best'], 'profile_b')
+        self.assertGreater(summary['arms']['profile_b']['prob_best'], 0.99)
+        self.assertGreater(chosen.count('profile_b'), chosen.count('profile_a'))
+
+
+if __name__ == '__main__':
+    unittest.main()
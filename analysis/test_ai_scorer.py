@@ -0,0 +1,130 @@
+"""
+測試 AI 評分系統
+"""
+
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from ai_scorer import AIScorer, swipe_record_to_profile
+from profile_analyzer import ProfileAnalysis
+
+
+class TestAIScorer(unittest.TestCase):
+    """AI 評分系統測試類別"""
+
+    def setUp(self):
+        """測試前設置"""
+        self.scorer = AIScorer()
+        self.test_profile = {
+            'name': 'Alice',
+            'age': 26,
+            'bio': 'Love traveling, photography, and good coffee. Adventure seeker and dog lover.',
+            'distance': 5,
+            'photos': ['url1', 'url2', 'url3', 'url4']
+        }
+
+    def test_predict_score_analyzes_once(self):
+        """測試單次評分只分析一次個人檔案"""
+        with mock.patch.object(
+            self.scorer.analyzer, 'analyze', wraps=self.scorer.analyzer.analyze
+        ) as analyze:
+            result = self.scorer.predict_score(self.test_profile)
+
+        self.assertEqual(analyze.call_count, 1)
+        self.assertEqual(result['method'], 'rule_based')
+        self.assertIn(result['recommendation'], ('right', 'left'))
+
+    def test_precomputed_analysis_matches(self):
+        """測試傳入預先計算的分析結果與重新分析一致"""
+        analysis = self.scorer.analyze(self.test_profile)
+
+        self.assertIsInstance(analysis, ProfileAnalysis)
+        self.assertEqual(
+            self.scorer.predict_score(self.test_profile, analysis),
+            self.scorer.predict_score(self.test_profile)
+        )
+        self.assertEqual(
+            self.scorer.extract_features(self.test_profile, analysis).tolist(),
+            self.scorer.extract_features(self.test_profile).tolist()
+        )
+
+    def test_fallback_score_skips_nlp(self):
+        """測試快速評分不執行分詞與情感分析"""
+        with mock.patch.object(self.scorer.analyzer, 'extract_keywords') as extract_keywords, \
+                mock.patch.object(self.scorer.analyzer, 'analyze_sentiment') as analyze_sentiment:
+            result = self.scorer.fallback_score(self.test_profile)
+
+        extract_keywords.assert_not_called()
+        analyze_sentiment.assert_not_called()
+        self.assertEqual(result['method'], 'rule_based_fallback')
+        self.assertIn(result['recommendation'], ('right', 'left'))
+
+    def _varied_profiles(self):
+        """產生涵蓋各規則分支的測試檔案"""
+        bios = [
+            '',
+            'Hi',
+            'I hate boring days and rude people, terrible vibes honestly.',
+            self.test_profile['bio'],
+            'Gym, guitar, cooking, hiking, painting, books, coding, dog, movie, beach ' * 6,
+        ]
+        profiles = []
+        for i, (age, distance) in enumerate([(19, 0), (22, 1), (26, 5), (34, 15), (40, 60)]):
+            for j, bio in enumerate(bios):
+                profiles.append({
+                    'name': f'User{i}{j}',
+                    'age': age,
+                    'distance': distance,
+                    'bio': bio + ' 😀' * (i * 3),
+                    'photos': ['url'] * j
+                })
+        return profiles
+
+    def test_predict_scores_matches_rule_based(self):
+        """測試批次規則評分與逐筆評分一致"""
+        profiles = self._varied_profiles()
+
+        scores = self.scorer.predict_scores(profiles)
+        expected = [self.scorer.rule_based_score(profile) for profile in profiles]
+
+        self.assertIsInstance(scores, np.ndarray)
+        self.assertEqual(scores.tolist(), expected)
+
+    def test_predict_scores_matches_model(self):
+        """測試批次模型評分與逐筆評分一致"""
+        profiles = self._varied_profiles()
+        labels = [i % 2 for i in range(len(profiles))]
+        with mock.patch('builtins.print'):
+            self.scorer.train_model(profiles, labels)
+
+        scores = self.scorer.predict_scores(profiles)
+        expected = [self.scorer.predict_score(profile)['score'] for profile in profiles]
+
+        self.assertEqual(np.round(scores, 2).tolist(), expected)
+
+    def test_train_from_record_batches(self):
+        """測試分批訓練與一次載入全部記錄的結果一致"""
+        profiles = self._varied_profiles()
+        labels = [i % 2 for i in range(len(profiles))]
+        records = [
+            {
+                'target_name': p['name'], 'target_age': p['age'], 'target_bio': p['bio'],
+                'target_distance': p['distance'], 'target_photos': p['photos'], 'is_match': bool(label)
+            }
+            for p, label in zip(profiles, labels)
+        ]
+        streamed = AIScorer()
+        with mock.patch('builtins.print'):
+            self.scorer.train_model([swipe_record_to_profile(r) for r in records], labels)
+            streamed.train_model_from_records([records[:3], records[3:]])
+
+        self.assertEqual(
+            streamed.predict_scores(profiles).tolist(),
+            self.scorer.predict_scores(profiles).tolist()
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+測試個人檔案分析快取
+"""
+
+import os
+import tempfile
+import unittest
+
+from analysis_cache import AnalysisCache
+from profile_analyzer import ANALYZER_VERSION, ProfileAnalyzer
+
+
+class TestAnalysisCache(unittest.TestCase):
+    """分析快取測試類別"""
+
+    def setUp(self):
+        """測試前設置"""
+        self.entry = {
+            'keywords': [('hiking', 1)],
+            'sentiment': {'polarity': 0.5, 'subjectivity': 0.6},
+            'interests': ['travel'],
+            'emojis': []
+        }
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, 'analysis_cache.db')
+
+    def tearDown(self):
+        """測試後清理"""
+        self.tmp_dir.cleanup()
+
+    def test_lru_eviction(self):
+        """測試超過容量時淘汰最久未使用的項目"""
+        cache = AnalysisCache(version='1', max_entries=2)
+        cache.put('a', self.entry)
+        cache.put('b', self.entry)
+        cache.get('a')
+        cache.put('c', self.entry)
+
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.stats()['entries'], 2)
+        self.assertEqual(cache.stats()['hits'], 2)
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_disk_tier_survives_restart(self):
+        """測試 SQLite 層在重新開啟後仍可命中"""
+        cache = AnalysisCache(version='1', db_path=self.db_path)
+        cache.put('Love hiking', self.entry)
+        cache.close()
+
+        reopened = AnalysisCache(version='1', db_path=self.db_path)
+        self.assertEqual(reopened.get('Love hiking'), self.entry)
+        self.assertEqual(reopened.stats()['disk_hits'], 1)
+        reopened.close()
+
+    def test_version_change_invalidates(self):
+        """測試分析器版本變更後舊項目失效"""
+        cache = AnalysisCache(version='old', db_path=self.db_path)
+        cache.put('Love hiking', self.entry)
+        cache.close()
+
+        reopened = AnalysisCache(version='new', db_path=self.db_path)
+        self.assertIsNone(reopened.get('Love hiking'))
+        reopened.close()
+
+    def test_analyzer_uses_cache(self):
+        """測試分析器重複分析相同簡介時命中快取"""
+        cache = AnalysisCache(version='stale')
+        analyzer = ProfileAnalyzer(cache=cache)
+        profile = {'name': 'John', 'bio': 'Love hiking, photography, and good coffee'}
+
+        first = analyzer.analyze(profile)
+        second = analyzer.analyze(profile)
+
+        self.assertEqual(cache.version, ANALYZER_VERSION)
+        self.assertEqual(first, second)
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+測試每日分析快照
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / 'automations'))
+
+from analytics_snapshots import SnapshotJob
+from database_client import Base, DatabaseClient, dispose_engines
+from stats_generator import STATS_COLUMNS, StatsGenerator
+
+
+def make_records(count: int, start: datetime):
+    """每 5 小時一筆滑卡記錄"""
+    return [
+        {
+            'name': f'User{i}',
+            'age': 20 + i % 15,
+            'distance': i % 30,
+            'swipe_direction': 'right' if i % 3 else 'left',
+            'is_match': i % 6 == 1,
+            'ai_score': 60 + i % 20,
+            'timestamp': (start + timedelta(hours=5 * i)).isoformat()
+        }
+        for i in range(count)
+    ]
+
+
+class TestSnapshotJob(unittest.TestCase):
+    """快照工作測試類別（使用暫存 SQLite 檔案）"""
+
+    def setUp(self):
+        """測試前設置"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_client = DatabaseClient(f"sqlite:///{os.path.join(self.tmp_dir.name, 'test.db')}")
+        Base.metadata.create_all(self.db_client.engine)
+        self.today = date(2025, 10, 20)
+        # 10/11 起至今天（含今天的未結束記錄）
+        self.db_client.bulk_insert_swipe_records(make_records(50, datetime(2025, 10, 11, 1)), 1)
+        self.db_client.bulk_insert_swipe_records(make_records(20, datetime(2025, 10, 15, 3)), 2)
+        self.job = SnapshotJob(self.db_client, batch_size=7)
+
+    def tearDown(self):
+        """測試後清理"""
+        dispose_engines()
+        self.tmp_dir.cleanup()
+
+    def full_report(self, dating_account_id=None, start=None, end=None):
+        frames = self.db_client.stream_swipe_frames(
+            dating_account_id=dating_account_id, start=start, end=end, columns=STATS_COLUMNS
+        )
+        generator = StatsGenerator()
+        return generator.generate_comprehensive_report(generator.frames_to_dataframe(frames))
+
+    def test_run_is_incremental(self):
+        """測試只彙總已結束且尚未建立快照的日期"""
+        written = self.job.run(until=self.today)
+        self.assertEqual(written, 9 + 5)
+        self.assertEqual(self.db_client.last_snapshot_date(1), self.today - timedelta(days=1))
+
+        snapshot = self.db_client.get_analytics_snapshots(1, start=date(2025, 10, 11), end=date(2025, 10, 12))[0]
+        self.assertEqual(snapshot['total_swipes'], 5)
+        self.assertEqual(snapshot['right_swipes'] + snapshot['left_swipes'], 5)
+        self.assertIn('age', snapshot['metadata'])
+
+        # 重複執行不再寫入，隔天只寫入新結束的日期
+        self.assertEqual(self.job.run(until=self.today), 0)
+        self.assertEqual(self.job.run(dating_account_id=1, until=self.today + timedelta(days=1)), 1)
+
+    def test_report_from_snapshots_matches_full_scan(self):
+        """測試快照加上未彙總記錄產生的報告與完整掃描一致"""
+        self.job.run(until=self.today)
+        generator = StatsGenerator()
+
+        for dating_account_id in (1, None):
+            report = generator.generate_comprehensive_report(self.job.load_state(dating_account_id))
+            self.assertEqual(report, self.full_report(dating_account_id))
+
+    def test_report_window_matches_full_scan(self):
+        """測試指定時間範圍時報告與完整掃描相同範圍一致"""
+        self.job.run(until=self.today)
+        generator = StatsGenerator()
+        windows = [
+            (datetime(2025, 10, 12, 13), datetime(2025, 10, 18, 7)),
+            (datetime(2025, 10, 13), datetime(2025, 10, 16)),
+            (datetime(2025, 10, 17, 10), None),
+            (None, datetime(2025, 10, 15, 20)),
+            (datetime(2025, 10, 14, 2), datetime(2025, 10, 14, 22)),
+        ]
+
+        for dating_account_id in (1, None):
+            for start, end in windows:
+                state = self.job.load_state(dating_account_id, start=start, end=end)
+                self.assertEqual(
+                    generator.generate_comprehensive_report(state),
+                    self.full_report(dating_account_id, start=start, end=end)
+                )
+
+
+if __name__ == '__main__':
+    unittest.main()
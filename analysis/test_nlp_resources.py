@@ -0,0 +1,44 @@
+"""
+測試 NLP 資源載入
+"""
+
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import nlp_resources
+
+
+class TestNLPResources(unittest.TestCase):
+    """NLP 資源載入測試類別"""
+
+    def test_import_does_not_load_nltk(self):
+        """測試匯入分析器時不載入 NLTK/TextBlob"""
+        code = (
+            "import sys, profile_analyzer; "
+            "print('nltk' in sys.modules or 'textblob' in sys.modules)"
+        )
+        output = subprocess.run(
+            [sys.executable, '-c', code],
+            cwd=Path(__file__).parent, capture_output=True, text=True, check=True
+        ).stdout
+
+        self.assertEqual(output.strip(), 'False')
+
+    def test_missing_data_fails_fast(self):
+        """測試缺少資料時直接拋出錯誤而不下載"""
+        import nltk
+
+        with mock.patch.object(nlp_resources, '_ready', False), \
+                mock.patch.object(nltk.data, 'find', side_effect=LookupError), \
+                mock.patch.object(nltk, 'download') as download:
+            with self.assertRaises(nlp_resources.NLPResourceError):
+                nlp_resources.ensure_resources()
+
+        download.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
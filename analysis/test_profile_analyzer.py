@@ -43,6 +43,22 @@ class TestProfileAnalyzer(unittest.TestCase):
         self.assertIn('food', interests)
         self.assertIn('music', interests)
 
+    def test_detect_interests_word_start(self):
+        """測試興趣關鍵字須出現在單字開頭"""
+        self.assertEqual(self.analyzer.detect_interests("Party person, two dogs"), ['pets'])
+        self.assertEqual(self.analyzer.detect_interests(""), [])
+
+    def test_custom_interest_taxonomy(self):
+        """測試自訂興趣分類"""
+        analyzer = ProfileAnalyzer(interest_taxonomy={
+            'climbing': ['rock climbing', 'bouldering'],
+            'outdoors': ['rock', 'climbing']
+        })
+        interests = analyzer.detect_interests("Weekend rock climbing addict")
+
+        self.assertEqual(interests, ['climbing', 'outdoors'])
+        self.assertNotEqual(analyzer.version, self.analyzer.version)
+
     def test_analyze_profile(self):
         """測試完整檔案分析"""
         test_profile = {
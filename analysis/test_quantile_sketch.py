@@ -0,0 +1,101 @@
+"""
+測試 KLL 近似分位數草圖
+"""
+
+import json
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from quantile_sketch import KLLSketch
+from stats_generator import APPROXIMATE_QUANTILES, StatsGenerator
+
+
+def rank_gap(values: np.ndarray, estimate: float, q: float) -> float:
+    """估計值在精確資料中的排名區間與 q 的距離（整數資料有重複值時排名為區間）"""
+    low = np.searchsorted(values, estimate, side='left') / len(values)
+    high = np.searchsorted(values, estimate, side='right') / len(values)
+    return max(0.0, low - q, q - high)
+
+
+class TestKLLSketch(unittest.TestCase):
+    """KLL 草圖測試類別"""
+
+    def setUp(self):
+        """測試前設置"""
+        rng = np.random.default_rng(3)
+        self.distances = rng.lognormal(2, 0.8, 300000)
+        self.ages = rng.integers(18, 60, 300000).astype(float)
+
+    def assert_within_bound(self, sketch: KLLSketch, values: np.ndarray):
+        exact = np.sort(values)
+        for q in APPROXIMATE_QUANTILES + (0.1, 0.25, 0.75):
+            self.assertLessEqual(rank_gap(exact, sketch.quantile(q), q), sketch.rank_error)
+
+        edges = np.linspace(exact[0], exact[-1], 11)
+        expected, _ = np.histogram(exact, edges)
+        approx = sketch.histogram(edges.tolist())
+        self.assertEqual(sum(approx), len(values))
+        for count, exact_count in zip(approx, expected):
+            self.assertLessEqual(abs(count - exact_count) / len(values), 2 * sketch.rank_error)
+
+    def test_error_within_documented_bound(self):
+        """測試分位數與直方圖誤差在文件記載的界限內，且記憶體用量固定"""
+        for values in (self.distances, self.ages):
+            sketch = KLLSketch(seed=1)
+            for chunk in np.array_split(values, 300):
+                sketch.update(chunk)
+
+            self.assert_within_bound(sketch, values)
+            self.assertLess(sketch.size, 3 * sketch.k + 50)
+            self.assertEqual(sketch.count, len(values))
+            self.assertAlmostEqual(sketch.mean, values.mean())
+            self.assertEqual((sketch.min, sketch.max), (values.min(), values.max()))
+
+    def test_merge_shards(self):
+        """測試各分片草圖合併後的誤差界限同單一草圖"""
+        shards = [KLLSketch(seed=seed) for seed in range(8)]
+        for index, chunk in enumerate(np.array_split(self.distances, 80)):
+            shards[index % len(shards)].update(chunk)
+
+        merged = shards[0]
+        for shard in shards[1:]:
+            # 經由 JSON 往返，模擬其他工作程序保存的草圖
+            merged.merge(KLLSketch.from_dict(json.loads(json.dumps(shard.to_dict()))))
+
+        self.assert_within_bound(merged, self.distances)
+        self.assertLess(merged.size, 3 * merged.k + 50)
+
+    def test_approximate_report(self):
+        """測試近似報告與精確報告的次數一致，年齡分位數與 pandas 結果相差在誤差內"""
+        rng = np.random.default_rng(5)
+        count = 20000
+        df = pd.DataFrame({
+            'target_age': rng.integers(0, 50, count),
+            'target_distance': rng.integers(0, 80, count),
+            'swipe_direction': rng.choice(['left', 'right'], count),
+            'is_match': rng.random(count) < 0.1,
+            'swiped_at': pd.Timestamp('2025-10-01') + pd.to_timedelta(rng.integers(0, 86400 * 30, count), unit='s')
+        })
+        generator = StatsGenerator()
+        exact = generator.generate_comprehensive_report(df)
+        report = generator.generate_approximate_report(df.iloc[start:start + 2000] for start in range(0, count, 2000))
+
+        for section in ('summary', 'swipe_stats', 'time_stats', 'daily_stats'):
+            self.assertEqual(report[section], exact[section])
+        self.assertEqual(report['age_stats']['avg_age'], exact['age_stats']['avg_age'])
+        self.assertEqual(report['age_stats']['min_age'], exact['age_stats']['min_age'])
+
+        ages = df.loc[df['target_age'] > 0, 'target_age']
+        for q in APPROXIMATE_QUANTILES:
+            estimate = report['age_stats']['age_quantiles'][f'p{int(q * 100)}']
+            self.assertLessEqual(rank_gap(np.sort(ages.to_numpy()), estimate, q), report['age_stats']['rank_error'])
+            # 每個整數年齡約占 2%，大於排名誤差，因此估計值與 pandas 的結果相差不超過 1 歲
+            self.assertLessEqual(abs(estimate - ages.quantile(q)), 1)
+        self.assertEqual(sum(report['distance_stats']['distance_histogram']['counts']),
+                         int((df['target_distance'] > 0).sum()))
+
+
+if __name__ == '__main__':
+    unittest.main()
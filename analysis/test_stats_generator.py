@@ -0,0 +1,62 @@
+"""
+測試統計報告生成器
+"""
+
+import unittest
+from datetime import date
+from unittest import mock
+
+import pandas as pd
+
+import stats_generator
+from stats_generator import REPORT_SECTIONS, StatsGenerator
+
+
+class TestStatsGenerator(unittest.TestCase):
+    """統計報告生成器測試類別"""
+
+    def setUp(self):
+        """測試前設置"""
+        self.generator = StatsGenerator()
+        self.records = [
+            {'id': 1, 'target_age': 25, 'target_distance': 5, 'swipe_direction': 'right',
+             'is_match': True, 'swiped_at': '2025-10-11 10:00:00'},
+            {'id': 2, 'target_age': 28, 'target_distance': 8, 'swipe_direction': 'left',
+             'is_match': False, 'swiped_at': '2025-10-11 10:05:00'},
+            {'id': 3, 'target_age': 26, 'target_distance': 3, 'swipe_direction': 'right',
+             'is_match': False, 'swiped_at': '2025-10-12 11:00:00'},
+        ]
+
+    def test_comprehensive_report(self):
+        """測試綜合報告內容"""
+        report = self.generator.generate_comprehensive_report(self.records)
+
+        self.assertEqual(list(report), ['summary', *REPORT_SECTIONS])
+        self.assertEqual(report['summary']['date_range']['start'], '2025-10-11 10:00:00')
+        self.assertEqual(report['time_stats'], {'hourly_distribution': {10: 2, 11: 1}, 'peak_hour': 10})
+        self.assertEqual(report['daily_stats']['total_swipes'], {date(2025, 10, 11): 2, date(2025, 10, 12): 1})
+        self.assertEqual(report['daily_stats']['matches'], {date(2025, 10, 11): 1, date(2025, 10, 12): 0})
+        self.assertEqual(report['daily_stats']['match_rate'][date(2025, 10, 11)], 50.0)
+
+    def test_parses_once_without_mutating_input(self):
+        """測試時間戳記只解析一次且不修改輸入"""
+        df = pd.DataFrame(self.records)
+        original = df.copy()
+
+        with mock.patch.object(stats_generator.pd, 'to_datetime', wraps=pd.to_datetime) as to_datetime:
+            self.generator.generate_comprehensive_report(df)
+
+        self.assertEqual(to_datetime.call_count, 1)
+        pd.testing.assert_frame_equal(df, original)
+
+    def test_selected_sections(self):
+        """測試只產生指定區塊"""
+        report = self.generator.generate_comprehensive_report(self.records, sections=['age_stats'])
+
+        self.assertEqual(list(report), ['summary', 'age_stats'])
+        with self.assertRaises(ValueError):
+            self.generator.generate_comprehensive_report(self.records, sections=['unknown'])
+
+
+if __name__ == '__main__':
+    unittest.main()
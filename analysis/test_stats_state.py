@@ -0,0 +1,126 @@
+"""
+測試可合併的滑卡統計狀態
+"""
+
+import os
+import random
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from stats_generator import StatsGenerator
+from stats_state import SwipeStatsState, ValueStats
+
+
+def make_records(count: int, seed: int = 7):
+    """產生跨多日的隨機滑卡記錄（部分年齡、距離為 0 表示未知）"""
+    rng = random.Random(seed)
+    start = datetime(2024, 12, 30)
+    return [
+        {
+            'id': i + 1,
+            'target_age': rng.choice([0, rng.randint(18, 45)]),
+            'target_distance': rng.randint(0, 60),
+            'swipe_direction': rng.choice(['left', 'right', 'right', 'super']),
+            'is_match': rng.random() < 0.2,
+            'swiped_at': (start + timedelta(minutes=37 * i)).isoformat(sep=' ')
+        }
+        for i in range(count)
+    ]
+
+
+class TestSwipeStatsState(unittest.TestCase):
+    """統計狀態測試類別"""
+
+    def setUp(self):
+        """測試前設置"""
+        self.generator = StatsGenerator()
+        self.records = make_records(500)
+
+    def test_report_matches_dataframe_report(self):
+        """測試由狀態產生的報告與由完整記錄計算的結果相同"""
+        state = SwipeStatsState().update(self.records)
+
+        self.assertEqual(
+            self.generator.generate_comprehensive_report(state),
+            self.generator.generate_comprehensive_report(self.records)
+        )
+
+    def test_incremental_and_merge_equal_full(self):
+        """測試分批累加、跨工作程序合併與一次計算結果相同"""
+        full = SwipeStatsState().update(self.records)
+
+        incremental = SwipeStatsState()
+        for start in range(0, 500, 120):
+            incremental.update(self.records[start:start + 120])
+
+        merged = SwipeStatsState().update(self.records[300:]).merge(SwipeStatsState().update(self.records[:300]))
+
+        for state in (incremental, merged):
+            self.assertEqual(
+                self.generator.generate_comprehensive_report(state),
+                self.generator.generate_comprehensive_report(full)
+            )
+            self.assertAlmostEqual(state.age.variance, full.age.variance)
+        self.assertEqual(merged.watermark_id, 500)
+
+    def test_save_and_load(self):
+        """測試保存後載入可繼續累加"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'state.json')
+            SwipeStatsState().update(self.records[:200]).save(path)
+
+            state = SwipeStatsState.load(path).update(self.records[200:])
+
+        full = SwipeStatsState().update(self.records)
+        self.assertEqual(
+            self.generator.generate_comprehensive_report(state),
+            self.generator.generate_comprehensive_report(full)
+        )
+        self.assertEqual(state.watermark_id, full.watermark_id)
+        self.assertEqual(SwipeStatsState.load(os.path.join('missing', 'state.json')).total, 0)
+
+    def test_late_commit_is_not_skipped(self):
+        """測試 ID 較小但較晚提交的記錄在下次增量讀取時補上，重疊讀取的記錄不重複計算"""
+        created = datetime(2025, 1, 5, 12)
+        for i, record in enumerate(self.records):
+            record['created_at'] = created + timedelta(seconds=i)
+        late = self.records[397]
+
+        def read(state, visible):
+            # 模擬 stream_swipe_frames(created_since=...) 的查詢
+            start = state.incremental_start()
+            return [r for r in visible if start is None or r['created_at'] >= start]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'state.json')
+            state = SwipeStatsState()
+            state.update(read(state, [r for r in self.records[:400] if r is not late])).save(path)
+
+            state = SwipeStatsState.load(path)
+            state.update(read(state, self.records))
+
+        full = SwipeStatsState().update(self.records)
+        self.assertEqual(state.total, 500)
+        self.assertEqual(
+            self.generator.generate_comprehensive_report(state),
+            self.generator.generate_comprehensive_report(full)
+        )
+        self.assertEqual(state.watermark_created_at, str(pd.Timestamp(self.records[-1]['created_at'])))
+
+    def test_quantiles_match_pandas(self):
+        """測試直方圖分位數與 pandas 結果相同"""
+        values = pd.Series([r['target_distance'] for r in self.records])
+        values = values[values > 0]
+        stats = ValueStats()
+        stats.update(values)
+
+        for q in (0.1, 0.5, 0.9, 0.99):
+            self.assertAlmostEqual(stats.quantile(q), values.quantile(q))
+        self.assertAlmostEqual(stats.std, values.std())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+測試滑卡記錄 Parquet 資料集
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from stats_generator import StatsGenerator
+from swipe_dataset import iter_swipe_frames, read_swipe_dataset, write_swipe_dataset
+
+
+def make_frame(dating_account_id: int, count: int, start: datetime) -> pd.DataFrame:
+    """產生 swipe_records 欄位的 DataFrame，每 6 小時一筆"""
+    return pd.DataFrame({
+        'id': range(dating_account_id * 1000, dating_account_id * 1000 + count),
+        'dating_account_id': dating_account_id,
+        'profile_id': None,
+        'ab_test_id': None,
+        'target_name': [f'User{i}' for i in range(count)],
+        'target_age': [20 + i for i in range(count)],
+        'target_bio': 'Love hiking',
+        'target_photos': [['url1', 'url2']] * count,
+        'target_distance': 5,
+        'swipe_direction': ['right' if i % 2 else 'left' for i in range(count)],
+        'is_match': [i % 4 == 1 for i in range(count)],
+        'ai_score': 70.5,
+        'decision_reason': None,
+        'swiped_at': [start + timedelta(hours=6 * i) for i in range(count)],
+        'created_at': start
+    })
+
+
+class TestSwipeDataset(unittest.TestCase):
+    """Parquet 資料集測試類別"""
+
+    def setUp(self):
+        """測試前設置：兩個帳號各 8 筆（跨兩天）"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        start = datetime(2025, 1, 1)
+        self.written = write_swipe_dataset(
+            [make_frame(1, 8, start), make_frame(2, 8, start)], self.root
+        )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_partitions_by_account_and_date(self):
+        """測試依帳號與日期分區"""
+        self.assertEqual(self.written, 16)
+        self.assertEqual(sorted(os.listdir(self.root)), ['dating_account_id=1', 'dating_account_id=2'])
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(self.root, 'dating_account_id=1'))),
+            ['swipe_date=2025-01-01', 'swipe_date=2025-01-02']
+        )
+
+    def test_rewrite_replaces_partitions(self):
+        """測試重複匯出同一範圍不會產生重複記錄"""
+        write_swipe_dataset([make_frame(1, 8, datetime(2025, 1, 1))], self.root)
+
+        self.assertEqual(len(read_swipe_dataset(self.root, columns=['id'])), 16)
+
+    def test_partial_day_export_keeps_rows_outside_range(self):
+        """測試起訖不在午夜的匯出不會覆蓋同一天範圍外的記錄"""
+        frame = make_frame(1, 8, datetime(2025, 1, 1))
+        start, end = datetime(2025, 1, 1, 10), datetime(2025, 1, 2, 10)
+        window = frame[(frame['swiped_at'] >= start) & (frame['swiped_at'] < end)]
+
+        written = write_swipe_dataset([window], self.root, dating_account_id=1, start=start, end=end)
+
+        self.assertEqual(written, 4)
+        self.assertEqual(sorted(read_swipe_dataset(self.root, columns=['id'], dating_account_id=1)['id']),
+                         list(range(1000, 1008)))
+        self.assertEqual(len(read_swipe_dataset(self.root, columns=['id'])), 16)
+
+    def test_filters_and_projection(self):
+        """測試欄位裁剪與帳號、時間、方向篩選"""
+        frame = read_swipe_dataset(
+            self.root,
+            columns=['target_name', 'swiped_at'],
+            dating_account_id=2,
+            start=datetime(2025, 1, 1, 12),
+            end=datetime(2025, 1, 2, 12),
+            directions=['right']
+        )
+
+        self.assertEqual(list(frame.columns), ['target_name', 'swiped_at'])
+        self.assertEqual(frame['target_name'].tolist(), ['User3', 'User5'])
+
+    def test_frames_and_stats(self):
+        """測試分批 DataFrame 讀取與統計報告直接讀取"""
+        frames = list(iter_swipe_frames(self.root, columns=['target_photos', 'is_match'], batch_size=5))
+        self.assertEqual(sum(len(frame) for frame in frames), 16)
+        self.assertEqual(list(frames[0].columns), ['target_photos', 'is_match'])
+        self.assertEqual(list(frames[0]['target_photos'].iloc[0]), ['url1', 'url2'])
+
+        generator = StatsGenerator()
+        report = generator.generate_comprehensive_report(generator.load_parquet(self.root, dating_account_id=1))
+        self.assertEqual(report['summary']['total_records'], 8)
+        self.assertEqual(report['swipe_stats']['counts'], {'left': 4, 'right': 4})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+測試離線滑卡模擬器
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / 'automations'))
+
+from ab_test_manager import ABTestManager, count_swipes
+from ai_scorer import AIScorer
+from swipe_simulator import MatchModel, ProfileGenerator, SwipeSimulator
+from tinder_bot import TinderBot
+
+
+class TestSwipeSimulator(unittest.TestCase):
+    """滑卡模擬器測試類別"""
+
+    def test_profiles_match_bot_format(self):
+        """測試合成個人檔案的欄位與 TinderBot 擷取結果相同"""
+        empty = TinderBot.parse_profile_fields({})
+        for profile in ProfileGenerator(seed=1).generate_batch(50):
+            self.assertEqual(set(profile), set(empty) | {'timestamp'})
+            for key, value in empty.items():
+                self.assertIsInstance(profile[key], type(value))
+
+    def test_same_seed_is_reproducible(self):
+        """測試相同種子的記錄完全相同"""
+        runs = [SwipeSimulator(seed=7).run(500, 'ai', AIScorer(), nlp=False) for _ in range(2)]
+        self.assertEqual(runs[0], runs[1])
+        self.assertNotEqual(runs[0], SwipeSimulator(seed=8).run(500, 'ai', AIScorer(), nlp=False))
+
+        with self.assertRaises(ValueError):
+            SwipeSimulator(seed=7).run(1, 'ai')
+
+    def test_match_model_drives_outcomes(self):
+        """測試只有右滑會配對，且配對率依測試組的基準配對率"""
+        model = MatchModel(variant_rates={'profile_a': 0.05, 'profile_b': 0.30})
+        simulator = SwipeSimulator(match_model=model, seed=3)
+
+        self.assertEqual(count_swipes(simulator.run(300, 'all_left')).matches, 0)
+        rate_a = count_swipes(simulator.run(5000, 'all_right', variant='profile_a')).match_rate
+        rate_b = count_swipes(simulator.run(5000, 'all_right', variant='profile_b')).match_rate
+        self.assertLess(rate_a, 10)
+        self.assertGreater(rate_b, 20)
+
+    def test_drives_ab_test_manager(self):
+        """測試以模擬結果執行固定樣本、序貫測試與多臂分配"""
+        model = MatchModel(variant_rates={'profile_a': 0.08, 'profile_b': 0.20})
+        simulator = SwipeSimulator(match_model=model, seed=5)
+        manager = ABTestManager(db_client=None, seed=5)
+        config = {'profiles': {'profile_a': {}, 'profile_b': {}}, 'swipes_per_profile': 3000}
+
+        fixed = simulator.run_ab_test(manager, list(config['profiles']), 1500, strategy='all_right')
+        self.assertEqual(fixed['winner'], 'profile_b')
+
+        decision = simulator.run_sequential(manager.create_sequential_test(config), strategy='all_right')
+        self.assertEqual(decision['winner'], 'profile_b')
+        self.assertLess(decision['swipes_used'], 2 * 3000)
+
+        summary = simulator.run_bandit(manager.create_bandit(config), sessions=60, strategy='all_right')
+        self.assertEqual(summary['best'], 'profile_b')
+        self.assertGreater(summary['arms']['profile_b']['right_swipes'], summary['arms']['profile_a']['right_swipes'])
+
+
+if __name__ == '__main__':
+    unittest.main()
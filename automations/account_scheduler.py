@@ -0,0 +1,359 @@
+"""
+多帳號排程器
+以共用的 Chromium 程序同時執行多個帳號的自動滑卡，每個帳號使用獨立的 browser context
+"""
+
+import asyncio
+import json
+import logging
+from datetime import date
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from tinder_bot import TinderBot
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """單一帳號的滑卡速率限制（固定最小間隔）"""
+
+    def __init__(self, swipes_per_minute: float):
+        """
+        初始化速率限制
+
+        Args:
+            swipes_per_minute: 每分鐘最多滑卡次數
+        """
+        self.interval = 60.0 / swipes_per_minute
+        self._next_allowed = 0.0
+
+    async def acquire(self):
+        """等待直到允許下一次滑卡"""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        wait = self._next_allowed - now
+        if wait > 0:
+            await asyncio.sleep(wait)
+            now = loop.time()
+        self._next_allowed = max(now, self._next_allowed) + self.interval
+
+
+class DailySwipeCap:
+    """每個帳號每日滑卡上限，可選擇以 JSON 檔保存當日已滑次數"""
+
+    def __init__(self, daily_limit: int, state_path: Optional[str] = None):
+        """
+        初始化每日上限
+
+        Args:
+            daily_limit: 每個帳號每日最多滑卡次數
+            state_path: 保存當日計數的 JSON 檔路徑
+        """
+        self.daily_limit = daily_limit
+        self.state_path = Path(state_path) if state_path else None
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+        if self.state_path and self.state_path.exists():
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                self._counts = json.load(f)
+
+    @classmethod
+    def from_config(cls, config_path: str, state_path: Optional[str] = None) -> 'DailySwipeCap':
+        """
+        由 A/B 測試設定檔的 schedule.daily_swipe_limit 建立
+
+        Args:
+            config_path: 設定檔路徑
+            state_path: 保存當日計數的 JSON 檔路徑
+
+        Returns:
+            DailySwipeCap 實例
+        """
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        return cls(config['schedule']['daily_swipe_limit'], state_path)
+
+    def used(self, account_id: int) -> int:
+        """今日已滑卡次數"""
+        return self._counts.get(date.today().isoformat(), {}).get(str(account_id), 0)
+
+    def remaining(self, account_id: int) -> int:
+        """今日剩餘可滑卡次數"""
+        return max(0, self.daily_limit - self.used(account_id))
+
+    def record(self, account_id: int, swipes: int):
+        """
+        記錄滑卡次數並保存
+
+        Args:
+            account_id: 社交帳號 ID
+            swipes: 新增的滑卡次數
+        """
+        today = date.today().isoformat()
+        # 只保留當日計數
+        counts = self._counts.get(today, {})
+        counts[str(account_id)] = counts.get(str(account_id), 0) + swipes
+        self._counts = {today: counts}
+
+        if self.state_path:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.state_path, 'w', encoding='utf-8') as f:
+                json.dump(self._counts, f)
+
+
+class BrowserPool:
+    """
+    共用瀏覽器池
+
+    所有帳號共用同一個 Chromium 程序，各自使用獨立的 browser context
+    （cookie 與 storage 互不影響），並以 semaphore 限制同時存在的 context 數量。
+    登入狀態保存於 session_dir/account_<id>.json。
+    """
+
+    def __init__(self, headless: bool = True, max_contexts: int = 4, session_dir: str = 'sessions'):
+        """
+        初始化瀏覽器池
+
+        Args:
+            headless: 是否使用無頭模式
+            max_contexts: 同時存在的 context 上限
+            session_dir: 登入狀態檔目錄
+        """
+        self.headless = headless
+        self.session_dir = Path(session_dir)
+        self._semaphore = asyncio.Semaphore(max_contexts)
+        self._playwright = None
+        self._browser = None
+
+    async def start(self):
+        """啟動共用的 Chromium 程序"""
+        from playwright.async_api import async_playwright
+
+        self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(
+            headless=self.headless,
+            args=['--no-sandbox', '--disable-setuid-sandbox']
+        )
+        logger.info("共用瀏覽器已啟動")
+
+    async def close(self):
+        """關閉瀏覽器"""
+        if self._browser:
+            await self._browser.close()
+        if self._playwright:
+            await self._playwright.stop()
+        logger.info("共用瀏覽器已關閉")
+
+    def session_path(self, account_id: int) -> Path:
+        """帳號的登入狀態檔路徑"""
+        return self.session_dir / f'account_{account_id}.json'
+
+    async def acquire(self, account_id: int):
+        """
+        為帳號建立獨立的 context，超過上限時等待
+
+        Args:
+            account_id: 社交帳號 ID
+
+        Returns:
+            BrowserContext
+        """
+        await self._semaphore.acquire()
+        try:
+            session_path = self.session_path(account_id)
+            return await self._browser.new_context(
+                viewport={'width': 1280, 'height': 720},
+                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+                storage_state=str(session_path) if session_path.exists() else None
+            )
+        except Exception:
+            self._semaphore.release()
+            raise
+
+    async def release(self, account_id: int, context):
+        """
+        保存登入狀態並關閉 context
+
+        Args:
+            account_id: 社交帳號 ID
+            context: acquire 取得的 BrowserContext
+        """
+        try:
+            self.session_dir.mkdir(parents=True, exist_ok=True)
+            await context.storage_state(path=str(self.session_path(account_id)))
+            await context.close()
+        except Exception as e:
+            logger.warning(f"帳號 {account_id} 關閉 context 失敗: {str(e)}")
+        finally:
+            self._semaphore.release()
+
+    @staticmethod
+    async def memory_mb(page) -> float:
+        """
+        量測頁面的 JS heap 使用量（透過 CDP Performance.getMetrics）
+
+        Args:
+            page: Playwright Page
+
+        Returns:
+            JSHeapUsedSize（MB），無法量測時為 0
+        """
+        try:
+            session = await page.context.new_cdp_session(page)
+            await session.send('Performance.enable')
+            metrics = await session.send('Performance.getMetrics')
+            await session.detach()
+        except Exception:
+            return 0.0
+
+        for metric in metrics.get('metrics', []):
+            if metric['name'] == 'JSHeapUsedSize':
+                return metric['value'] / (1024 * 1024)
+        return 0.0
+
+
+class MultiAccountScheduler:
+    """多帳號並行滑卡排程器"""
+
+    def __init__(
+        self,
+        pool: BrowserPool,
+        daily_cap: DailySwipeCap,
+        swipes_per_minute: float = 10,
+        strategy: str = 'random',
+        scorer=None,
+        record_sink_factory: Optional[Callable[[int], Callable]] = None,
+        max_context_memory_mb: float = 512,
+        memory_check_every: int = 25
+    ):
+        """
+        初始化排程器
+
+        Args:
+            pool: 共用瀏覽器池
+            daily_cap: 每日滑卡上限
+            swipes_per_minute: 每個帳號每分鐘最多滑卡次數
+            strategy: 滑卡策略
+            scorer: AIScorer 實例（'ai' 策略使用）
+            record_sink_factory: 依帳號 ID 產生批次寫入函式
+            max_context_memory_mb: 單一 context 的 JS heap 上限，超過時重建 context
+            memory_check_every: 每滑多少張卡量測一次記憶體
+        """
+        self.pool = pool
+        self.daily_cap = daily_cap
+        self.swipes_per_minute = swipes_per_minute
+        self.strategy = strategy
+        self.scorer = scorer
+        self.record_sink_factory = record_sink_factory
+        self.max_context_memory_mb = max_context_memory_mb
+        self.memory_check_every = memory_check_every
+
+    async def _open_bot(self, account_id: int, rate_limiter: RateLimiter):
+        """取得 context 並開啟已登入的 Tinder 頁面"""
+        context = await self.pool.acquire(account_id)
+        bot = TinderBot(headless=self.pool.headless, rate_limiter=rate_limiter)
+        try:
+            await bot.init_browser(context=context)
+            await bot.navigate_to_tinder()
+            if not await bot.wait_for_main_page():
+                raise RuntimeError(f"帳號 {account_id} 未登入，請先保存 {self.pool.session_path(account_id)}")
+        except Exception:
+            await self.pool.release(account_id, context)
+            raise
+        return bot, context
+
+    async def run_account(self, account_id: int, count: int) -> Dict:
+        """
+        執行單一帳號的滑卡
+
+        Args:
+            account_id: 社交帳號 ID
+            count: 要求的滑卡次數（會受每日上限限制）
+
+        Returns:
+            帳號執行結果
+        """
+        result = {
+            'account_id': account_id,
+            'requested': count,
+            'swipes': 0,
+            'matches': 0,
+            'peak_memory_mb': 0.0,
+            'context_restarts': 0,
+            'error': None
+        }
+        count = min(count, self.daily_cap.remaining(account_id))
+        if count == 0:
+            result['error'] = '已達每日滑卡上限'
+            return result
+
+        record_sink = self.record_sink_factory(account_id) if self.record_sink_factory else None
+        rate_limiter = RateLimiter(self.swipes_per_minute)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        bot = context = None
+
+        try:
+            bot, context = await self._open_bot(account_id, rate_limiter)
+
+            while result['swipes'] < count:
+                chunk = min(self.memory_check_every, count - result['swipes'])
+                records = await bot.auto_swipe_pipelined(
+                    count=chunk,
+                    strategy=self.strategy,
+                    scorer=self.scorer,
+                    record_sink=record_sink
+                )
+                result['swipes'] += len(records)
+                result['matches'] += sum(1 for r in records if r.get('is_match'))
+                self.daily_cap.record(account_id, len(records))
+                if not records:
+                    break
+
+                # 量測記憶體，超過上限時重建 context（登入狀態會保存並還原）
+                memory = await self.pool.memory_mb(bot.page)
+                result['peak_memory_mb'] = max(result['peak_memory_mb'], round(memory, 1))
+                if memory > self.max_context_memory_mb and result['swipes'] < count:
+                    logger.warning(f"帳號 {account_id} context 使用 {memory:.0f} MB，重建 context")
+                    await self.pool.release(account_id, context)
+                    bot = context = None
+                    bot, context = await self._open_bot(account_id, rate_limiter)
+                    result['context_restarts'] += 1
+
+        except Exception as e:
+            logger.error(f"帳號 {account_id} 執行失敗: {str(e)}")
+            result['error'] = str(e)
+
+        finally:
+            if context is not None:
+                await self.pool.release(account_id, context)
+
+        elapsed_minutes = (loop.time() - start) / 60
+        result['swipes_per_minute'] = round(result['swipes'] / elapsed_minutes, 2) if elapsed_minutes > 0 else 0.0
+        return result
+
+    async def run(self, account_ids: List[int], count: int) -> Dict:
+        """
+        同時執行多個帳號
+
+        Args:
+            account_ids: 社交帳號 ID 列表
+            count: 每個帳號要求的滑卡次數
+
+        Returns:
+            包含各帳號結果與整體每分鐘滑卡數的報告
+        """
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        results = await asyncio.gather(*(self.run_account(account_id, count) for account_id in account_ids))
+        elapsed_minutes = (loop.time() - start) / 60
+        total_swipes = sum(r['swipes'] for r in results)
+
+        return {
+            'accounts': list(results),
+            'total_swipes': total_swipes,
+            'total_matches': sum(r['matches'] for r in results),
+            'elapsed_minutes': round(elapsed_minutes, 2),
+            'swipes_per_minute': round(total_swipes / elapsed_minutes, 2) if elapsed_minutes > 0 else 0.0
+        }
@@ -0,0 +1,172 @@
+"""
+非同步資料庫客戶端
+在 asyncio 滑卡流程中寫入資料庫，不阻塞事件迴圈（SQLAlchemy asyncio + asyncpg）
+"""
+
+import functools
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from batch_writer import BatchWriter
+from database_client import (
+    SwipeRecord,
+    UnitOfWork,
+    _swipe_row,
+    default_database_url,
+    pool_options_from_env,
+)
+
+
+def default_async_database_url() -> str:
+    """由 DB_* 環境變數組成 asyncpg 連線字串"""
+    return default_database_url().replace('postgresql://', 'postgresql+asyncpg://', 1)
+
+
+def create_engine_from_env(database_url: Optional[str] = None) -> AsyncEngine:
+    """
+    建立非同步 engine，連線池設定同 DatabaseClient（DB_POOL_* 環境變數）
+
+    Args:
+        database_url: SQLAlchemy 非同步連線字串，未提供時使用 asyncpg 連線 DB_* 設定的資料庫
+
+    Returns:
+        AsyncEngine
+    """
+    url = database_url or default_async_database_url()
+    options = pool_options_from_env()
+    if url.startswith('sqlite'):
+        # SQLite（測試用）不使用 QueuePool 的大小設定
+        for name in ('pool_size', 'max_overflow', 'pool_timeout'):
+            options.pop(name)
+    return create_async_engine(url, echo=False, **options)
+
+
+class AsyncDatabaseClient:
+    """非同步資料庫客戶端類別，方法與 DatabaseClient 相同但皆為協程"""
+
+    def __init__(self, database_url: Optional[str] = None):
+        """
+        初始化資料庫連線
+
+        Args:
+            database_url: SQLAlchemy 非同步連線字串（如 postgresql+asyncpg://...、sqlite+aiosqlite:///...）
+        """
+        self.engine = create_engine_from_env(database_url)
+        self.SessionLocal = async_sessionmaker(bind=self.engine, expire_on_commit=False)
+
+    async def close(self):
+        """關閉連線池"""
+        await self.engine.dispose()
+
+    async def save_swipe_record(
+        self,
+        dating_account_id: int,
+        profile_data: Dict,
+        swipe_direction: str,
+        is_match: bool = False,
+        profile_id: Optional[int] = None,
+        ab_test_id: Optional[int] = None,
+        ai_score: Optional[float] = None,
+        decision_reason: Optional[str] = None
+    ) -> bool:
+        """
+        儲存滑卡記錄（參數同 DatabaseClient.save_swipe_record）
+
+        Returns:
+            是否成功儲存
+        """
+        try:
+            async with self.SessionLocal.begin() as session:
+                UnitOfWork(session).add_swipe_record(
+                    dating_account_id,
+                    profile_data,
+                    swipe_direction,
+                    is_match=is_match,
+                    profile_id=profile_id,
+                    ab_test_id=ab_test_id,
+                    ai_score=ai_score,
+                    decision_reason=decision_reason
+                )
+            return True
+
+        except Exception as e:
+            print(f"儲存滑卡記錄失敗: {str(e)}")
+            return False
+
+    async def save_automation_log(
+        self,
+        dating_account_id: int,
+        action_type: str,
+        status: str,
+        error_message: Optional[str] = None,
+        metadata: Optional[Dict] = None
+    ) -> bool:
+        """
+        儲存自動化日誌（參數同 DatabaseClient.save_automation_log）
+
+        Returns:
+            是否成功儲存
+        """
+        try:
+            async with self.SessionLocal.begin() as session:
+                UnitOfWork(session).add_automation_log(
+                    dating_account_id, action_type, status, error_message, metadata
+                )
+            return True
+
+        except Exception as e:
+            print(f"儲存自動化日誌失敗: {str(e)}")
+            return False
+
+    async def batch_save_swipe_records(self, records: List[Dict], dating_account_id: int) -> int:
+        """
+        批次儲存滑卡記錄（單一交易，Core insert）
+
+        Args:
+            records: 滑卡記錄列表
+            dating_account_id: 社交帳號 ID
+
+        Returns:
+            成功儲存的記錄數
+        """
+        if not records:
+            return 0
+
+        now = datetime.now()
+        rows = [_swipe_row(record_data, dating_account_id, now) for record_data in records]
+
+        try:
+            async with self.engine.begin() as connection:
+                await connection.execute(insert(SwipeRecord.__table__), rows)
+            return len(rows)
+
+        except Exception as e:
+            print(f"批次儲存失敗: {str(e)}")
+            return 0
+
+    def batch_writer(
+        self,
+        dating_account_id: int,
+        flush_size: int = 50,
+        flush_interval: float = 5.0
+    ) -> BatchWriter:
+        """
+        建立背景批次寫入器
+
+        Args:
+            dating_account_id: 社交帳號 ID
+            flush_size: 累積多少筆記錄後寫入
+            flush_interval: 距上次寫入超過多少秒即寫入
+
+        Returns:
+            BatchWriter（以 async with 使用）
+        """
+        return BatchWriter(
+            functools.partial(self.batch_save_swipe_records, dating_account_id=dating_account_id),
+            flush_size,
+            flush_interval
+        )
+
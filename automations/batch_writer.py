@@ -0,0 +1,112 @@
+"""
+背景批次寫入器
+記錄經由 asyncio 佇列交給背景工作，依筆數或時間門檻分批寫入，不阻塞呼叫端
+"""
+
+import asyncio
+import inspect
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class BatchWriter:
+    """
+    背景批次寫入器
+
+    submit() 只把記錄放入佇列，不等待寫入；背景工作依筆數或時間門檻呼叫 sink，
+    close()（或離開 async with 區塊）時寫出剩餘記錄。sink 可為同步函式（在工作執行緒中執行，
+    避免阻塞事件迴圈）或協程函式，回傳成功寫入的筆數；寫入失敗只記錄錯誤，不中斷背景工作。
+
+    範例:
+        async with BatchWriter(functools.partial(client.batch_save_swipe_records, dating_account_id=1)) as writer:
+            writer.submit(record)
+    """
+
+    def __init__(
+        self,
+        sink: Optional[Callable[[List[Dict]], Any]],
+        flush_size: int = 50,
+        flush_interval: float = 5.0
+    ):
+        """
+        Args:
+            sink: 批次寫入函式，接收記錄列表；為 None 時只清空佇列
+            flush_size: 累積多少筆記錄後寫入
+            flush_interval: 距上次寫入超過多少秒即寫入
+        """
+        self.sink = sink
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.saved = 0
+        self.failed = 0
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> 'BatchWriter':
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def start(self):
+        """啟動背景寫入工作"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def submit(self, record: Dict):
+        """加入一筆待寫入記錄（不阻塞）"""
+        self._queue.put_nowait(record)
+
+    async def close(self):
+        """寫出剩餘記錄並停止背景工作"""
+        if self._task is None:
+            return
+        self._queue.put_nowait(None)
+        await self._task
+        self._task = None
+
+    async def _run(self):
+        """依筆數或時間門檻分批寫入，收到 None 時寫出剩餘記錄後結束"""
+        loop = asyncio.get_running_loop()
+        pending: List[Dict] = []
+        deadline = loop.time() + self.flush_interval
+        done = False
+
+        while not done:
+            try:
+                record = await asyncio.wait_for(self._queue.get(), timeout=max(0.0, deadline - loop.time()))
+                if record is None:
+                    done = True
+                else:
+                    pending.append(record)
+            except asyncio.TimeoutError:
+                pass
+
+            if pending and (done or len(pending) >= self.flush_size or loop.time() >= deadline):
+                batch, pending = pending, []
+                await self._flush(batch)
+
+            if loop.time() >= deadline:
+                deadline = loop.time() + self.flush_interval
+
+    async def _flush(self, batch: List[Dict]):
+        """寫出一批記錄並累計成功與失敗筆數"""
+        if self.sink is None:
+            return
+
+        try:
+            if inspect.iscoroutinefunction(self.sink):
+                saved = await self.sink(batch)
+            else:
+                saved = await asyncio.to_thread(self.sink, batch)
+            saved = len(batch) if saved is None else saved
+            logger.info(f"已寫入 {saved} 筆滑卡記錄")
+        except Exception as e:
+            logger.error(f"寫入滑卡記錄失敗: {str(e)}")
+            saved = 0
+
+        self.saved += saved
+        self.failed += len(batch) - saved
@@ -3,26 +3,40 @@
 用於 Python 自動化腳本與 PostgreSQL 資料庫互動
 """
 
+import io
+import json
 import os
-from datetime import datetime
-from typing import Dict, List, Optional
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Sequence, Tuple
 
-from sqlalchemy import create_engine, Column, Integer, String, Boolean, DateTime, Text, DECIMAL, BigInteger, JSON
+from sqlalchemy import create_engine, delete, func, insert, select, Column, Integer, String, Boolean, Date, DateTime, Text, DECIMAL, BigInteger, JSON, UniqueConstraint
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import QueuePool
 from dotenv import load_dotenv
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 # 載入環境變數
 load_dotenv()
 
 Base = declarative_base()
 
+# SQLite 只有 INTEGER PRIMARY KEY 會自動遞增（測試與基準測試使用 SQLite）
+_ID_TYPE = BigInteger().with_variant(Integer, 'sqlite')
+
 
 class SwipeRecord(Base):
     """滑卡記錄 ORM 模型"""
     __tablename__ = 'swipe_records'
 
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    id = Column(_ID_TYPE, primary_key=True, autoincrement=True)
     dating_account_id = Column(BigInteger, nullable=False)
     profile_id = Column(BigInteger)
     ab_test_id = Column(BigInteger)
@@ -43,7 +57,7 @@ class AutomationLog(Base):
     """自動化日誌 ORM 模型"""
     __tablename__ = 'automation_logs'
 
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    id = Column(_ID_TYPE, primary_key=True, autoincrement=True)
     dating_account_id = Column(BigInteger, nullable=False)
     action_type = Column(String(50), nullable=False)
     status = Column(String(20), nullable=False)
@@ -52,25 +66,320 @@ class AutomationLog(Base):
     executed_at = Column(DateTime, default=datetime.utcnow)
 
 
+class AnalyticsSnapshot(Base):
+    """每日分析快照 ORM 模型（對應 analytics_snapshots 表）"""
+    __tablename__ = 'analytics_snapshots'
+    __table_args__ = (UniqueConstraint('dating_account_id', 'profile_id', 'snapshot_date'),)
+
+    id = Column(_ID_TYPE, primary_key=True, autoincrement=True)
+    dating_account_id = Column(BigInteger, nullable=False)
+    profile_id = Column(BigInteger)
+    ab_test_id = Column(BigInteger)
+    snapshot_date = Column(Date, nullable=False)
+    total_swipes = Column(Integer, default=0)
+    right_swipes = Column(Integer, default=0)
+    left_swipes = Column(Integer, default=0)
+    matches_count = Column(Integer, default=0)
+    match_rate = Column(DECIMAL(5, 2))
+    message_response_rate = Column(DECIMAL(5, 2))
+    avg_ai_score = Column(DECIMAL(5, 2))
+    # metadata 為 Declarative 保留名稱，屬性改名但欄位名稱不變
+    metadata_ = Column('metadata', JSON)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+def _swipe_row(record_data: Dict, dating_account_id: int, now: datetime) -> Dict:
+    """
+    將滑卡記錄轉為 swipe_records 的欄位值
+
+    Args:
+        record_data: 滑卡記錄（auto_swipe 的輸出格式）
+        dating_account_id: 社交帳號 ID
+        now: 缺少時間戳記時使用的時間
+
+    Returns:
+        欄位名稱對應值的字典
+    """
+    timestamp = record_data.get('timestamp')
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp)
+
+    return {
+        'dating_account_id': dating_account_id,
+        'profile_id': record_data.get('profile_id'),
+        'ab_test_id': record_data.get('ab_test_id'),
+        'target_name': record_data.get('name', ''),
+        'target_age': record_data.get('age', 0),
+        'target_bio': record_data.get('bio', ''),
+        'target_photos': record_data.get('photos', []),
+        'target_distance': record_data.get('distance', 0),
+        'swipe_direction': record_data.get('swipe_direction', 'left'),
+        'is_match': record_data.get('is_match', False),
+        'ai_score': record_data.get('ai_score'),
+        'decision_reason': record_data.get('decision_reason'),
+        'swiped_at': timestamp or now
+    }
+
+
+def _copy_text(value) -> str:
+    """將欄位值轉為 COPY text 格式"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, (list, dict)):
+        value = json.dumps(value, ensure_ascii=False)
+    elif isinstance(value, datetime):
+        value = value.isoformat()
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+class PoolMetrics:
+    """連線池取得連線（checkout）的耗時與等待次數"""
+
+    def __init__(self, max_samples: int = 1000):
+        """
+        初始化指標
+
+        Args:
+            max_samples: 保留最近幾次 checkout 的耗時
+        """
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0
+        self._checkout_ms = deque(maxlen=max_samples)
+
+    def record(self, elapsed_ms: float, waited: bool):
+        """記錄一次 checkout"""
+        with self._lock:
+            self.checkouts += 1
+            self.waits += int(waited)
+            self._checkout_ms.append(elapsed_ms)
+
+    def stats(self) -> Dict:
+        """
+        取得統計
+
+        Returns:
+            checkout 次數、等待次數與耗時百分位數（毫秒）
+        """
+        with self._lock:
+            samples = sorted(self._checkout_ms)
+            checkouts, waits = self.checkouts, self.waits
+
+        def percentile(p: float) -> float:
+            return round(samples[min(len(samples) - 1, int(len(samples) * p))], 3) if samples else 0.0
+
+        return {
+            'checkouts': checkouts,
+            'waits': waits,
+            'p50_ms': percentile(0.5),
+            'p99_ms': percentile(0.99),
+            'max_ms': round(samples[-1], 3) if samples else 0.0
+        }
+
+
+class _TimedQueuePool(QueuePool):
+    """記錄每次 checkout 耗時的 QueuePool"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        # 連線（含 overflow）全部借出時，必須等待其他連線歸還
+        waited = self._max_overflow > -1 and self.checkedout() >= self.size() + self._max_overflow
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.metrics.record((time.perf_counter() - start) * 1000, waited)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+# 每個程序共用的 engine，以 (pid, 連線字串) 為鍵，fork 後的子程序會建立自己的 engine
+_engines: Dict[Tuple[int, str], Engine] = {}
+_engines_lock = threading.Lock()
+
+
+def default_database_url() -> str:
+    """由 DB_* 環境變數組成 PostgreSQL 連線字串"""
+    db_host = os.getenv('DB_HOST', 'localhost')
+    db_port = os.getenv('DB_PORT', '5432')
+    db_user = os.getenv('DB_USER', 'postgres')
+    db_password = os.getenv('DB_PASSWORD', '')
+    db_name = os.getenv('DB_NAME', 'smart_dating_optimizer')
+
+    return f"postgresql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
+
+
+def pool_options_from_env() -> Dict:
+    """
+    由 DB_POOL_* 環境變數讀取連線池設定
+
+    Returns:
+        create_engine 的連線池參數
+    """
+    return {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', '5')),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', '10')),
+        'pool_timeout': float(os.getenv('DB_POOL_TIMEOUT', '30')),
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', '1800')),
+        'pool_pre_ping': os.getenv('DB_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes')
+    }
+
+
+def get_engine(database_url: Optional[str] = None) -> Engine:
+    """
+    取得目前程序共用的 engine，同一連線字串只建立一次
+
+    Args:
+        database_url: SQLAlchemy 連線字串，未提供時由 DB_* 環境變數組成
+
+    Returns:
+        Engine
+    """
+    url = database_url or default_database_url()
+    key = (os.getpid(), url)
+
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            options = pool_options_from_env()
+            if url in ('sqlite://', 'sqlite:///:memory:'):
+                # 記憶體內 SQLite 每個連線各自是一個資料庫，沿用 SQLAlchemy 預設的連線池
+                for name in ('pool_size', 'max_overflow', 'pool_timeout'):
+                    options.pop(name)
+            else:
+                options['poolclass'] = _TimedQueuePool
+            engine = create_engine(url, echo=False, **options)
+            _engines[key] = engine
+
+    return engine
+
+
+def dispose_engines():
+    """關閉並清除共用的 engine（測試結束或 fork 後使用）"""
+    with _engines_lock:
+        for (pid, _), engine in _engines.items():
+            # 不關閉父程序建立的連線，避免影響父程序
+            engine.dispose(close=pid == os.getpid())
+        _engines.clear()
+
+
+class UnitOfWork:
+    """單一交易內的寫入操作，由 DatabaseClient.unit_of_work() 建立"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def add_swipe_record(
+        self,
+        dating_account_id: int,
+        profile_data: Dict,
+        swipe_direction: str,
+        is_match: bool = False,
+        profile_id: Optional[int] = None,
+        ab_test_id: Optional[int] = None,
+        ai_score: Optional[float] = None,
+        decision_reason: Optional[str] = None
+    ) -> SwipeRecord:
+        """
+        加入滑卡記錄（參數同 DatabaseClient.save_swipe_record）
+
+        Returns:
+            尚未提交的 SwipeRecord
+        """
+        row = _swipe_row(profile_data, dating_account_id, datetime.now())
+        row.update(
+            profile_id=profile_id,
+            ab_test_id=ab_test_id,
+            swipe_direction=swipe_direction,
+            is_match=is_match,
+            ai_score=ai_score,
+            decision_reason=decision_reason
+        )
+        record = SwipeRecord(**row)
+        self.session.add(record)
+        return record
+
+    def add_automation_log(
+        self,
+        dating_account_id: int,
+        action_type: str,
+        status: str,
+        error_message: Optional[str] = None,
+        metadata: Optional[Dict] = None
+    ) -> AutomationLog:
+        """
+        加入自動化日誌（參數同 DatabaseClient.save_automation_log）
+
+        Returns:
+            尚未提交的 AutomationLog
+        """
+        log = AutomationLog(
+            dating_account_id=dating_account_id,
+            action_type=action_type,
+            status=status,
+            error_message=error_message,
+            metadata=metadata or {}
+        )
+        self.session.add(log)
+        return log
+
+
 class DatabaseClient:
     """資料庫客戶端類別"""
 
-    def __init__(self):
-        """初始化資料庫連線"""
-        db_host = os.getenv('DB_HOST', 'localhost')
-        db_port = os.getenv('DB_PORT', '5432')
-        db_user = os.getenv('DB_USER', 'postgres')
-        db_password = os.getenv('DB_PASSWORD', '')
-        db_name = os.getenv('DB_NAME', 'smart_dating_optimizer')
+    def __init__(self, database_url: Optional[str] = None):
+        """
+        初始化資料庫連線
 
-        connection_string = f"postgresql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
-        self.engine = create_engine(connection_string, echo=False)
+        Args:
+            database_url: SQLAlchemy 連線字串，未提供時由 DB_* 環境變數組成
+        """
+        self.engine = get_engine(database_url)
         self.SessionLocal = sessionmaker(bind=self.engine)
 
     def get_session(self) -> Session:
         """取得資料庫 session"""
         return self.SessionLocal()
 
+    @contextmanager
+    def unit_of_work(self) -> Iterator[UnitOfWork]:
+        """
+        在單一交易內執行多筆寫入，離開區塊時提交，發生例外時回滾
+
+        範例:
+            with db_client.unit_of_work() as uow:
+                uow.add_swipe_record(account_id, profile, 'right')
+                uow.add_automation_log(account_id, 'swipe', 'success')
+        """
+        session = self.get_session()
+        try:
+            yield UnitOfWork(session)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def pool_stats(self) -> Dict:
+        """
+        取得連線池指標
+
+        Returns:
+            checkout 次數、等待次數、耗時百分位數與連線池狀態
+        """
+        metrics = getattr(self.engine.pool, 'metrics', None)
+        stats = metrics.stats() if metrics else {}
+        stats['status'] = self.engine.pool.status()
+        return stats
+
     def save_swipe_record(
         self,
         dating_account_id: int,
@@ -98,36 +407,23 @@ class DatabaseClient:
         Returns:
             是否成功儲存
         """
-        session = self.get_session()
-        
         try:
-            record = SwipeRecord(
-                dating_account_id=dating_account_id,
-                profile_id=profile_id,
-                ab_test_id=ab_test_id,
-                target_name=profile_data.get('name', ''),
-                target_age=profile_data.get('age', 0),
-                target_bio=profile_data.get('bio', ''),
-                target_photos=profile_data.get('photos', []),
-                target_distance=profile_data.get('distance', 0),
-                swipe_direction=swipe_direction,
-                is_match=is_match,
-                ai_score=ai_score,
-                decision_reason=decision_reason,
-                swiped_at=datetime.fromisoformat(profile_data.get('timestamp', datetime.now().isoformat()))
-            )
-            
-            session.add(record)
-            session.commit()
+            with self.unit_of_work() as uow:
+                uow.add_swipe_record(
+                    dating_account_id,
+                    profile_data,
+                    swipe_direction,
+                    is_match=is_match,
+                    profile_id=profile_id,
+                    ab_test_id=ab_test_id,
+                    ai_score=ai_score,
+                    decision_reason=decision_reason
+                )
             return True
             
         except Exception as e:
-            session.rollback()
             print(f"儲存滑卡記錄失敗: {str(e)}")
             return False
-            
-        finally:
-            session.close()
 
     def save_automation_log(
         self,
@@ -150,28 +446,185 @@ class DatabaseClient:
         Returns:
             是否成功儲存
         """
-        session = self.get_session()
-        
         try:
-            log = AutomationLog(
-                dating_account_id=dating_account_id,
-                action_type=action_type,
-                status=status,
-                error_message=error_message,
-                metadata=metadata or {}
-            )
-            
-            session.add(log)
-            session.commit()
+            with self.unit_of_work() as uow:
+                uow.add_automation_log(dating_account_id, action_type, status, error_message, metadata)
             return True
             
         except Exception as e:
-            session.rollback()
             print(f"儲存自動化日誌失敗: {str(e)}")
             return False
-            
-        finally:
-            session.close()
+
+    def stream_swipe_records(
+        self,
+        dating_account_id: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        columns: Optional[Sequence[str]] = None,
+        directions: Optional[Sequence[str]] = None,
+        batch_size: int = 10000,
+        after_id: Optional[int] = None,
+        created_since: Optional[datetime] = None
+    ) -> Iterator[List[Dict]]:
+        """
+        以伺服器端游標分批讀取滑卡記錄，記憶體只保留一批
+
+        Args:
+            dating_account_id: 社交帳號 ID，未提供時讀取所有帳號
+            start: 起始時間（含）
+            end: 結束時間（不含）
+            columns: 只讀取的欄位（swipe_records 欄位名稱），未提供時讀取全部
+            directions: 只讀取的滑卡方向
+            batch_size: 每批筆數
+            after_id: 只讀取 ID 大於此值的記錄（增量讀取）
+            created_since: 只讀取 created_at 不早於此時間的記錄（增量讀取）
+
+        Yields:
+            每批滑卡記錄（欄位名稱對應值的字典）
+        """
+        statement = self._swipe_query(dating_account_id, start, end, columns, directions, after_id, created_since)
+        for keys, rows in self._stream(statement, batch_size):
+            yield [dict(zip(keys, row)) for row in rows]
+
+    def stream_swipe_frames(
+        self,
+        dating_account_id: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        columns: Optional[Sequence[str]] = None,
+        directions: Optional[Sequence[str]] = None,
+        batch_size: int = 10000,
+        after_id: Optional[int] = None,
+        created_since: Optional[datetime] = None
+    ) -> Iterator['pd.DataFrame']:
+        """
+        同 stream_swipe_records，但每批直接轉為 DataFrame，不建立每列的字典
+
+        Yields:
+            每批滑卡記錄的 DataFrame
+        """
+        import pandas as pd
+
+        statement = self._swipe_query(dating_account_id, start, end, columns, directions, after_id, created_since)
+        for keys, rows in self._stream(statement, batch_size):
+            yield pd.DataFrame.from_records(rows, columns=keys)
+
+    @staticmethod
+    def _swipe_query(dating_account_id, start, end, columns, directions, after_id=None, created_since=None):
+        """組成讀取滑卡記錄的查詢"""
+        table = SwipeRecord.__table__
+        statement = select(*(table.c[name] for name in columns)) if columns else select(table)
+
+        if dating_account_id is not None:
+            statement = statement.where(table.c.dating_account_id == dating_account_id)
+        if start is not None:
+            statement = statement.where(table.c.swiped_at >= start)
+        if end is not None:
+            statement = statement.where(table.c.swiped_at < end)
+        if directions:
+            statement = statement.where(table.c.swipe_direction.in_(directions))
+        if after_id is not None:
+            statement = statement.where(table.c.id > after_id)
+        if created_since is not None:
+            statement = statement.where(table.c.created_at >= created_since)
+
+        return statement.order_by(table.c.swiped_at, table.c.id)
+
+    def _stream(self, statement, batch_size: int) -> Iterator[Tuple[List[str], List]]:
+        """執行查詢並逐批回傳 (欄位名稱, 列)；PostgreSQL 使用具名（伺服器端）游標"""
+        with self.engine.connect() as connection:
+            result = connection.execution_options(stream_results=True, yield_per=batch_size).execute(statement)
+            keys = list(result.keys())
+            for rows in result.partitions():
+                yield keys, rows
+
+    def swipe_account_ids(self) -> List[int]:
+        """
+        取得有滑卡記錄的社交帳號 ID
+
+        Returns:
+            社交帳號 ID 列表（遞增排序）
+        """
+        table = SwipeRecord.__table__
+        statement = select(table.c.dating_account_id).distinct().order_by(table.c.dating_account_id)
+        with self.engine.connect() as connection:
+            return list(connection.scalars(statement))
+
+    def last_snapshot_date(self, dating_account_id: int) -> Optional[date]:
+        """
+        取得帳號最後一筆每日快照的日期
+
+        Args:
+            dating_account_id: 社交帳號 ID
+
+        Returns:
+            快照日期，尚無快照時為 None
+        """
+        table = AnalyticsSnapshot.__table__
+        statement = select(func.max(table.c.snapshot_date)).where(
+            table.c.dating_account_id == dating_account_id,
+            table.c.profile_id.is_(None)
+        )
+        with self.engine.connect() as connection:
+            return connection.scalar(statement)
+
+    def get_analytics_snapshots(
+        self,
+        dating_account_id: Optional[int] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None
+    ) -> List[Dict]:
+        """
+        讀取帳號層級（不分個人檔案）的每日快照
+
+        Args:
+            dating_account_id: 社交帳號 ID，未提供時讀取所有帳號
+            start: 起始日期（含）
+            end: 結束日期（不含）
+
+        Returns:
+            快照列表（欄位名稱對應值的字典，metadata 欄位名稱為 metadata），依帳號與日期排序
+        """
+        table = AnalyticsSnapshot.__table__
+        statement = select(table).where(table.c.profile_id.is_(None))
+        if dating_account_id is not None:
+            statement = statement.where(table.c.dating_account_id == dating_account_id)
+        if start is not None:
+            statement = statement.where(table.c.snapshot_date >= start)
+        if end is not None:
+            statement = statement.where(table.c.snapshot_date < end)
+        statement = statement.order_by(table.c.dating_account_id, table.c.snapshot_date)
+
+        with self.engine.connect() as connection:
+            return [dict(row) for row in connection.execute(statement).mappings()]
+
+    def save_analytics_snapshots(self, snapshots: List[Dict]) -> int:
+        """
+        寫入帳號層級的每日快照（單一交易），同帳號同日期的既有快照會被取代
+
+        Args:
+            snapshots: 快照列表（analytics_snapshots 欄位名稱，profile_id 為空）
+
+        Returns:
+            寫入筆數
+        """
+        if not snapshots:
+            return 0
+
+        table = AnalyticsSnapshot.__table__
+        # profile_id 為 NULL 時 UNIQUE 限制不會衝突，先刪除再寫入以維持每帳號每日一筆
+        with self.engine.begin() as connection:
+            for snapshot in snapshots:
+                connection.execute(delete(table).where(
+                    table.c.dating_account_id == snapshot['dating_account_id'],
+                    table.c.profile_id.is_(None),
+                    table.c.snapshot_date == snapshot['snapshot_date']
+                ))
+            connection.execute(insert(table), [
+                {**snapshot, 'created_at': snapshot.get('created_at') or datetime.now()}
+                for snapshot in snapshots
+            ])
+        return len(snapshots)
 
     def batch_save_swipe_records(self, records: List[Dict], dating_account_id: int) -> int:
         """
@@ -188,18 +641,9 @@ class DatabaseClient:
         success_count = 0
         
         try:
+            now = datetime.now()
             for record_data in records:
-                record = SwipeRecord(
-                    dating_account_id=dating_account_id,
-                    target_name=record_data.get('name', ''),
-                    target_age=record_data.get('age', 0),
-                    target_bio=record_data.get('bio', ''),
-                    target_photos=record_data.get('photos', []),
-                    target_distance=record_data.get('distance', 0),
-                    swipe_direction=record_data.get('swipe_direction', 'left'),
-                    is_match=record_data.get('is_match', False),
-                    swiped_at=datetime.fromisoformat(record_data.get('timestamp', datetime.now().isoformat()))
-                )
+                record = SwipeRecord(**_swipe_row(record_data, dating_account_id, now))
                 session.add(record)
                 success_count += 1
                 
@@ -214,6 +658,95 @@ class DatabaseClient:
             
         return success_count
 
+    def bulk_insert_swipe_records(
+        self,
+        records: List[Dict],
+        dating_account_id: int,
+        chunk_size: int = 1000,
+        atomic: bool = True,
+        method: str = 'auto'
+    ) -> List[int]:
+        """
+        大量寫入滑卡記錄（匯入與重播用）
+
+        不建立 ORM 物件，依 chunk_size 分批以 Core insert（多列 VALUES）或
+        PostgreSQL COPY FROM STDIN 寫入。
+
+        Args:
+            records: 滑卡記錄列表
+            dating_account_id: 社交帳號 ID
+            chunk_size: 每批寫入筆數
+            atomic: True 時全部成功或全部回滾；False 時每批各自提交，
+                失敗時保留已提交的批次
+            method: 'insert'、'copy'（僅 PostgreSQL + psycopg2）或 'auto'
+
+        Returns:
+            已寫入記錄的 ID 列表（與 records 順序相同）
+        """
+        if method == 'auto':
+            method = 'copy' if self.engine.dialect.driver == 'psycopg2' else 'insert'
+        if method not in ('insert', 'copy'):
+            raise ValueError(f"未知的寫入方式: {method}")
+
+        now = datetime.now()
+        rows = [_swipe_row(record_data, dating_account_id, now) for record_data in records]
+        chunks = [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+        write_chunk = self._copy_chunk if method == 'copy' else self._insert_chunk
+
+        inserted_ids: List[int] = []
+        connection = self.engine.raw_connection() if method == 'copy' else self.engine.connect()
+
+        try:
+            for chunk in chunks:
+                chunk_ids = write_chunk(connection, chunk)
+                if not atomic:
+                    connection.commit()
+                inserted_ids.extend(chunk_ids)
+            connection.commit()
+
+        except Exception as e:
+            connection.rollback()
+            print(f"大量寫入失敗: {str(e)}")
+            if atomic:
+                inserted_ids = []
+
+        finally:
+            connection.close()
+
+        return inserted_ids
+
+    @staticmethod
+    def _insert_chunk(connection, rows: List[Dict]) -> List[int]:
+        """以 Core insert 寫入一批記錄並回傳 ID"""
+        table = SwipeRecord.__table__
+        statement = insert(table).returning(table.c.id, sort_by_parameter_order=True)
+        return list(connection.execute(statement, rows).scalars())
+
+    @staticmethod
+    def _copy_chunk(connection, rows: List[Dict]) -> List[int]:
+        """以 COPY FROM STDIN 寫入一批記錄；ID 先由序列預留以便回傳"""
+        # created_at 使用資料庫預設值
+        columns = [column.name for column in SwipeRecord.__table__.columns if column.name != 'created_at']
+        cursor = connection.cursor()
+        try:
+            cursor.execute(
+                "SELECT nextval(pg_get_serial_sequence('swipe_records', 'id')) "
+                "FROM generate_series(1, %s)",
+                (len(rows),)
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+
+            buffer = io.StringIO()
+            for row_id, row in zip(ids, rows):
+                values = [row_id] + [row[column] for column in columns[1:]]
+                buffer.write('\t'.join(_copy_text(value) for value in values) + '\n')
+            buffer.seek(0)
+
+            cursor.copy_expert(f"COPY swipe_records ({', '.join(columns)}) FROM STDIN", buffer)
+            return ids
+        finally:
+            cursor.close()
+
 
 # 使用範例
 if __name__ == '__main__':
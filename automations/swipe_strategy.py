@@ -0,0 +1,53 @@
+"""
+滑卡策略與記錄格式
+決定滑卡方向並組合滑卡記錄；不依賴瀏覽器，TinderBot 與離線模擬器共用
+"""
+
+import random
+from typing import Dict, Optional
+
+
+def choose_direction(strategy: str, score_result: Optional[Dict] = None, rng: Optional[random.Random] = None) -> str:
+    """
+    依策略決定滑卡方向
+
+    Args:
+        strategy: 策略 ('random', 'all_right', 'all_left', 'ai')
+        score_result: 'ai' 策略使用的評分結果
+        rng: 'random' 策略使用的亂數產生器，未提供時使用 random 模組
+
+    Returns:
+        滑卡方向
+    """
+    if strategy == 'all_right':
+        return 'right'
+    if strategy == 'all_left':
+        return 'left'
+    if strategy == 'ai':
+        return score_result['recommendation']
+    # random
+    return 'right' if (rng or random).random() > 0.5 else 'left'
+
+
+def build_record(profile_data: Dict, direction: str, is_match: bool, score_result: Optional[Dict]) -> Dict:
+    """
+    組合滑卡記錄
+
+    Args:
+        profile_data: 個人檔案資料
+        direction: 滑卡方向
+        is_match: 是否配對成功
+        score_result: 評分結果，提供時記錄分數與決策原因
+
+    Returns:
+        滑卡記錄字典
+    """
+    record = {
+        **profile_data,
+        'swipe_direction': direction,
+        'is_match': is_match
+    }
+    if score_result is not None:
+        record['ai_score'] = score_result['score']
+        record['decision_reason'] = score_result['reason']
+    return record
@@ -0,0 +1,141 @@
+"""
+測試多帳號排程器（不啟動瀏覽器）
+"""
+
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from account_scheduler import DailySwipeCap, MultiAccountScheduler, RateLimiter
+
+
+class FakePool:
+    """以計數取代真實 browser context 的瀏覽器池"""
+
+    def __init__(self, max_contexts=1, memory_mb=100.0):
+        self.headless = True
+        self.max_contexts = max_contexts
+        self.memory = memory_mb
+        self.active = 0
+        self.peak_active = 0
+        self.released = []
+
+    def session_path(self, account_id):
+        return f'sessions/account_{account_id}.json'
+
+    async def acquire(self, account_id):
+        while self.active >= self.max_contexts:
+            await asyncio.sleep(0)
+        self.active += 1
+        self.peak_active = max(self.peak_active, self.active)
+        return object()
+
+    async def release(self, account_id, context):
+        self.active -= 1
+        self.released.append(account_id)
+
+    async def memory_mb(self, page):
+        return self.memory
+
+
+class FakeBot:
+    """回傳固定滑卡記錄的機器人"""
+
+    def __init__(self, headless=False, rate_limiter=None):
+        self.page = None
+
+    async def init_browser(self, context=None):
+        pass
+
+    async def navigate_to_tinder(self):
+        pass
+
+    async def wait_for_main_page(self):
+        return True
+
+    async def auto_swipe_pipelined(self, count, strategy, scorer=None, record_sink=None):
+        await asyncio.sleep(0)
+        records = [{'swipe_direction': 'right', 'is_match': i == 0} for i in range(count)]
+        if record_sink:
+            record_sink(records)
+        return records
+
+
+class TestRateLimiter(unittest.IsolatedAsyncioTestCase):
+    """速率限制測試類別"""
+
+    async def test_spaces_calls(self):
+        """測試連續呼叫會依間隔等待"""
+        limiter = RateLimiter(swipes_per_minute=60 * 50)  # 每 20 ms 一次
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for _ in range(4):
+            await limiter.acquire()
+        self.assertGreaterEqual(loop.time() - start, 0.055)
+
+
+class TestDailySwipeCap(unittest.TestCase):
+    """每日上限測試類別"""
+
+    def test_remaining_persists(self):
+        """測試已滑次數會保存並在重新載入後扣除"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'daily.json')
+            cap = DailySwipeCap(10, state_path=path)
+            cap.record(1, 4)
+
+            reloaded = DailySwipeCap(10, state_path=path)
+            self.assertEqual(reloaded.remaining(1), 6)
+            self.assertEqual(reloaded.remaining(2), 10)
+
+
+class TestMultiAccountScheduler(unittest.IsolatedAsyncioTestCase):
+    """多帳號排程測試類別"""
+
+    def setUp(self):
+        patcher = mock.patch('account_scheduler.TinderBot', FakeBot)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_runs_accounts_within_caps(self):
+        """測試各帳號受每日上限限制、context 數不超過上限且結果各自寫入"""
+        pool = FakePool(max_contexts=2)
+        cap = DailySwipeCap(7)
+        cap.record(3, 7)
+        sunk = {}
+        scheduler = MultiAccountScheduler(
+            pool, cap, swipes_per_minute=60000,
+            record_sink_factory=lambda account_id: lambda batch: sunk.setdefault(account_id, []).extend(batch),
+            memory_check_every=3
+        )
+
+        report = await scheduler.run([1, 2, 3], count=10)
+
+        swipes = {r['account_id']: r['swipes'] for r in report['accounts']}
+        self.assertEqual(swipes, {1: 7, 2: 7, 3: 0})
+        self.assertEqual(report['total_swipes'], 14)
+        self.assertEqual(len(sunk[1]), 7)
+        self.assertLessEqual(pool.peak_active, 2)
+        self.assertEqual(pool.active, 0)
+        self.assertEqual(cap.remaining(1), 0)
+
+    async def test_recycles_context_over_memory_limit(self):
+        """測試記憶體超過上限時重建 context"""
+        pool = FakePool(memory_mb=900.0)
+        scheduler = MultiAccountScheduler(
+            pool, DailySwipeCap(100), swipes_per_minute=60000,
+            max_context_memory_mb=512, memory_check_every=5
+        )
+
+        result = await scheduler.run_account(1, count=15)
+
+        self.assertEqual(result['swipes'], 15)
+        self.assertEqual(result['context_restarts'], 2)
+        self.assertEqual(result['peak_memory_mb'], 900.0)
+        self.assertEqual(pool.active, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+測試非同步資料庫客戶端（以 aiosqlite 取代 PostgreSQL）
+"""
+
+import asyncio
+import os
+import tempfile
+import unittest
+
+from sqlalchemy import func, select
+
+from async_database_client import AsyncDatabaseClient
+from batch_writer import BatchWriter
+from database_client import AutomationLog, Base, SwipeRecord
+
+
+class TestAsyncDatabaseClient(unittest.IsolatedAsyncioTestCase):
+    """非同步資料庫客戶端測試類別"""
+
+    async def asyncSetUp(self):
+        """測試前設置：建立暫存 SQLite 資料庫"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.client = AsyncDatabaseClient(f"sqlite+aiosqlite:///{os.path.join(self.tmp.name, 'test.db')}")
+        async with self.client.engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        self.tmp.cleanup()
+
+    async def count(self, model):
+        async with self.client.SessionLocal() as session:
+            return await session.scalar(select(func.count()).select_from(model))
+
+    async def test_save_methods(self):
+        """測試單筆滑卡記錄、日誌與批次寫入"""
+        self.assertTrue(await self.client.save_swipe_record(1, {'name': 'A', 'age': 25}, 'right', ai_score=72.5))
+        self.assertTrue(await self.client.save_automation_log(1, 'swipe', 'success', metadata={'count': 1}))
+        saved = await self.client.batch_save_swipe_records(
+            [{'name': f'User{i}', 'swipe_direction': 'left'} for i in range(3)], dating_account_id=1
+        )
+
+        self.assertEqual(saved, 3)
+        self.assertEqual(await self.count(SwipeRecord), 4)
+        self.assertEqual(await self.count(AutomationLog), 1)
+
+    async def test_batch_writer_flushes_on_size_and_close(self):
+        """測試背景寫入器依筆數分批，結束時寫出剩餘記錄"""
+        async with self.client.batch_writer(1, flush_size=2, flush_interval=60) as writer:
+            for i in range(5):
+                writer.submit({'name': f'User{i}', 'swipe_direction': 'right'})
+            await asyncio.sleep(0.2)
+            self.assertEqual(writer.saved, 4)
+
+        self.assertEqual(writer.saved, 5)
+        self.assertEqual(await self.count(SwipeRecord), 5)
+
+    async def test_batch_writer_flushes_on_interval(self):
+        """測試未達筆數門檻時依時間門檻寫入"""
+        async with self.client.batch_writer(1, flush_size=100, flush_interval=0.05) as writer:
+            writer.submit({'name': 'A', 'swipe_direction': 'left'})
+            await asyncio.sleep(0.3)
+            self.assertEqual(await self.count(SwipeRecord), 1)
+
+
+class TestBatchWriter(unittest.IsolatedAsyncioTestCase):
+    """背景批次寫入器測試類別"""
+
+    async def test_failing_sink_keeps_writer_running(self):
+        """測試寫入失敗時背景工作繼續執行，關閉時不拋出例外"""
+        batches = []
+
+        async def sink(batch):
+            if not batches:
+                batches.append(None)
+                raise RuntimeError('database unavailable')
+            batches.append(batch)
+            return len(batch)
+
+        async with BatchWriter(sink, flush_size=2, flush_interval=60) as writer:
+            for i in range(5):
+                writer.submit({'name': f'User{i}'})
+
+        self.assertEqual((writer.saved, writer.failed), (3, 2))
+        self.assertEqual([len(batch) for batch in batches[1:]], [2, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,9 +2,17 @@
 測試資料庫客戶端功能
 """
 
+import os
+import tempfile
+import threading
+import time
 import unittest
 from datetime import datetime
-from database_client import DatabaseClient
+from unittest import mock
+
+from sqlalchemy import func, select
+
+from database_client import AutomationLog, Base, DatabaseClient, SwipeRecord, dispose_engines
 
 
 class TestDatabaseClient(unittest.TestCase):
@@ -39,6 +47,165 @@ class TestDatabaseClient(unittest.TestCase):
         self.assertEqual(test_profile['age'], 25)
 
 
+class TestBulkInsert(unittest.TestCase):
+    """大量寫入測試類別（使用記憶體內 SQLite）"""
+
+    def setUp(self):
+        """測試前設置"""
+        self.db_client = DatabaseClient('sqlite://')
+        Base.metadata.create_all(self.db_client.engine)
+        self.records = [
+            {
+                'name': f'User{i}',
+                'age': 20 + i,
+                'bio': 'tab\there',
+                'photos': ['url1'],
+                'swipe_direction': 'right' if i % 2 else 'left',
+                'is_match': i == 3,
+                'timestamp': datetime(2025, 1, 1, 12, i).isoformat()
+            }
+            for i in range(7)
+        ]
+
+    def tearDown(self):
+        """測試後清除共用 engine（同時釋放記憶體內資料庫）"""
+        dispose_engines()
+
+    def count_rows(self):
+        with self.db_client.get_session() as session:
+            return session.scalar(select(func.count()).select_from(SwipeRecord))
+
+    def test_returns_ids_in_order(self):
+        """測試分批寫入並依輸入順序回傳 ID"""
+        ids = self.db_client.bulk_insert_swipe_records(self.records, dating_account_id=1, chunk_size=3)
+
+        self.assertEqual(len(ids), 7)
+        with self.db_client.get_session() as session:
+            names = [session.get(SwipeRecord, record_id).target_name for record_id in ids]
+            stored = session.get(SwipeRecord, ids[3])
+        self.assertEqual(names, [f'User{i}' for i in range(7)])
+        self.assertTrue(stored.is_match)
+        self.assertEqual(stored.swiped_at, datetime(2025, 1, 1, 12, 3))
+
+    def test_atomic_rolls_back_all_chunks(self):
+        """測試 atomic 模式任一批失敗時全部回滾"""
+        self.records[5]['swipe_direction'] = None  # 違反 NOT NULL
+
+        ids = self.db_client.bulk_insert_swipe_records(self.records, dating_account_id=1, chunk_size=3)
+
+        self.assertEqual(ids, [])
+        self.assertEqual(self.count_rows(), 0)
+
+    def test_non_atomic_keeps_committed_chunks(self):
+        """測試非 atomic 模式保留失敗前已提交的批次"""
+        self.records[5]['swipe_direction'] = None
+
+        ids = self.db_client.bulk_insert_swipe_records(
+            self.records, dating_account_id=1, chunk_size=3, atomic=False
+        )
+
+        self.assertEqual(len(ids), 3)
+        self.assertEqual(self.count_rows(), 3)
+
+
+class TestEngineAndUnitOfWork(unittest.TestCase):
+    """共用 engine、unit of work 與連線池指標測試類別"""
+
+    def setUp(self):
+        """測試前設置：使用暫存 SQLite 檔，連線池只有一條連線"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.url = f"sqlite:///{os.path.join(self.tmp.name, 'test.db')}"
+        env = mock.patch.dict(os.environ, {'DB_POOL_SIZE': '1', 'DB_MAX_OVERFLOW': '0'})
+        env.start()
+        self.addCleanup(env.stop)
+        self.db_client = DatabaseClient(self.url)
+        Base.metadata.create_all(self.db_client.engine)
+
+    def tearDown(self):
+        dispose_engines()
+        self.tmp.cleanup()
+
+    def test_engine_shared_per_url(self):
+        """測試同一連線字串共用 engine"""
+        self.assertIs(DatabaseClient(self.url).engine, self.db_client.engine)
+
+    def test_unit_of_work_commits_together(self):
+        """測試滑卡記錄與日誌在同一交易提交，失敗時一起回滾"""
+        with self.db_client.unit_of_work() as uow:
+            uow.add_swipe_record(1, {'name': 'A'}, 'right')
+            uow.add_automation_log(1, 'swipe', 'success', metadata={'count': 1})
+
+        with self.assertRaises(RuntimeError):
+            with self.db_client.unit_of_work() as uow:
+                uow.add_swipe_record(1, {'name': 'B'}, 'left')
+                uow.add_automation_log(1, 'swipe', 'success')
+                raise RuntimeError('中斷')
+
+        with self.db_client.get_session() as session:
+            self.assertEqual(session.scalars(select(SwipeRecord.target_name)).all(), ['A'])
+            self.assertEqual(session.scalar(select(func.count()).select_from(AutomationLog)), 1)
+
+    def test_pool_metrics_count_waits(self):
+        """測試連線池用盡時的等待會被記錄"""
+        holder = self.db_client.engine.connect()
+        waiter = threading.Thread(target=lambda: self.db_client.engine.connect().close())
+        waiter.start()
+        time.sleep(0.05)
+        holder.close()
+        waiter.join()
+
+        stats = self.db_client.pool_stats()
+        self.assertGreaterEqual(stats['checkouts'], 2)
+        self.assertEqual(stats['waits'], 1)
+        self.assertGreaterEqual(stats['max_ms'], 40)
+
+
+class TestStreamRead(unittest.TestCase):
+    """串流讀取測試類別"""
+
+    def setUp(self):
+        """測試前設置：兩個帳號各 25 筆記錄，每分鐘一筆"""
+        self.db_client = DatabaseClient('sqlite://')
+        Base.metadata.create_all(self.db_client.engine)
+        for account_id in (1, 2):
+            self.db_client.bulk_insert_swipe_records([
+                {
+                    'name': f'User{i}',
+                    'age': 20 + i,
+                    'swipe_direction': 'right' if i % 2 else 'left',
+                    'timestamp': datetime(2025, 1, 1, 12, i).isoformat()
+                }
+                for i in range(25)
+            ], dating_account_id=account_id)
+
+    def tearDown(self):
+        dispose_engines()
+
+    def test_streams_in_batches_with_projection(self):
+        """測試分批讀取、欄位投影與帳號、時間範圍篩選"""
+        batches = list(self.db_client.stream_swipe_records(
+            dating_account_id=1,
+            start=datetime(2025, 1, 1, 12, 5),
+            end=datetime(2025, 1, 1, 12, 20),
+            columns=('target_name', 'swiped_at'),
+            batch_size=4
+        ))
+
+        self.assertEqual([len(batch) for batch in batches], [4, 4, 4, 3])
+        self.assertEqual(set(batches[0][0]), {'target_name', 'swiped_at'})
+        self.assertEqual(batches[0][0]['target_name'], 'User5')
+        self.assertEqual(batches[-1][-1]['target_name'], 'User19')
+
+    def test_stream_frames_filters_directions(self):
+        """測試 DataFrame 串流與滑卡方向篩選"""
+        frames = list(self.db_client.stream_swipe_frames(
+            columns=('dating_account_id', 'swipe_direction'), directions=('right',), batch_size=10
+        ))
+
+        self.assertEqual(sum(len(frame) for frame in frames), 24)
+        self.assertTrue(all((frame['swipe_direction'] == 'right').all() for frame in frames))
+
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -0,0 +1,197 @@
+"""
+測試 Tinder 自動化機器人的滑卡流程（不啟動瀏覽器）
+"""
+
+import asyncio
+import time
+import unittest
+from unittest import mock
+
+from tinder_bot import PROFILE_SELECTORS, TinderBot
+
+
+class TestTinderBotPipeline(unittest.IsolatedAsyncioTestCase):
+    """管線化滑卡測試類別"""
+
+    def setUp(self):
+        """測試前設置：以假資料取代瀏覽器操作"""
+        self.bot = TinderBot(headless=True)
+        self.card_index = 0
+
+        async def fake_profile():
+            self.card_index += 1
+            return {'name': f'User{self.card_index}', 'age': 25, 'bio': '', 'distance': 3, 'photos': []}
+
+        self.bot.get_current_profile_data = fake_profile
+        self.bot.swipe_right = mock.AsyncMock(return_value=False)
+        self.bot.swipe_right_deferred = mock.AsyncMock(return_value=None)
+        self.bot.swipe_left = mock.AsyncMock(return_value=True)
+        patcher = mock.patch('tinder_bot.random.uniform', return_value=0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_flushes_in_batches(self):
+        """測試依筆數分批寫入且回傳所有記錄"""
+        batches = []
+        records = await self.bot.auto_swipe_pipelined(
+            count=5, strategy='all_right', record_sink=lambda batch: batches.append(batch) or len(batch),
+            flush_size=2
+        )
+
+        self.assertEqual(len(records), 5)
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        self.assertTrue(all(r['swipe_direction'] == 'right' for r in records))
+
+    async def test_scraping_overlaps_delay(self):
+        """測試擷取/評分階段與上一張卡片的延遲重疊執行"""
+        async def slow_profile():
+            await asyncio.sleep(0.05)
+            self.card_index += 1
+            return {'name': f'User{self.card_index}', 'age': 25, 'bio': '', 'distance': 3, 'photos': []}
+
+        self.bot.get_current_profile_data = slow_profile
+        with mock.patch('tinder_bot.random.uniform', return_value=0.05):
+            start = time.perf_counter()
+            records = await self.bot.auto_swipe_pipelined(count=6, strategy='all_left')
+            elapsed = time.perf_counter() - start
+
+        self.assertEqual([r['name'] for r in records], [f'User{i}' for i in range(1, 7)])
+        # 依序執行約需 6 × (0.05 + 0.05) 秒
+        self.assertLess(elapsed, 0.5)
+
+    async def test_crash_keeps_flushed_records(self):
+        """測試中途中斷時已滑過的記錄仍會寫入"""
+        saved = []
+
+        async def sink(batch):
+            saved.extend(batch)
+            return len(batch)
+
+        self.bot.swipe_left = mock.AsyncMock(side_effect=[True, True, KeyboardInterrupt()])
+
+        with self.assertRaises(KeyboardInterrupt):
+            await self.bot.auto_swipe_pipelined(count=5, strategy='all_left', record_sink=sink, flush_size=100)
+
+        self.assertEqual([r['name'] for r in saved], ['User1', 'User2'])
+        self.assertTrue(all(r['swipe_direction'] == 'left' for r in saved))
+
+    async def test_ai_strategy_falls_back_on_budget(self):
+        """測試 AI 策略逾時改用快速評分並回報延遲"""
+        class SlowScorer:
+            def predict_score(self, profile_data):
+                time.sleep(0.2)
+                return {'score': 90.0, 'reason': 'model', 'recommendation': 'right'}
+
+            def fallback_score(self, profile_data):
+                return {'score': 40.0, 'reason': 'fallback', 'recommendation': 'left'}
+
+        records = await self.bot.auto_swipe(count=3, strategy='ai', scorer=SlowScorer(), decision_budget_ms=20)
+        stats = self.bot.decision_latency_stats()
+
+        self.assertEqual([r['swipe_direction'] for r in records], ['left'] * 3)
+        self.assertEqual([r['decision_reason'] for r in records], ['fallback'] * 3)
+        self.assertEqual(records[0]['ai_score'], 40.0)
+        self.assertEqual(stats['count'], 3)
+        self.assertEqual(stats['fallbacks'], 3)
+        self.assertLess(stats['p99_ms'], 150)
+
+    async def test_ai_strategy_requires_scorer(self):
+        """測試 AI 策略未提供評分器時拋出錯誤"""
+        with self.assertRaises(ValueError):
+            await self.bot.auto_swipe(count=1, strategy='ai')
+
+
+class TestProfileExtraction(unittest.IsolatedAsyncioTestCase):
+    """卡片資料擷取測試類別"""
+
+    async def test_single_round_trip(self):
+        """測試以單次 page.evaluate 取得所有欄位"""
+        bot = TinderBot(headless=True, selectors={'bio': 'div.bio'})
+        bot.page = mock.Mock()
+        bot.page.evaluate = mock.AsyncMock(return_value={
+            'name': 'Alice',
+            'age': '26',
+            'bio': 'Love hiking',
+            'distance': '5 kilometers away',
+            'photos': ['https://img/1.jpg', 'https://img/2.jpg']
+        })
+
+        profile = await bot.get_current_profile_data()
+
+        bot.page.evaluate.assert_awaited_once()
+        self.assertEqual(bot.page.evaluate.await_args.args[1]['bio'], 'div.bio')
+        self.assertEqual(bot.page.evaluate.await_args.args[1]['name'], PROFILE_SELECTORS['name'])
+        self.assertEqual(profile['name'], 'Alice')
+        self.assertEqual(profile['age'], 26)
+        self.assertEqual(profile['distance'], 5)
+        self.assertEqual(profile['photos'], ['https://img/1.jpg', 'https://img/2.jpg'])
+        self.assertEqual(bot.extraction_latency_stats()['count'], 1)
+
+    def test_parse_missing_fields(self):
+        """測試缺少欄位時使用預設值"""
+        fields = TinderBot.parse_profile_fields({'name': 'Bob', 'age': '', 'distance': 'Lives nearby'})
+
+        self.assertEqual(fields, {'name': 'Bob', 'age': 0, 'bio': '', 'distance': 0, 'photos': []})
+
+
+class TestMatchDetection(unittest.IsolatedAsyncioTestCase):
+    """事件驅動配對偵測測試類別"""
+
+    def setUp(self):
+        """測試前設置：模擬已安裝事件偵測的頁面"""
+        self.bot = TinderBot(headless=True)
+        self.bot.page = mock.Mock()
+        self.bot._match_watch_installed = True
+        self.button = mock.Mock()
+        self.bot.page.wait_for_selector = mock.AsyncMock(return_value=self.button)
+        self.bot.page.evaluate = mock.AsyncMock(return_value='User1|https://img/1.jpg')
+        self.bot.page.wait_for_function = mock.AsyncMock()
+
+    def _like_response(self, payload):
+        """點擊按讚時模擬 API 回應"""
+        response = mock.Mock(url='https://api.gotinder.com/like/abc123?locale=en')
+        response.json = mock.AsyncMock(return_value=payload)
+
+        async def click():
+            self.bot._on_response(response)
+
+        self.button.click = mock.AsyncMock(side_effect=click)
+
+    async def test_api_match_resolves(self):
+        """測試按讚 API 回應配對時立即判定並關閉彈窗"""
+        self._like_response({'match': {'_id': 'm1'}, 'likes_remaining': 99})
+
+        self.assertTrue(await self.bot.swipe_right())
+        self.assertEqual(self.button.click.await_count, 2)
+
+    async def test_no_match_does_not_wait_for_timeout(self):
+        """測試未配對時不需等到逾時"""
+        self._like_response({'match': False})
+
+        start = time.perf_counter()
+        self.assertFalse(await self.bot.swipe_right())
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+    async def test_waits_for_card_change_not_fixed_delay(self):
+        """測試滑卡後等待卡片切換，而非固定等待"""
+        self.button.click = mock.AsyncMock()
+
+        start = time.perf_counter()
+        self.assertTrue(await self.bot.swipe_left())
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+        self.bot.page.wait_for_function.assert_awaited_once()
+        self.assertEqual(self.bot.page.wait_for_function.await_args.kwargs['arg'][1], 'User1|https://img/1.jpg')
+
+    async def test_dom_event_resolves_deferred(self):
+        """測試延後取得的配對結果由 DOM 事件完成"""
+        self.button.click = mock.AsyncMock()
+        match_task = await self.bot.swipe_right_deferred()
+        self.assertFalse(match_task.done())
+
+        self.bot._resolve_match(True, 'dom')
+        self.assertTrue(await match_task)
+
+
+if __name__ == '__main__':
+    unittest.main()
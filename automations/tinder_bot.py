@@ -4,12 +4,20 @@ Tinder 自動化機器人
 """
 
 import asyncio
+import json
 import logging
+import math
 import os
+import random
+import re
+import time
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from playwright.async_api import async_playwright, Page, Browser
+from playwright.async_api import async_playwright, Page, Browser, BrowserContext
+
+from batch_writer import BatchWriter
+from swipe_strategy import build_record, choose_direction
 
 # 設定日誌
 logging.basicConfig(
@@ -18,35 +26,213 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 個人檔案卡片的 DOM 選擇器；網站改版時只需修改此處或以 TinderBot(selectors=...) 覆寫
+PROFILE_SELECTORS = {
+    'name': 'span[itemprop="name"]',
+    'age': 'span[itemprop="age"]',
+    'bio': 'div[class*="Bdrs"]',
+    # 距離：在符合 distance 的元素中，取最內層且文字包含 distance_keyword 者
+    'distance': 'div',
+    'distance_keyword': 'kilometer',
+    # 照片：取元素的 background-image 或 img 的 src
+    'photos': 'div[class*="profileCard"] div[style*="background-image"], div[class*="profileCard"] img',
+}
+
+# 配對偵測設定：配對彈窗文字、關閉按鈕，以及按讚 API 回應的網址樣式
+MATCH_DETECTION = {
+    'text': "It's a Match!",
+    'close': '[aria-label="Close"]',
+    'api_pattern': r'/like/[^/?]+',
+    'timeout_ms': 2000,
+}
+
+# 滑卡後等待卡片切換的最長秒數；偵測到下一張卡片即繼續，不固定等待
+CARD_SETTLE_SECONDS = 1
+
+# 目前卡片的識別字串（姓名與第一張照片），用於判斷卡片是否已切換
+_CARD_KEY_JS = r"""
+(selectors) => {
+    const name = document.querySelector(selectors.name);
+    const photo = document.querySelector(selectors.photos);
+    const url = photo ? photo.currentSrc || photo.src || photo.style.backgroundImage : '';
+    return (name ? name.innerText : '') + '|' + (url || '');
+}
+"""
+
+_CARD_CHANGED_JS = "([selectors, previous]) => (%s)(selectors) !== previous" % _CARD_KEY_JS.strip()
+
+# 監看 DOM 新增節點，出現配對文字時通知 Python 端（由 expose_binding 提供 __sdoMatchSeen）
+_MATCH_OBSERVER_JS = """
+(() => {
+    if (window.__sdoMatchObserver) return;
+    const text = %s;
+    window.__sdoMatchObserver = new MutationObserver((mutations) => {
+        for (const mutation of mutations) {
+            for (const node of mutation.addedNodes) {
+                if (node.textContent && node.textContent.includes(text)) {
+                    window.__sdoMatchSeen();
+                    return;
+                }
+            }
+        }
+    });
+    const start = () => window.__sdoMatchObserver.observe(document.documentElement, {childList: true, subtree: true});
+    if (document.documentElement) start(); else document.addEventListener('DOMContentLoaded', start);
+})();
+"""
+
+# 在頁面中一次取出卡片所有欄位，避免每個欄位一次 round-trip
+_EXTRACT_PROFILE_JS = r"""
+(selectors) => {
+    const text = (selector) => {
+        const element = document.querySelector(selector);
+        return element ? element.innerText.trim() : '';
+    };
+
+    let distance = '';
+    const keyword = selectors.distance_keyword;
+    for (const element of document.querySelectorAll(selectors.distance)) {
+        if (element.textContent.includes(keyword)
+                && ![...element.children].some((child) => child.textContent.includes(keyword))) {
+            distance = element.innerText.trim();
+            break;
+        }
+    }
+
+    const photos = [];
+    for (const element of document.querySelectorAll(selectors.photos)) {
+        let url = element.tagName === 'IMG' ? element.currentSrc || element.src : '';
+        if (!url) {
+            const match = /url\(["']?(.*?)["']?\)/.exec(element.style.backgroundImage || '');
+            url = match ? match[1] : '';
+        }
+        if (url && !photos.includes(url)) {
+            photos.push(url);
+        }
+    }
+
+    return {
+        name: text(selectors.name),
+        age: text(selectors.age),
+        bio: text(selectors.bio),
+        distance: distance,
+        photos: photos
+    };
+}
+"""
+
+
+def _latency_summary(latencies_ms: List[float]) -> Dict:
+    """
+    計算延遲統計（nearest-rank 百分位數）
+    
+    Args:
+        latencies_ms: 延遲列表（毫秒）
+        
+    Returns:
+        包含 count、p50_ms、p99_ms 的字典
+    """
+    latencies = sorted(latencies_ms)
+    if not latencies:
+        return {'count': 0, 'p50_ms': 0.0, 'p99_ms': 0.0}
+
+    def percentile(q: float) -> float:
+        index = max(0, math.ceil(q * len(latencies)) - 1)
+        return round(latencies[index], 2)
+
+    return {
+        'count': len(latencies),
+        'p50_ms': percentile(0.50),
+        'p99_ms': percentile(0.99)
+    }
+
 
 class TinderBot:
     """Tinder 自動化機器人類別"""
 
-    def __init__(self, headless: bool = False):
+    def __init__(
+        self,
+        headless: bool = False,
+        selectors: Optional[Dict[str, str]] = None,
+        rate_limiter: Optional[Any] = None
+    ):
         self.headless = headless
         self.browser: Optional[Browser] = None
         self.page: Optional[Page] = None
+        # 每次滑卡前呼叫 await rate_limiter.acquire()，用於多帳號排程的帳號速率限制
+        self.rate_limiter = rate_limiter
+        self._playwright = None
         self.base_url = "https://tinder.com"
+        self.selectors = {**PROFILE_SELECTORS, **(selectors or {})}
+        self.decision_latencies_ms: List[float] = []
+        self.decision_fallbacks = 0
+        self.extraction_times_ms: List[float] = []
+        self._match_watch_installed = False
+        self._pending_match: Optional[asyncio.Future] = None
         
-    async def init_browser(self):
-        """初始化瀏覽器"""
-        playwright = await async_playwright().start()
-        self.browser = await playwright.chromium.launch(
-            headless=self.headless,
-            args=['--no-sandbox', '--disable-setuid-sandbox']
-        )
-        context = await self.browser.new_context(
-            viewport={'width': 1280, 'height': 720},
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        )
+    async def init_browser(self, context: Optional[BrowserContext] = None):
+        """
+        初始化瀏覽器
+        
+        Args:
+            context: 共用瀏覽器中的獨立 context（由 BrowserPool 提供）；
+                未提供時自行啟動瀏覽器
+        """
+        if context is None:
+            self._playwright = await async_playwright().start()
+            self.browser = await self._playwright.chromium.launch(
+                headless=self.headless,
+                args=['--no-sandbox', '--disable-setuid-sandbox']
+            )
+            context = await self.browser.new_context(
+                viewport={'width': 1280, 'height': 720},
+                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            )
         self.page = await context.new_page()
+        await self.install_match_watchers()
         logger.info("瀏覽器初始化完成")
+
+    async def install_match_watchers(self):
+        """
+        安裝事件驅動的配對偵測：DOM MutationObserver 與按讚 API 回應攔截，
+        任一來源出現結果即完成等待中的配對檢查
+        """
+        await self.page.expose_binding('__sdoMatchSeen', lambda source: self._resolve_match(True, 'dom'))
+        observer_js = _MATCH_OBSERVER_JS % json.dumps(MATCH_DETECTION['text'])
+        await self.page.add_init_script(observer_js)
+        await self.page.evaluate(observer_js)
+        self.page.on('response', self._on_response)
+        self._match_watch_installed = True
+
+    def _on_response(self, response):
+        """攔截按讚 API 回應"""
+        if re.search(MATCH_DETECTION['api_pattern'], response.url):
+            asyncio.ensure_future(self._parse_like_response(response))
+
+    async def _parse_like_response(self, response):
+        """解析按讚 API 回應中的 match 欄位"""
+        try:
+            data = await response.json()
+        except Exception:
+            return
+        if isinstance(data, dict) and 'match' in data:
+            self._resolve_match(bool(data['match']), 'api')
+
+    def _resolve_match(self, is_match: bool, source: str):
+        """完成等待中的配對檢查"""
+        future = self._pending_match
+        if future is not None and not future.done():
+            logger.debug(f"配對偵測結果 ({source}): {is_match}")
+            future.set_result(is_match)
         
     async def close_browser(self):
-        """關閉瀏覽器"""
+        """關閉瀏覽器（共用瀏覽器的 context 由 BrowserPool 負責關閉）"""
         if self.browser:
             await self.browser.close()
             logger.info("瀏覽器已關閉")
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
             
     async def navigate_to_tinder(self):
         """導航至 Tinder 網站"""
@@ -105,6 +291,9 @@ class TinderBot:
         """
         取得當前顯示的個人檔案資料
         
+        以單次 page.evaluate 取出所有欄位（含照片網址），選擇器見 self.selectors；
+        每張卡片的擷取耗時記錄於 extraction_times_ms
+        
         Returns:
             包含姓名、年齡、簡介等資訊的字典
         """
@@ -117,141 +306,309 @@ class TinderBot:
             'timestamp': datetime.now().isoformat()
         }
         
+        start = time.perf_counter()
+
         try:
-            # 取得姓名和年齡
-            name_age_selector = 'span[itemprop="name"], span[itemprop="age"]'
-            name_age_elements = await self.page.query_selector_all(name_age_selector)
-            
-            if len(name_age_elements) >= 2:
-                profile_data['name'] = await name_age_elements[0].inner_text()
-                age_text = await name_age_elements[1].inner_text()
-                profile_data['age'] = int(age_text)
-                
-            # 取得簡介
-            bio_selector = 'div[class*="Bdrs"]'
-            bio_element = await self.page.query_selector(bio_selector)
-            if bio_element:
-                profile_data['bio'] = await bio_element.inner_text()
-                
-            # 取得距離資訊
-            distance_selector = 'div:has-text("kilometer")'
-            distance_element = await self.page.query_selector(distance_selector)
-            if distance_element:
-                distance_text = await distance_element.inner_text()
-                profile_data['distance'] = int(''.join(filter(str.isdigit, distance_text)))
-                
+            raw = await self.page.evaluate(_EXTRACT_PROFILE_JS, self.selectors)
+            profile_data.update(self.parse_profile_fields(raw))
             logger.info(f"已取得個人檔案: {profile_data['name']}, {profile_data['age']}")
             
         except Exception as e:
             logger.error(f"取得個人檔案資料失敗: {str(e)}")
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.extraction_times_ms.append(elapsed_ms)
+        logger.debug(f"卡片擷取耗時 {elapsed_ms:.1f} ms")
             
         return profile_data
         
+    @staticmethod
+    def parse_profile_fields(raw: Dict) -> Dict:
+        """
+        將頁面擷取的原始文字轉為個人檔案欄位
+        
+        Args:
+            raw: _EXTRACT_PROFILE_JS 回傳的物件
+            
+        Returns:
+            包含 name、age、bio、distance、photos 的字典
+        """
+        age_match = re.search(r'\d+', raw.get('age') or '')
+        distance_match = re.search(r'\d+', raw.get('distance') or '')
+
+        return {
+            'name': raw.get('name') or '',
+            'age': int(age_match.group()) if age_match else 0,
+            'bio': raw.get('bio') or '',
+            'distance': int(distance_match.group()) if distance_match else 0,
+            'photos': list(raw.get('photos') or [])
+        }
+
     async def swipe_left(self):
         """向左滑（不喜歡）"""
         try:
             dislike_button = await self.page.wait_for_selector('[aria-label="Nope"]', timeout=5000)
+            card_key = await self._card_key()
             await dislike_button.click()
             logger.info("已執行左滑（不喜歡）")
-            await asyncio.sleep(1)
+            await self._wait_for_next_card(card_key)
             return True
         except Exception as e:
             logger.error(f"左滑失敗: {str(e)}")
             return False
             
-    async def swipe_right(self):
+    async def swipe_right(self) -> bool:
         """向右滑（喜歡）"""
-        try:
-            like_button = await self.page.wait_for_selector('[aria-label="Like"]', timeout=5000)
-            await like_button.click()
-            logger.info("已執行右滑（喜歡）")
-            await asyncio.sleep(1)
-            
-            # 檢查是否配對成功
-            is_match = await self.check_for_match()
-            return is_match
-        except Exception as e:
-            logger.error(f"右滑失敗: {str(e)}")
-            return False
+        match_task = await self.swipe_right_deferred()
+        return await match_task if match_task is not None else False
+
+    async def swipe_right_deferred(self) -> Optional[asyncio.Task]:
+        """
+        向右滑（喜歡），不等待配對結果
+        
+        配對偵測在背景進行，可與下一張卡片的擷取重疊。
+        
+        Returns:
+            完成時回傳是否配對成功的 Task；按讚失敗時為 None
+        """
+        return await self._like('[aria-label="Like"]', "已執行右滑（喜歡）", "右滑失敗")
             
-    async def super_like(self):
+    async def super_like(self) -> bool:
         """超級喜歡"""
+        match_task = await self._like('[aria-label="Super Like"]', "已執行超級喜歡", "超級喜歡失敗")
+        return await match_task if match_task is not None else False
+
+    async def _like(self, selector: str, success_message: str, error_message: str) -> Optional[asyncio.Task]:
+        """點擊按讚類按鈕並在背景開始配對偵測"""
         try:
-            super_like_button = await self.page.wait_for_selector('[aria-label="Super Like"]', timeout=5000)
-            await super_like_button.click()
-            logger.info("已執行超級喜歡")
-            await asyncio.sleep(1)
+            button = await self.page.wait_for_selector(selector, timeout=5000)
+            card_key = await self._card_key()
+            # 先建立等待中的結果，避免 API 回應早於點擊完成
+            future = self._begin_match_watch()
+            await button.click()
+            logger.info(success_message)
+            match_task = asyncio.create_task(self._await_match(future))
+            # 等待卡片切換，期間配對偵測同時進行
+            await self._wait_for_next_card(card_key)
+            return match_task
+        except Exception as e:
+            logger.error(f"{error_message}: {str(e)}")
+            return None
+
+    async def _card_key(self) -> Optional[str]:
+        """取得目前卡片的識別字串，失敗時回傳 None"""
+        try:
+            return await self.page.evaluate(_CARD_KEY_JS, self.selectors)
+        except Exception as e:
+            logger.debug(f"取得卡片識別失敗: {str(e)}")
+            return None
+
+    async def _wait_for_next_card(self, previous_key: Optional[str]):
+        """
+        等待畫面換成下一張卡片，一切換即返回
+
+        Args:
+            previous_key: 滑卡前的卡片識別字串；為 None 時不等待
+        """
+        if previous_key is None:
+            return
+        try:
+            await self.page.wait_for_function(
+                _CARD_CHANGED_JS,
+                arg=[self.selectors, previous_key],
+                timeout=CARD_SETTLE_SECONDS * 1000
+            )
+        except Exception:
+            # 逾時（例如沒有下一張卡片）不視為滑卡失敗
+            logger.debug("等待卡片切換逾時")
+
+    def _begin_match_watch(self) -> Optional[asyncio.Future]:
+        """建立本次按讚的配對結果；未安裝事件偵測時回傳 None"""
+        if not self._match_watch_installed:
+            return None
+        self._pending_match = asyncio.get_running_loop().create_future()
+        return self._pending_match
+            
+    async def check_for_match(self, timeout_ms: Optional[int] = None) -> bool:
+        """
+        檢查是否出現配對畫面
+        
+        已安裝事件偵測時等待 DOM 或 API 事件，一有結果即返回；
+        否則在逾時內等待配對文字出現。
+        
+        Args:
+            timeout_ms: 最長等待時間（毫秒）
             
-            # 檢查是否配對成功
-            is_match = await self.check_for_match()
-            return is_match
+        Returns:
+            是否配對成功
+        """
+        return await self._await_match(self._pending_match, timeout_ms)
+
+    async def _await_match(self, future: Optional[asyncio.Future], timeout_ms: Optional[int] = None) -> bool:
+        """等待配對結果，配對成功時關閉彈窗"""
+        timeout_ms = timeout_ms or MATCH_DETECTION['timeout_ms']
+        is_match = False
+
+        try:
+            if future is not None:
+                is_match = await asyncio.wait_for(asyncio.shield(future), timeout=timeout_ms / 1000)
+            else:
+                await self.page.wait_for_selector(f'text="{MATCH_DETECTION["text"]}"', timeout=timeout_ms)
+                is_match = True
+        except Exception:
+            is_match = False
+        finally:
+            if future is not None and self._pending_match is future:
+                self._pending_match = None
+
+        if is_match:
+            logger.info("配對成功！")
+            await self._dismiss_match_modal()
+
+        return is_match
+
+    async def _dismiss_match_modal(self):
+        """關閉配對彈窗"""
+        try:
+            close_button = await self.page.wait_for_selector(MATCH_DETECTION['close'], timeout=2000)
+            await close_button.click()
         except Exception as e:
-            logger.error(f"超級喜歡失敗: {str(e)}")
-            return False
+            logger.warning(f"關閉配對彈窗失敗: {str(e)}")
+        
+    async def _score_profile(self, scorer: Any, profile_data: Dict, budget_ms: float) -> Dict:
+        """
+        在延遲預算內評分，逾時則改用快速規則評分
+        
+        Args:
+            scorer: AIScorer 實例
+            profile_data: 個人檔案資料
+            budget_ms: 評分延遲預算（毫秒）
             
-    async def check_for_match(self) -> bool:
-        """檢查是否出現配對畫面"""
+        Returns:
+            評分結果字典（同 AIScorer.predict_score）
+        """
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
         try:
-            match_text = await self.page.query_selector('text="It\'s a Match!"', timeout=2000)
-            if match_text:
-                logger.info("配對成功！")
-                # 關閉配對彈窗
-                close_button = await self.page.query_selector('[aria-label="Close"]')
-                if close_button:
-                    await close_button.click()
-                    await asyncio.sleep(1)
-                return True
-        except:
-            pass
-        return False
+            result = await asyncio.wait_for(
+                asyncio.to_thread(scorer.predict_score, profile_data),
+                timeout=budget_ms / 1000
+            )
+        except asyncio.TimeoutError:
+            # 逾時的評分仍在工作執行緒中完成，結果捨棄
+            result = scorer.fallback_score(profile_data)
+            self.decision_fallbacks += 1
+
+        self.decision_latencies_ms.append((loop.time() - start) * 1000)
+        return result
+
+    async def _swipe_by_strategy(self, strategy: str, score_result: Optional[Dict] = None) -> Tuple[str, bool]:
+        """
+        依策略執行一次滑卡
+        
+        Args:
+            strategy: 策略 ('random', 'all_right', 'all_left', 'ai')
+            score_result: 'ai' 策略使用的評分結果
+            
+        Returns:
+            (滑卡方向, 是否配對成功)
+        """
+        direction = choose_direction(strategy, score_result)
+
+        is_match = False
+        if direction == 'right':
+            is_match = await self.swipe_right()
+        else:
+            await self.swipe_left()
+
+        return direction, is_match
+
+    def _reset_run_stats(self, strategy: str, scorer: Optional[Any]):
+        """重設本次執行的延遲統計並檢查 'ai' 策略的評分器"""
+        if strategy == 'ai' and scorer is None:
+            raise ValueError("'ai' 策略需要提供 scorer")
+
+        self.decision_latencies_ms = []
+        self.decision_fallbacks = 0
+        self.extraction_times_ms = []
+
+    def decision_latency_stats(self) -> Dict:
+        """
+        取得本次執行的決策延遲統計
         
-    async def auto_swipe(self, count: int, strategy: str = 'random') -> List[Dict]:
+        Returns:
+            包含次數、p50、p99（毫秒）與備援次數的字典
+        """
+        return {
+            **_latency_summary(self.decision_latencies_ms),
+            'fallbacks': self.decision_fallbacks
+        }
+
+    def extraction_latency_stats(self) -> Dict:
+        """
+        取得每張卡片的資料擷取耗時統計
+        
+        Returns:
+            包含次數、p50、p99（毫秒）的字典
+        """
+        return _latency_summary(self.extraction_times_ms)
+
+    def _log_run_stats(self):
+        """印出卡片擷取與決策延遲統計"""
+        extraction = self.extraction_latency_stats()
+        if extraction['count']:
+            logger.info(f"卡片擷取耗時: p50={extraction['p50_ms']}ms p99={extraction['p99_ms']}ms")
+
+        stats = self.decision_latency_stats()
+        if stats['count']:
+            logger.info(
+                f"決策延遲: p50={stats['p50_ms']}ms p99={stats['p99_ms']}ms "
+                f"（{stats['count']} 次，備援 {stats['fallbacks']} 次）"
+            )
+
+    async def auto_swipe(
+        self,
+        count: int,
+        strategy: str = 'random',
+        scorer: Optional[Any] = None,
+        decision_budget_ms: float = 200
+    ) -> List[Dict]:
         """
         自動滑卡
         
         Args:
             count: 滑卡次數
-            strategy: 策略 ('random', 'all_right', 'all_left')
+            strategy: 策略 ('random', 'all_right', 'all_left', 'ai')
+            scorer: AIScorer 實例，'ai' 策略必須提供；其他策略提供時僅記錄評分
+            decision_budget_ms: 單次評分的延遲預算，逾時改用快速規則評分
             
         Returns:
             滑卡記錄列表
         """
         records = []
+        self._reset_run_stats(strategy, scorer)
         
         for i in range(count):
             try:
                 # 取得當前個人檔案資料
                 profile_data = await self.get_current_profile_data()
+
+                score_result = None
+                if scorer is not None:
+                    score_result = await self._score_profile(scorer, profile_data, decision_budget_ms)
                 
                 # 根據策略執行滑卡
-                is_match = False
-                if strategy == 'all_right':
-                    is_match = await self.swipe_right()
-                    direction = 'right'
-                elif strategy == 'all_left':
-                    await self.swipe_left()
-                    direction = 'left'
-                else:  # random
-                    import random
-                    if random.random() > 0.5:
-                        is_match = await self.swipe_right()
-                        direction = 'right'
-                    else:
-                        await self.swipe_left()
-                        direction = 'left'
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.acquire()
+                direction, is_match = await self._swipe_by_strategy(strategy, score_result)
                         
                 # 記錄滑卡資訊
-                record = {
-                    **profile_data,
-                    'swipe_direction': direction,
-                    'is_match': is_match
-                }
-                records.append(record)
+                records.append(build_record(profile_data, direction, is_match, score_result))
                 
                 logger.info(f"進度: {i+1}/{count} - {profile_data['name']} - {direction}")
                 
                 # 隨機延遲，模擬人類行為
-                import random
                 await asyncio.sleep(random.uniform(1, 3))
                 
             except Exception as e:
@@ -259,8 +616,148 @@ class TinderBot:
                 continue
                 
         logger.info(f"自動滑卡完成，共 {len(records)} 筆記錄")
+        self._log_run_stats()
+        return records
+
+    async def auto_swipe_pipelined(
+        self,
+        count: int,
+        strategy: str = 'random',
+        scorer: Optional[Any] = None,
+        record_sink: Optional[Callable[[List[Dict]], Any]] = None,
+        flush_size: int = 50,
+        flush_interval: float = 10.0,
+        decision_budget_ms: float = 200
+    ) -> List[Dict]:
+        """
+        管線化自動滑卡
+        
+        由三個以 asyncio 佇列串接的階段組成：
+        - 擷取/評分階段：擷取目前卡片並評分（評分在工作執行緒中進行），結果放入卡片佇列
+        - 滑卡階段：由卡片佇列取出並滑卡，滑卡後立即開始人類化延遲，右滑的配對偵測在背景進行
+        - 寫入階段：記錄經由寫入佇列分批寫入，依筆數或時間門檻觸發，執行中途中斷也不會遺失已寫入的記錄
+        
+        頁面一次只顯示一張卡片，下一張卡片在滑卡後才出現，因此擷取階段在每次滑卡後才擷取下一張
+        （卡片佇列容量為 1），與上一張的延遲及配對偵測重疊，而非預先擷取多張。
+        
+        Args:
+            count: 滑卡次數
+            strategy: 策略 ('random', 'all_right', 'all_left', 'ai')
+            scorer: AIScorer 實例，'ai' 策略必須提供；其他策略提供時僅記錄評分
+            record_sink: 批次寫入函式，接收記錄列表（可為同步函式或協程函式），
+                例如 functools.partial(db_client.batch_save_swipe_records, dating_account_id=1)
+            flush_size: 累積多少筆記錄後寫入
+            flush_interval: 距上次寫入超過多少秒即寫入
+            decision_budget_ms: 單次評分的延遲預算，逾時改用快速規則評分
+            
+        Returns:
+            滑卡記錄列表
+        """
+        self._reset_run_stats(strategy, scorer)
+        records = []
+        card_queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        card_shown = asyncio.Event()
+        card_shown.set()
+        writer = BatchWriter(record_sink, flush_size, flush_interval)
+        writer.start()
+        scraper = asyncio.create_task(
+            self._scrape_cards(count, scorer, decision_budget_ms, card_queue, card_shown)
+        )
+        delay_task: Optional[asyncio.Task] = None
+        finisher: Optional[asyncio.Task] = None
+        swiped = 0
+
+        try:
+            while True:
+                card = await card_queue.get()
+                if card is None:
+                    break
+                profile_data, score_result = card
+                swiped += 1
+
+                try:
+                    # 延遲是唯一刻意的等待；上一張的配對彈窗需先處理完
+                    if delay_task is not None:
+                        await delay_task
+                    if finisher is not None:
+                        await finisher
+                    if self.rate_limiter is not None:
+                        await self.rate_limiter.acquire()
+
+                    direction = choose_direction(strategy, score_result)
+                    match_task = None
+                    if direction == 'right':
+                        match_task = await self.swipe_right_deferred()
+                    else:
+                        await self.swipe_left()
+                    delay_task = asyncio.create_task(asyncio.sleep(random.uniform(1, 3)))
+
+                    record = build_record(profile_data, direction, False, score_result)
+                    records.append(record)
+                    finisher = asyncio.create_task(self._finish_record(record, match_task, writer))
+
+                    logger.info(f"進度: {swiped}/{count} - {profile_data['name']} - {direction}")
+
+                except Exception as e:
+                    logger.error(f"第 {swiped} 次滑卡失敗: {str(e)}")
+
+                finally:
+                    # 下一張卡片已顯示（滑卡失敗時為同一張），擷取階段可繼續
+                    card_shown.set()
+
+        finally:
+            scraper.cancel()
+            if delay_task is not None:
+                delay_task.cancel()
+            if finisher is not None:
+                await finisher
+            # 寫出剩餘記錄
+            await writer.close()
+
+        logger.info(f"管線化滑卡完成，共 {len(records)} 筆記錄")
+        self._log_run_stats()
         return records
 
+    async def _scrape_cards(
+        self,
+        count: int,
+        scorer: Optional[Any],
+        decision_budget_ms: float,
+        card_queue: asyncio.Queue,
+        card_shown: asyncio.Event
+    ):
+        """
+        擷取/評分階段：每次新卡片顯示後擷取並評分，將 (個人檔案, 評分結果) 放入卡片佇列，結束時放入 None
+        
+        Args:
+            count: 滑卡次數
+            scorer: AIScorer 實例（可為 None）
+            decision_budget_ms: 單次評分的延遲預算
+            card_queue: 卡片佇列
+            card_shown: 滑卡階段在新卡片顯示後設定的事件
+        """
+        for i in range(count):
+            await card_shown.wait()
+            card_shown.clear()
+            try:
+                profile_data = await self.get_current_profile_data()
+                score_result = None
+                if scorer is not None:
+                    score_result = await self._score_profile(scorer, profile_data, decision_budget_ms)
+            except Exception as e:
+                logger.error(f"第 {i+1} 張卡片擷取失敗: {str(e)}")
+                card_shown.set()
+                continue
+            await card_queue.put((profile_data, score_result))
+        await card_queue.put(None)
+
+    @staticmethod
+    async def _finish_record(record: Dict, match_task: Optional[asyncio.Task], writer: BatchWriter):
+        """等待配對結果後將記錄交給寫入工作"""
+        if match_task is not None:
+            record['is_match'] = await match_task
+        writer.submit(record)
+
 
 async def main():
     """主程式"""
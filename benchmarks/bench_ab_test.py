@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+A/B 測試彙總基準測試
+比較舊版 analyze_test_results（每組記錄以串列推導掃描多次並建立中間串列）
+與單次掃描的 count_swipes（字典串流、DataFrame、Arrow）、多個測試的後驗抽樣，
+以及序貫測試相對固定預算的滑卡用量
+
+用法:
+    python benchmarks/bench_ab_test.py --rows 1000000
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / 'analysis'))
+sys.path.append(str(Path(__file__).parent.parent / 'automations'))
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from ab_stats import beta_posterior, msprt_p_value
+from ab_test_manager import ABTestManager
+
+
+def legacy_analyze(records_a, records_b):
+    """舊版作法：右滑、左滑、配對各掃描一次，配對率再篩選一次"""
+    def stats(records):
+        right = [r for r in records if r.get('swipe_direction') == 'right']
+        left = [r for r in records if r.get('swipe_direction') == 'left']
+        matches = [r for r in right if r.get('is_match', False)]
+        right_again = [r for r in records if r.get('swipe_direction') == 'right']
+        matched_again = [r for r in right_again if r.get('is_match', False)]
+        rate = len(matched_again) / len(right_again) * 100 if right_again else 0.0
+        return len(records), len(right), len(left), len(matches), rate
+
+    return stats(records_a), stats(records_b)
+
+
+def make_records(rows: int, match_rate: float, seed: int):
+    rng = random.Random(seed)
+    return [
+        {'swipe_direction': 'right' if rng.random() < 0.6 else 'left', 'is_match': rng.random() < match_rate}
+        for _ in range(rows)
+    ]
+
+
+def stream_records(rows: int, match_rate: float, seed: int):
+    """逐筆產生記錄，模擬資料庫串流"""
+    rng = random.Random(seed)
+    for _ in range(rows):
+        yield {'swipe_direction': 'right' if rng.random() < 0.6 else 'left', 'is_match': rng.random() < match_rate}
+
+
+def timed(label: str, func):
+    """量測耗時，再另外執行一次量測記憶體峰值（tracemalloc 會拖慢純 Python 迴圈）"""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"  {label:<28} {elapsed * 1000:10.1f} ms  peak {peak / 1024 ** 2:8.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='A/B 測試彙總基準測試')
+    parser.add_argument('--rows', type=int, default=1000000, help='每組記錄筆數')
+    parser.add_argument('--tests', type=int, default=1000, help='同時評估的測試數（後驗抽樣）')
+    args = parser.parse_args()
+
+    manager = ABTestManager(db_client=None)
+    records_a = make_records(args.rows, 0.12, 1)
+    records_b = make_records(args.rows, 0.10, 2)
+    frame_a, frame_b = pd.DataFrame(records_a), pd.DataFrame(records_b)
+    frame_a['swipe_direction'] = frame_a['swipe_direction'].astype('category')
+    frame_b['swipe_direction'] = frame_b['swipe_direction'].astype('category')
+    table_a, table_b = pa.Table.from_pandas(frame_a), pa.Table.from_pandas(frame_b)
+    print(f"每組 {args.rows:,} 筆:")
+
+    timed('legacy (list, 5 passes)', lambda: legacy_analyze(records_a, records_b))
+    timed('single pass (list)', lambda: manager.aggregate_arms({'a': records_a, 'b': records_b}))
+    timed('single pass (DataFrame)', lambda: manager.aggregate_arms({'a': frame_a, 'b': frame_b}))
+    timed('single pass (Arrow)', lambda: manager.aggregate_arms({'a': table_a, 'b': table_b}))
+    # 串流來源不預先建立記錄，耗時包含產生記錄的成本
+    timed('single pass (generator)', lambda: manager.aggregate_arms({
+        'a': stream_records(args.rows, 0.12, 1), 'b': stream_records(args.rows, 0.10, 2)
+    }))
+
+    # 多個同時進行的測試：一次向量化抽樣 vs 逐一呼叫
+    rng = np.random.default_rng(0)
+    trials = rng.integers(100, 2000, (args.tests, 2))
+    successes = rng.binomial(trials, 0.1)
+    draws = 2000
+    print(f"\n{args.tests:,} 個兩組測試的 P(A > B)，每組 {draws:,} 次抽樣:")
+    timed('per-test loop', lambda: [
+        beta_posterior(successes[index], trials[index], draws=draws) for index in range(args.tests)
+    ])
+    timed('vectorized', lambda: beta_posterior(successes, trials, draws=draws))
+
+    sequential_savings(rng)
+
+
+def sequential_savings(rng, tests: int = 2000, budget: int = 2000, batch: int = 20, alpha: float = 0.05):
+    """序貫測試（每批檢查 mSPRT）相對固定預算的滑卡用量與誤判率"""
+    print(f"\n序貫測試 vs 固定預算（每組 {budget:,} 次右滑，每 {batch} 次檢查一次，{tests:,} 個模擬測試）:")
+    for rate_b in (0.15, 0.18, 0.20, 0.25):
+        successes = np.zeros((2, tests))
+        p_min = np.ones(tests)
+        stopped_at = np.full(tests, budget)
+        for trials in range(batch, budget + 1, batch):
+            successes += rng.binomial(batch, (0.15, rate_b), (tests, 2)).T
+            p_min = np.minimum(p_min, msprt_p_value(successes[0], trials, successes[1], trials))
+            stopped_at = np.where((p_min < alpha) & (stopped_at == budget), trials, stopped_at)
+
+        label = 'A/A (誤判率)' if rate_b == 0.15 else f'15% vs {rate_b:.0%} (檢出率)'
+        print(f"  {label:<20} 停止比例 {(p_min < alpha).mean():6.1%}  "
+              f"平均用量 {stopped_at.mean() / budget:6.1%} 的固定預算")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+AI 評分批次吞吐量基準測試
+比較逐筆 predict_score 與批次 predict_scores 的評分速度
+
+用法:
+    python benchmarks/bench_ai_scorer.py --count 100000 --model-count 2000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / 'analysis'))
+
+import numpy as np
+
+from ai_scorer import AIScorer
+from profile_analyzer import ProfileAnalysis
+
+
+def make_analyses(count: int, seed: int = 42):
+    """產生隨機的分析結果，跳過 NLP 階段以單獨量測評分成本"""
+    rng = random.Random(seed)
+    interests = ['sports', 'music', 'food', 'travel', 'arts', 'reading']
+    analyses = []
+    for i in range(count):
+        analyses.append(ProfileAnalysis(
+            name=f'user{i}',
+            age=rng.randint(18, 45),
+            distance=rng.randint(0, 80),
+            bio_length=rng.randint(0, 600),
+            keywords=[('word', 1)] * rng.randint(0, 10),
+            sentiment={'polarity': rng.uniform(-1, 1), 'subjectivity': rng.uniform(0, 1)},
+            interests=rng.sample(interests, rng.randint(0, 4)),
+            emojis=['😀'] * rng.randint(0, 12),
+            photo_count=rng.randint(0, 9)
+        ))
+    return analyses
+
+
+def bench(label: str, func, count: int) -> float:
+    """執行並印出吞吐量"""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {elapsed:8.3f}s  {count / elapsed:12,.0f} profiles/s")
+    return elapsed
+
+
+def run(scorer: AIScorer, profiles, analyses):
+    """比較逐筆與批次評分"""
+    count = len(profiles)
+    single = bench('predict_score (per profile)', lambda: [
+        scorer.predict_score(profile, analysis) for profile, analysis in zip(profiles, analyses)
+    ], count)
+    batch = bench('predict_scores (batch)', lambda: scorer.predict_scores(profiles, analyses), count)
+    print(f"  speedup: {single / batch:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AIScorer 批次評分基準測試')
+    parser.add_argument('--count', type=int, default=100000, help='檔案數量')
+    parser.add_argument('--model-count', type=int, default=2000, help='模型評分比較的檔案數量')
+    args = parser.parse_args()
+
+    analyses = make_analyses(args.count)
+    profiles = [{'name': a.name} for a in analyses]
+    scorer = AIScorer()
+
+    print(f"規則評分 ({args.count:,} profiles):")
+    run(scorer, profiles, analyses)
+
+    # 以小樣本訓練模型後量測模型評分路徑；逐筆呼叫 predict_proba 成本高，
+    # 模型比較使用 --model-count 筆
+    train_profiles = [
+        {'age': a.age, 'distance': a.distance, 'photos': ['url'] * a.photo_count}
+        for a in analyses[:2000]
+    ]
+    labels = np.random.default_rng(0).integers(0, 2, len(train_profiles)).tolist()
+    scorer.train_model(train_profiles, labels)
+
+    model_count = min(args.count, args.model_count)
+    print(f"\n模型評分 ({model_count:,} profiles):")
+    run(scorer, profiles[:model_count], analyses[:model_count])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+個人檔案分配器模擬基準測試
+比較固定輪流切換檔案（round-robin，同 switch_interval_hours 的作法）與 ProfileBandit 各策略：
+最佳檔案「為最佳的機率」達到門檻所需的總右滑數，以及同樣滑卡數下的總配對數
+
+用法:
+    python benchmarks/bench_bandit.py --simulations 400
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / 'analysis'))
+sys.path.append(str(Path(__file__).parent.parent / 'automations'))
+
+import numpy as np
+
+from ab_stats import beta_posterior
+from ab_test_manager import ArmCounts, ProfileBandit
+
+
+def simulate(strategy: str, rates, simulations: int, session: int, budget: int, threshold: float, check_every: int):
+    """
+    同步模擬多個帳號，每個帳號各自一個分配器
+
+    Returns:
+        (各模擬達到門檻時的總右滑數，未達到為 -1；各模擬的總配對數)
+    """
+    arms = [f'profile_{index}' for index in range(len(rates))]
+    best = int(np.argmax(rates))
+    rng = np.random.default_rng(0)
+    bandits = None
+    if strategy != 'round_robin':
+        bandits = [ProfileBandit(arms=arms, strategy=strategy).seed(seed) for seed in range(simulations)]
+    successes = np.zeros((simulations, len(arms)))
+    trials = np.zeros((simulations, len(arms)))
+    reached = np.full(simulations, -1)
+
+    for step in range(budget // session):
+        for index in range(simulations):
+            if bandits is None:
+                arm = step % len(arms)
+            else:
+                arm = arms.index(bandits[index].choose())
+            matches = int(rng.binomial(session, rates[arm]))
+            if bandits is not None:
+                bandits[index].update(arms[arm], ArmCounts(session, session, 0, matches))
+            successes[index, arm] += matches
+            trials[index, arm] += session
+
+        pending = np.flatnonzero(reached < 0)
+        if (step + 1) % check_every == 0 and pending.size:
+            # 只檢查尚未達門檻的模擬
+            prob_best = beta_posterior(successes[pending], trials[pending], draws=1000, seed=step)['prob_best']
+            reached[pending[prob_best[:, best] >= threshold]] = (step + 1) * session
+
+    return reached, successes.sum(axis=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='個人檔案分配器模擬基準測試')
+    parser.add_argument('--simulations', type=int, default=400, help='模擬帳號數')
+    parser.add_argument('--rates', type=float, nargs='+', default=[0.10, 0.12, 0.14, 0.18], help='各檔案的真實配對率')
+    parser.add_argument('--session', type=int, default=25, help='每個時段的右滑數')
+    parser.add_argument('--budget', type=int, default=8000, help='每個帳號的總右滑數')
+    parser.add_argument('--threshold', type=float, default=0.95, help='最佳檔案為最佳的機率門檻')
+    parser.add_argument('--check-every', type=int, default=2, help='每幾個時段檢查一次是否達門檻')
+    args = parser.parse_args()
+
+    print(f"{len(args.rates)} 個檔案（配對率 {', '.join(f'{rate:.0%}' for rate in args.rates)}），"
+          f"每時段 {args.session} 次右滑，每帳號 {args.budget:,} 次，{args.simulations} 次模擬:")
+    print(f"  {'策略':<12} {'達門檻比例':>8} {'所需右滑數 (中位數)':>16} {'總配對數 (平均)':>14} {'耗時':>10}")
+
+    baseline = None
+    for strategy in ('round_robin',) + ProfileBandit.STRATEGIES:
+        start = time.perf_counter()
+        reached, matches = simulate(strategy, args.rates, args.simulations, args.session, args.budget,
+                                    args.threshold, check_every=args.check_every)
+        elapsed = time.perf_counter() - start
+
+        hit = reached[reached > 0]
+        median = float(np.median(hit)) if hit.size else float('nan')
+        baseline = median if baseline is None else baseline
+        relative = '' if strategy == 'round_robin' else f" ({median / baseline - 1:+.0%})"
+        print(f"  {strategy:<12} {(reached > 0).mean():>12.1%} {median:>14,.0f}{relative:<7} "
+              f"{matches.mean():>14,.0f} {elapsed:>9.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+啟動與匯入時間基準測試
+以 python -X importtime 量測分析器與 main.py 各指令啟動時的模組匯入成本，
+並與歷史記錄比較以偵測退步
+
+用法:
+    python benchmarks/bench_import_time.py --runs 5 --top 5
+    python benchmarks/bench_import_time.py --record            # 追加至歷史記錄
+    python benchmarks/bench_import_time.py --max-regression 25 # 退步超過 25% 時回傳非零
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_HISTORY = Path(__file__).parent / 'results' / 'import_time_history.jsonl'
+
+sys.path.append(str(PROJECT_ROOT))
+
+from main import COMMAND_IMPORTS
+
+
+def _command_argv(command: str) -> List[str]:
+    """匯入 main 並載入指令所需模組，不實際執行指令"""
+    code = (
+        "import importlib, main; "
+        f"[importlib.import_module(m) for m in main.COMMAND_IMPORTS[{command!r}]]"
+    )
+    return ['-c', code]
+
+
+# 量測項目: 名稱 -> (工作目錄, 指令參數)
+COMMANDS = {
+    'import profile_analyzer': (PROJECT_ROOT / 'analysis', ['-c', 'import profile_analyzer']),
+    'main.py --help': (PROJECT_ROOT, ['main.py', '--help']),
+    **{f'main.py {command}': (PROJECT_ROOT, _command_argv(command)) for command in COMMAND_IMPORTS},
+}
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int]]:
+    """
+    解析 -X importtime 輸出的頂層模組累計時間
+
+    Args:
+        stderr: 子行程的標準錯誤輸出
+
+    Returns:
+        [(module, cumulative_us), ...]
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # 頂層模組沒有縮排
+        if not name.startswith('  '):
+            modules.append((name.strip(), int(cumulative)))
+    return modules
+
+
+def measure(workdir: Path, argv: List[str]) -> Dict:
+    """
+    執行一次指令並量測匯入時間
+
+    Args:
+        workdir: 工作目錄
+        argv: python 之後的指令參數
+
+    Returns:
+        包含 wall_ms、import_ms 與各頂層模組耗時的字典
+    """
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', *argv],
+        cwd=workdir, capture_output=True, text=True, env=os.environ.copy()
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    modules = parse_importtime(result.stderr)
+
+    return {
+        'wall_ms': round(wall_ms, 1),
+        'import_ms': round(sum(us for _, us in modules) / 1000, 1),
+        'modules': sorted(modules, key=lambda item: item[1], reverse=True),
+        'returncode': result.returncode
+    }
+
+
+def load_last_record(history_path: Path) -> Optional[Dict]:
+    """讀取歷史記錄的最後一筆"""
+    if not history_path.exists():
+        return None
+    lines = [line for line in history_path.read_text(encoding='utf-8').splitlines() if line.strip()]
+    return json.loads(lines[-1]) if lines else None
+
+
+def git_revision() -> str:
+    """目前的 git commit，無法取得時回傳 unknown"""
+    result = subprocess.run(
+        ['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT, capture_output=True, text=True
+    )
+    return result.stdout.strip() or 'unknown'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='啟動與匯入時間基準測試')
+    parser.add_argument('--runs', type=int, default=5, help='每個項目的執行次數（取中位數）')
+    parser.add_argument('--top', type=int, default=5, help='列出最耗時的頂層模組數')
+    parser.add_argument('--history', default=str(DEFAULT_HISTORY), help='歷史記錄檔路徑 (JSONL)')
+    parser.add_argument('--record', action='store_true', help='將結果追加至歷史記錄')
+    parser.add_argument('--max-regression', type=float, help='相對上次記錄的最大退步百分比')
+    args = parser.parse_args()
+
+    history_path = Path(args.history)
+    previous = load_last_record(history_path)
+    results = {}
+    regressions = []
+
+    for label, (workdir, argv) in COMMANDS.items():
+        runs = [measure(workdir, argv) for _ in range(args.runs)]
+        import_ms = statistics.median(run['import_ms'] for run in runs)
+        wall_ms = statistics.median(run['wall_ms'] for run in runs)
+        results[label] = {'import_ms': import_ms, 'wall_ms': wall_ms}
+
+        line = f"{label}: import {import_ms} ms, wall {wall_ms} ms"
+        baseline = (previous or {}).get('results', {}).get(label)
+        if baseline and baseline['import_ms'] > 0:
+            change = (import_ms - baseline['import_ms']) / baseline['import_ms'] * 100
+            line += f" ({change:+.1f}% vs {previous['revision']})"
+            if args.max_regression is not None and change > args.max_regression:
+                regressions.append(label)
+        print(line)
+
+        for name, us in runs[-1]['modules'][:args.top]:
+            print(f"  {us / 1000:8.1f} ms  {name}")
+
+    if args.record:
+        history_path.parent.mkdir(parents=True, exist_ok=True)
+        record = {
+            'revision': git_revision(),
+            'recorded_at': datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'results': results
+        }
+        with open(history_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        print(f"\n已追加至 {history_path}")
+
+    if regressions:
+        print(f"\n啟動時間退步超過 {args.max_regression}%: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
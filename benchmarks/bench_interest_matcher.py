@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+興趣比對微基準測試
+比較逐一子字串掃描與預先編譯的 InterestMatcher
+
+用法:
+    python benchmarks/bench_interest_matcher.py --bios 20000 --terms 5000
+"""
+
+import argparse
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / 'analysis'))
+
+from interest_matcher import DEFAULT_INTEREST_TAXONOMY, InterestMatcher
+
+
+def substring_scan(taxonomy, bio: str):
+    """舊版作法：每個關鍵字各做一次子字串搜尋"""
+    bio_lower = bio.lower()
+    return [
+        category for category, keywords in taxonomy.items()
+        if any(keyword in bio_lower for keyword in keywords)
+    ]
+
+
+def make_taxonomy(term_count: int, rng: random.Random):
+    """產生含 term_count 個隨機關鍵字的大型分類"""
+    taxonomy = {}
+    for i in range(term_count):
+        word = ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10)))
+        taxonomy.setdefault(f'category_{i % 200}', []).append(word)
+    return taxonomy
+
+
+def make_bios(count: int, rng: random.Random):
+    """以預設關鍵字與填充字組成簡介"""
+    vocabulary = [kw for keywords in DEFAULT_INTEREST_TAXONOMY.values() for kw in keywords]
+    vocabulary += ['love', 'good', 'weekend', 'friends', 'life', 'looking', 'someone', 'fun']
+    return [' '.join(rng.choices(vocabulary, k=rng.randint(5, 40))) for _ in range(count)]
+
+
+def bench(label: str, func, bios) -> float:
+    """執行並印出每則簡介的平均耗時"""
+    start = time.perf_counter()
+    for bio in bios:
+        func(bio)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<20} {elapsed:8.3f}s  {elapsed / len(bios) * 1e6:9.1f} us/bio")
+    return elapsed
+
+
+def run(label: str, taxonomy, bios):
+    """比較兩種作法"""
+    print(f"{label} ({sum(len(v) for v in taxonomy.values()):,} terms, {len(bios):,} bios):")
+    matcher = InterestMatcher(taxonomy)
+    scan = bench('substring scan', lambda bio: substring_scan(taxonomy, bio), bios)
+    compiled = bench('InterestMatcher', matcher.match, bios)
+    print(f"  speedup: {scan / compiled:.1f}x\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='興趣比對微基準測試')
+    parser.add_argument('--bios', type=int, default=20000, help='簡介數量')
+    parser.add_argument('--terms', type=int, default=5000, help='大型分類的關鍵字數量')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    bios = make_bios(args.bios, rng)
+
+    run('預設分類', DEFAULT_INTEREST_TAXONOMY, bios)
+    run('大型分類', make_taxonomy(args.terms, rng), bios)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+KLL 草圖基準測試
+比較串流草圖與完整 pandas 欄位的記憶體用量、耗時與分位數誤差
+
+用法:
+    python benchmarks/bench_quantile_sketch.py --rows 10000000 --batch 100000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / 'analysis'))
+
+import numpy as np
+import pandas as pd
+
+from quantile_sketch import KLLSketch
+from stats_generator import APPROXIMATE_QUANTILES
+
+
+def main():
+    parser = argparse.ArgumentParser(description='KLL 草圖基準測試')
+    parser.add_argument('--rows', type=int, default=10000000, help='數值筆數')
+    parser.add_argument('--batch', type=int, default=100000, help='每批筆數')
+    parser.add_argument('--k', type=int, default=200, help='草圖精確度參數')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    values = rng.lognormal(2, 0.8, args.rows)
+    print(f"{args.rows:,} 筆距離（對數常態分布），每批 {args.batch:,} 筆:")
+
+    start = time.perf_counter()
+    series = pd.Series(values)
+    exact = series.quantile(list(APPROXIMATE_QUANTILES)).tolist()
+    exact_seconds = time.perf_counter() - start
+    print(f"  {'pandas (full column)':<24} {exact_seconds * 1000:8.1f} ms  {series.memory_usage() / 1024 ** 2:8.1f} MB")
+
+    start = time.perf_counter()
+    sketch = KLLSketch(args.k, seed=1)
+    for offset in range(0, args.rows, args.batch):
+        sketch.update(values[offset:offset + args.batch])
+    estimates = sketch.quantiles(APPROXIMATE_QUANTILES)
+    sketch_seconds = time.perf_counter() - start
+    print(f"  {'KLL sketch (streaming)':<24} {sketch_seconds * 1000:8.1f} ms  "
+          f"{sketch.size * 8 / 1024:8.1f} KB ({sketch.size} 個樣本)")
+
+    ordered = np.sort(values)
+    print(f"\n  文件誤差界限: {sketch.rank_error:.2%}")
+    for q, estimate, expected in zip(APPROXIMATE_QUANTILES, estimates, exact):
+        error = abs(np.searchsorted(ordered, estimate) / args.rows - q)
+        print(f"  p{int(q * 100):<3} 估計 {estimate:8.2f}  精確 {expected:8.2f}  排名誤差 {error:.3%}")
+
+
+if __name__ == '__main__':
+    main()
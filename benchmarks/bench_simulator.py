@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+離線滑卡模擬基準測試
+以 SwipeSimulator 產生合成卡片與配對結果（不需瀏覽器），量測各滑卡策略的模擬吞吐量與配對表現，
+並比較固定樣本 A/B 測試、序貫測試與多臂分配找出最佳個人檔案的正確率與滑卡用量。
+相同 --seed 的結果完全相同（輸出記錄的雜湊值可用於比對）
+
+用法:
+    python benchmarks/bench_simulator.py --count 20000 --replications 20 --seed 0
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / 'analysis'))
+sys.path.append(str(Path(__file__).parent.parent / 'automations'))
+
+from ab_test_manager import ABTestManager, ProfileBandit, SequentialABTest, count_swipes
+from ai_scorer import AIScorer
+from analysis_cache import AnalysisCache
+from nlp_resources import NLPResourceError, ensure_resources
+from profile_analyzer import ANALYZER_VERSION
+from swipe_simulator import MatchModel, SwipeSimulator
+
+
+def digest(records) -> str:
+    """記錄內容的雜湊值（前 12 碼）"""
+    return hashlib.sha256(json.dumps(records, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()[:12]
+
+
+def strategy_section(count: int, seed: int):
+    """各策略的模擬吞吐量與配對表現"""
+    try:
+        ensure_resources()
+        nlp = True
+    except NLPResourceError:
+        nlp = False
+
+    runs = [
+        ('random', {}),
+        ('all_right', {}),
+        ('ai (fallback)', {'scorer': AIScorer(), 'nlp': False}),
+    ]
+    if nlp:
+        runs.append(('ai (NLP + cache)', {'scorer': AIScorer(cache=AnalysisCache(ANALYZER_VERSION)), 'nlp': True}))
+
+    print(f"每個策略模擬 {count:,} 次滑卡{'' if nlp else '（找不到 NLTK 資料，略過完整 NLP 評分）'}:")
+    print(f"  {'策略':<18} {'滑卡/秒':>10} {'右滑':>8} {'配對':>7} {'配對率':>7} {'每百次滑卡配對':>8} {'記錄雜湊':>14}")
+    for label, options in runs:
+        strategy = 'ai' if label.startswith('ai') else label
+        simulator = SwipeSimulator(seed=seed)
+        start = time.perf_counter()
+        records = simulator.run(count, strategy, **options)
+        elapsed = time.perf_counter() - start
+
+        counts = count_swipes(records)
+        print(f"  {label:<18} {count / elapsed:>12,.0f} {counts.right_swipes:>9,} {counts.matches:>8,} "
+              f"{counts.match_rate:>8.2f}% {counts.matches / count * 100:>12.2f} {digest(records):>16}")
+
+
+def ab_section(rates: dict, budget: int, replications: int, seed: int):
+    """固定樣本、序貫測試與多臂分配的正確率與滑卡用量"""
+    arms = list(rates)
+    best = max(rates, key=rates.get)
+    model = MatchModel(variant_rates=rates)
+    print(f"\n{len(arms)} 個個人檔案（基準配對率 {', '.join(f'{rate:.0%}' for rate in rates.values())}），"
+          f"每組預算 {budget:,} 次右滑，{replications} 次模擬:")
+    print(f"  {'方法':<14} {'選出最佳':>8} {'平均右滑數':>10} {'平均配對數':>10} {'耗時':>8}")
+
+    def fixed(simulator, manager):
+        results = simulator.run_ab_test(manager, arms, budget, strategy='all_right')
+        return results['winner'], results['arms']
+
+    def sequential(simulator, manager):
+        decision = simulator.run_sequential(SequentialABTest(arms=arms, budget_per_arm=budget), strategy='all_right')
+        return decision['winner'], decision['arms']
+
+    def bandit(simulator, manager):
+        # 最佳檔案為最佳的機率達 95% 時停止
+        allocator = ProfileBandit(arms=arms).seed(manager.seed)
+        summary = allocator.summary(seed=manager.seed)
+        while (sum(arm['right_swipes'] for arm in summary['arms'].values()) < budget * len(arms)
+               and max(arm['prob_best'] for arm in summary['arms'].values()) < 0.95):
+            simulator.run_bandit(allocator, sessions=4, strategy='all_right')
+            summary = allocator.summary(seed=manager.seed)
+        return summary['best'], summary['arms']
+
+    for label, method in (('fixed', fixed), ('sequential', sequential), ('bandit (top_two)', bandit)):
+        correct = swipes = matches = 0
+        start = time.perf_counter()
+        for replication in range(replications):
+            simulator = SwipeSimulator(match_model=model, seed=seed + replication)
+            manager = ABTestManager(db_client=None, seed=seed + replication)
+            winner, arm_stats = method(simulator, manager)
+            correct += winner == best
+            swipes += sum(arm['right_swipes'] for arm in arm_stats.values())
+            matches += sum(arm['matches'] for arm in arm_stats.values())
+        elapsed = time.perf_counter() - start
+        print(f"  {label:<16} {correct / replications:>8.0%} {swipes / replications:>12,.0f} "
+              f"{matches / replications:>12,.0f} {elapsed:>8.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='離線滑卡模擬基準測試')
+    parser.add_argument('--count', type=int, default=20000, help='每個策略的滑卡次數')
+    parser.add_argument('--replications', type=int, default=20, help='A/B 測試的模擬次數')
+    parser.add_argument('--budget', type=int, default=2000, help='A/B 測試每組的右滑預算')
+    parser.add_argument('--seed', type=int, default=0, help='隨機種子')
+    args = parser.parse_args()
+
+    strategy_section(args.count, args.seed)
+    ab_section({'profile_a': 0.10, 'profile_b': 0.12, 'profile_c': 0.16}, args.budget, args.replications, args.seed)
+
+
+if __name__ == '__main__':
+    main()
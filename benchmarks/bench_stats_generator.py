@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+統計報告基準測試
+比較舊版綜合報告（每日統計算兩次、每個區塊各自解析時間戳記並修改輸入）
+與共用預先解析 DataFrame 的新版，以及只產生部分區塊的耗時
+
+用法:
+    python benchmarks/bench_stats_generator.py --rows 1000000
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / 'analysis'))
+
+import pandas as pd
+
+from stats_generator import StatsGenerator
+
+
+def legacy_report(generator: StatsGenerator, df: pd.DataFrame):
+    """舊版作法：各區塊重新解析 swiped_at 並在輸入加入 date、hour 欄位"""
+    def daily(frame):
+        frame['date'] = pd.to_datetime(frame['swiped_at']).dt.date
+        stats = frame.groupby('date').agg({'id': 'count', 'is_match': 'sum'})
+        stats['match_rate'] = (stats['is_match'] / stats['id'] * 100).round(2)
+        return stats
+
+    def hourly(frame):
+        frame['hour'] = pd.to_datetime(frame['swiped_at']).dt.hour
+        return frame.groupby('hour').size().to_dict()
+
+    return {
+        'swipe_stats': generator.generate_swipe_direction_stats(df),
+        'age_stats': generator.generate_age_stats(df),
+        'distance_stats': generator.generate_distance_stats(df),
+        'time_stats': hourly(df),
+        'daily_stats': daily(df).to_dict() if not daily(df).empty else {}
+    }
+
+
+def make_frame(rows: int, seed: int = 42) -> pd.DataFrame:
+    """產生與 auto_swipe 記錄相同格式（ISO 字串時間戳記）的 DataFrame"""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    return pd.DataFrame({
+        'id': range(rows),
+        'target_age': [rng.randint(18, 45) for _ in range(rows)],
+        'target_distance': [rng.randint(0, 80) for _ in range(rows)],
+        'swipe_direction': [rng.choice(('left', 'right')) for _ in range(rows)],
+        'is_match': [rng.random() < 0.1 for _ in range(rows)],
+        'swiped_at': [(start + timedelta(seconds=i * 7)).isoformat() for i in range(rows)]
+    })
+
+
+def bench(label: str, func) -> float:
+    """執行並印出耗時"""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<32} {elapsed:8.3f}s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='統計報告基準測試')
+    parser.add_argument('--rows', type=int, default=1000000, help='記錄筆數')
+    args = parser.parse_args()
+
+    generator = StatsGenerator()
+    df = make_frame(args.rows)
+    print(f"綜合報告 ({args.rows:,} rows):")
+
+    legacy = bench('legacy (re-parse per section)', lambda: legacy_report(generator, df.copy()))
+    full = bench('comprehensive report', lambda: generator.generate_comprehensive_report(df))
+    bench('swipe_stats + age_stats only',
+          lambda: generator.generate_comprehensive_report(df, sections=['swipe_stats', 'age_stats']))
+    prepared = generator.prepare(df)
+    bench('pre-parsed input', lambda: generator.generate_comprehensive_report(prepared))
+    print(f"  speedup: {legacy / full:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
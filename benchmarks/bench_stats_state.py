@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+增量統計狀態基準測試
+比較每次由完整記錄重新計算報告，與由累加後的 SwipeStatsState 產生報告的耗時
+
+用法:
+    python benchmarks/bench_stats_state.py --rows 1000000 --years 3 --batch 500
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / 'analysis'))
+
+import pandas as pd
+
+from stats_generator import StatsGenerator, SwipeStatsState
+
+
+def make_frame(rows: int, years: int, seed: int = 42) -> pd.DataFrame:
+    """產生平均分布於 years 年內的滑卡記錄"""
+    rng = random.Random(seed)
+    start = datetime(2022, 1, 1)
+    step = years * 365 * 86400 / rows
+    return pd.DataFrame({
+        'id': range(1, rows + 1),
+        'target_age': [rng.randint(18, 45) for _ in range(rows)],
+        'target_distance': [rng.randint(0, 80) for _ in range(rows)],
+        'swipe_direction': [rng.choice(('left', 'right')) for _ in range(rows)],
+        'is_match': [rng.random() < 0.1 for _ in range(rows)],
+        'swiped_at': pd.to_datetime([start + timedelta(seconds=i * step) for i in range(rows)])
+    })
+
+
+def timed(func):
+    """回傳 (結果, 耗時秒數)"""
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='增量統計狀態基準測試')
+    parser.add_argument('--rows', type=int, default=1000000, help='歷史記錄筆數')
+    parser.add_argument('--years', type=int, default=3, help='歷史涵蓋年數')
+    parser.add_argument('--batch', type=int, default=500, help='每日新增的記錄筆數')
+    args = parser.parse_args()
+
+    generator = StatsGenerator()
+    history = make_frame(args.rows, args.years)
+    new_batch = make_frame(args.batch, 1, seed=7)
+    print(f"歷史 {args.rows:,} 筆（{args.years} 年），新增 {args.batch:,} 筆:")
+
+    full = pd.concat([history, new_batch], ignore_index=True)
+    _, recompute = timed(lambda: generator.generate_comprehensive_report(full))
+    print(f"  {'full recompute':<28} {recompute * 1000:10.1f} ms")
+
+    state, build = timed(lambda: SwipeStatsState().update(history))
+    print(f"  {'build state (one-off)':<28} {build * 1000:10.1f} ms")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / 'state.json')
+        state.save(path)
+        state, load = timed(lambda: SwipeStatsState.load(path))
+        print(f"  {'load state':<28} {load * 1000:10.1f} ms  ({Path(path).stat().st_size / 1024:.0f} KB)")
+
+    _, update = timed(lambda: state.update(new_batch))
+    print(f"  {'update with new batch':<28} {update * 1000:10.1f} ms")
+    report, render = timed(lambda: generator.generate_comprehensive_report(state))
+    print(f"  {'render report from state':<28} {render * 1000:10.1f} ms")
+
+    incremental = load + update + render
+    print(f"  incremental daily report: {incremental * 1000:.1f} ms ({recompute / incremental:.0f}x faster)")
+
+
+if __name__ == '__main__':
+    main()
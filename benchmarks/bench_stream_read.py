@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+滑卡記錄讀取記憶體基準測試
+比較一次載入所有記錄為字典與串流讀取（伺服器端游標 + 欄位投影 + 精簡型別）
+生成統計報告時的峰值記憶體
+
+每種讀取方式在獨立子行程中執行，以 ru_maxrss 量測峰值常駐記憶體。
+
+用法:
+    python benchmarks/bench_stream_read.py --rows 5000000
+    python benchmarks/bench_stream_read.py --rows 5000000 --db /tmp/swipes.db --modes stream
+"""
+
+import argparse
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.append(str(PROJECT_ROOT / 'automations'))
+sys.path.append(str(PROJECT_ROOT / 'analysis'))
+
+from database_client import Base, DatabaseClient
+
+
+def populate(url: str, rows: int, seed: int = 42):
+    """以 DBAPI executemany 快速寫入測試資料（只填統計用欄位）"""
+    db_client = DatabaseClient(url)
+    Base.metadata.create_all(db_client.engine)
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    chunk_size = 100000
+
+    connection = db_client.engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        for offset in range(0, rows, chunk_size):
+            cursor.executemany(
+                "INSERT INTO swipe_records (dating_account_id, target_name, target_age, target_distance, "
+                "swipe_direction, is_match, swiped_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (1, f'User{i}', rng.randint(18, 45), rng.randint(0, 80), rng.choice(('left', 'right')),
+                     rng.random() < 0.1, (start + timedelta(seconds=i * 5)).isoformat(' '))
+                    for i in range(offset, min(rows, offset + chunk_size))
+                ]
+            )
+            connection.commit()
+    finally:
+        connection.close()
+
+
+def run_mode(url: str, mode: str, batch_size: int):
+    """在子行程中讀取並生成報告，印出耗時與峰值記憶體"""
+    from stats_generator import STATS_COLUMNS, StatsGenerator
+
+    db_client = DatabaseClient(url)
+    generator = StatsGenerator()
+    start = time.perf_counter()
+
+    if mode == 'dicts':
+        # 舊作法：所有記錄先轉為字典列表
+        records = [
+            record
+            for batch in db_client.stream_swipe_records(columns=STATS_COLUMNS, batch_size=batch_size)
+            for record in batch
+        ]
+        report = generator.generate_comprehensive_report(records)
+    else:
+        frames = db_client.stream_swipe_frames(columns=STATS_COLUMNS, batch_size=batch_size)
+        report = generator.generate_comprehensive_report(generator.frames_to_dataframe(frames))
+
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"  {mode:<8} {elapsed:8.2f}s  peak RSS {peak_mb:8.1f} MB  "
+          f"({report['summary']['total_records']:,} records)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='滑卡記錄讀取記憶體基準測試')
+    parser.add_argument('--rows', type=int, default=5000000, help='記錄筆數')
+    parser.add_argument('--batch-size', type=int, default=10000, help='串流每批筆數')
+    parser.add_argument('--db', help='SQLite 檔案路徑（已存在時沿用，不重新寫入）')
+    parser.add_argument('--modes', nargs='+', default=['dicts', 'stream'], choices=['dicts', 'stream'],
+                        help='讀取方式')
+    parser.add_argument('--run-mode', choices=['dicts', 'stream'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_mode:
+        run_mode(f'sqlite:///{args.db}', args.run_mode, args.batch_size)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db or os.path.join(tmp, 'swipes.db')
+        if not os.path.exists(db_path):
+            start = time.perf_counter()
+            populate(f'sqlite:///{db_path}', args.rows)
+            print(f"已寫入 {args.rows:,} 筆測試資料 ({time.perf_counter() - start:.1f}s)")
+
+        print(f"讀取並生成統計報告 (batch {args.batch_size:,}):")
+        for mode in args.modes:
+            subprocess.run(
+                [sys.executable, __file__, '--db', db_path, '--run-mode', mode, '--batch-size', str(args.batch_size)],
+                check=False
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -5,9 +5,10 @@ Smart Dating Optimizer - 主程式入口
 """
 
 import argparse
-import asyncio
+import functools
 import sys
 import os
+from datetime import date, datetime
 from pathlib import Path
 
 # 將專案路徑加入 Python path
@@ -15,12 +16,18 @@ sys.path.append(str(Path(__file__).parent))
 sys.path.append(str(Path(__file__).parent / 'automations'))
 sys.path.append(str(Path(__file__).parent / 'analysis'))
 
-from automations.tinder_bot import TinderBot
-from automations.database_client import DatabaseClient
-from analysis.profile_analyzer import ProfileAnalyzer
-from analysis.ab_test_manager import ABTestManager
-from analysis.stats_generator import StatsGenerator
-from analysis.ai_scorer import AIScorer
+# 各指令需要的模組；只在執行該指令時才匯入，避免無關的重型依賴拖慢啟動
+# （benchmarks/bench_import_time.py 依此量測各指令的啟動成本）
+COMMAND_IMPORTS = {
+    'auto': ('automations.tinder_bot', 'automations.database_client'),
+    'analyze': ('automations.database_client', 'analysis.stats_generator'),
+    'abtest': ('automations.database_client', 'analysis.ab_test_manager'),
+    'aiscore': ('analysis.ai_scorer',),
+    'multi': ('automations.account_scheduler', 'automations.database_client'),
+    'export': ('automations.database_client', 'analysis.swipe_dataset'),
+    'snapshot': ('automations.database_client', 'analysis.analytics_snapshots'),
+    'simulate': ('analysis.swipe_simulator', 'analysis.ab_test_manager'),
+}
 
 
 def print_banner():
@@ -40,10 +47,18 @@ def print_banner():
 
 async def run_automation(args):
     """執行自動化滑卡"""
+    from automations.tinder_bot import TinderBot
+    from automations.database_client import DatabaseClient
+
     print("\n[自動化模式] 啟動 Tinder 機器人...")
     
     bot = TinderBot(headless=args.headless)
     db_client = DatabaseClient()
+
+    scorer = None
+    if args.strategy == 'ai':
+        from analysis.ai_scorer import AIScorer
+        scorer = AIScorer(model_path=args.model)
     
     try:
         await bot.init_browser()
@@ -53,14 +68,54 @@ async def run_automation(args):
         input("登入完成後按 Enter 繼續...")
         
         if await bot.wait_for_main_page():
+            if args.save_session and args.account_id:
+                # 保存登入狀態供 multi 指令使用
+                session_path = Path(args.session_dir) / f'account_{args.account_id}.json'
+                session_path.parent.mkdir(parents=True, exist_ok=True)
+                await bot.page.context.storage_state(path=str(session_path))
+                print(f"\n已保存登入狀態至 {session_path}")
+
             print(f"\n開始自動滑卡，共 {args.count} 次...")
-            records = await bot.auto_swipe(
-                count=args.count,
-                strategy=args.strategy
-            )
+            if args.pipelined:
+                # 管線化模式在執行中途分批寫入資料庫
+                # 使用非同步客戶端，寫入不會阻塞事件迴圈
+                record_sink = None
+                async_db_client = None
+                if args.account_id:
+                    from automations.async_database_client import AsyncDatabaseClient
+                    async_db_client = AsyncDatabaseClient()
+                    record_sink = functools.partial(
+                        async_db_client.batch_save_swipe_records,
+                        dating_account_id=args.account_id
+                    )
+                try:
+                    records = await bot.auto_swipe_pipelined(
+                        count=args.count,
+                        strategy=args.strategy,
+                        scorer=scorer,
+                        record_sink=record_sink,
+                        flush_size=args.flush_size,
+                        decision_budget_ms=args.decision_budget_ms
+                    )
+                finally:
+                    # 執行失敗時也要釋放連線池
+                    if async_db_client is not None:
+                        await async_db_client.close()
+            else:
+                records = await bot.auto_swipe(
+                    count=args.count,
+                    strategy=args.strategy,
+                    scorer=scorer,
+                    decision_budget_ms=args.decision_budget_ms
+                )
+
+            if scorer is not None:
+                stats = bot.decision_latency_stats()
+                print(f"\n決策延遲: p50 {stats['p50_ms']} ms, p99 {stats['p99_ms']} ms"
+                      f"（備援 {stats['fallbacks']}/{stats['count']} 次）")
             
             # 儲存至資料庫
-            if args.account_id:
+            if args.account_id and not args.pipelined:
                 saved_count = db_client.batch_save_swipe_records(
                     records,
                     dating_account_id=args.account_id
@@ -76,16 +131,115 @@ async def run_automation(args):
         await bot.close_browser()
 
 
+async def run_multi_account(args):
+    """多帳號並行自動化滑卡"""
+    from automations.account_scheduler import BrowserPool, DailySwipeCap, MultiAccountScheduler
+    from automations.database_client import DatabaseClient
+
+    print(f"\n[多帳號模式] 同時執行 {len(args.account_ids)} 個帳號...")
+
+    db_client = DatabaseClient()
+    daily_cap = DailySwipeCap.from_config(
+        args.config,
+        state_path=str(Path(args.session_dir) / 'daily_swipes.json')
+    )
+
+    scorer = None
+    if args.strategy == 'ai':
+        from analysis.ai_scorer import AIScorer
+        scorer = AIScorer(model_path=args.model)
+
+    pool = BrowserPool(
+        headless=args.headless,
+        max_contexts=args.max_contexts,
+        session_dir=args.session_dir
+    )
+    scheduler = MultiAccountScheduler(
+        pool,
+        daily_cap,
+        swipes_per_minute=args.swipes_per_minute,
+        strategy=args.strategy,
+        scorer=scorer,
+        record_sink_factory=lambda account_id: functools.partial(
+            db_client.batch_save_swipe_records,
+            dating_account_id=account_id
+        ),
+        max_context_memory_mb=args.max_context_memory_mb
+    )
+
+    try:
+        await pool.start()
+        report = await scheduler.run(args.account_ids, args.count)
+    finally:
+        await pool.close()
+
+    print("\n各帳號結果:")
+    for result in report['accounts']:
+        line = (f"  帳號 {result['account_id']}: {result['swipes']} 次滑卡, "
+                f"{result['matches']} 次配對, {result['swipes_per_minute']} 次/分鐘, "
+                f"記憶體峰值 {result['peak_memory_mb']} MB")
+        if result['error']:
+            line += f"（{result['error']}）"
+        print(line)
+    print(f"\n總計: {report['total_swipes']} 次滑卡, {report['swipes_per_minute']} 次/分鐘")
+
+    pool_stats = db_client.pool_stats()
+    if pool_stats.get('checkouts'):
+        print(f"資料庫連線池: {pool_stats['checkouts']} 次取得連線, {pool_stats['waits']} 次等待, "
+              f"p99 {pool_stats['p99_ms']} ms")
+
+
 def run_analysis(args):
     """執行數據分析"""
+    from analysis.stats_generator import STATS_COLUMNS, StatsGenerator
+
     print("\n[分析模式] 生成統計報告...")
     
-    # TODO: 從資料庫讀取記錄
-    # 這裡使用模擬資料作為範例
-    test_records = []
-    
     generator = StatsGenerator()
-    report = generator.generate_comprehensive_report(test_records)
+    if args.state:
+        from automations.database_client import DatabaseClient
+        from analysis.stats_generator import SwipeStatsState
+
+        # 增量模式：由 created_at 水位往回重疊一段時間讀取（已累加的記錄依 ID 排除），
+        # ID 較小但較晚提交的記錄不會遺漏；舊版狀態檔只有 ID 水位時，這次仍依 ID 讀取
+        state = SwipeStatsState.load(args.state)
+        created_since = state.incremental_start()
+        db_client = DatabaseClient()
+        for frame in db_client.stream_swipe_frames(
+            dating_account_id=args.account_id,
+            columns=STATS_COLUMNS + ('id', 'created_at'),
+            after_id=state.watermark_id if created_since is None else None,
+            created_since=created_since
+        ):
+            state.update(frame)
+        state.save(args.state)
+        source = state
+    elif args.snapshots:
+        from automations.database_client import DatabaseClient
+        from analysis.analytics_snapshots import SnapshotJob
+
+        # 讀取每日快照，只掃描最後一筆快照之後與時間範圍頭尾不滿一天的原始記錄
+        source = SnapshotJob(DatabaseClient()).load_state(args.account_id, start=args.since, end=args.until)
+    elif args.parquet:
+        source = generator.load_parquet(args.parquet, dating_account_id=args.account_id, start=args.since, end=args.until)
+    else:
+        from automations.database_client import DatabaseClient
+
+        # 以伺服器端游標分批讀取，只讀統計需要的欄位
+        db_client = DatabaseClient()
+        frames = db_client.stream_swipe_frames(
+            dating_account_id=args.account_id,
+            start=args.since,
+            end=args.until,
+            columns=STATS_COLUMNS
+        )
+        # 近似模式不合併為 DataFrame，年齡與距離以固定大小的草圖統計
+        source = frames if args.approximate else generator.frames_to_dataframe(frames)
+    
+    if args.approximate:
+        report = generator.generate_approximate_report(source)
+    else:
+        report = generator.generate_comprehensive_report(source)
     generator.print_text_report(report)
     
     if args.output:
@@ -93,8 +247,43 @@ def run_analysis(args):
         print(f"\n報告已匯出至 {args.output}")
 
 
+def run_export(args):
+    """匯出滑卡記錄為分區 Parquet 資料集"""
+    from automations.database_client import DatabaseClient
+    from analysis.swipe_dataset import write_swipe_dataset
+
+    print("\n[匯出模式] 匯出滑卡記錄為 Parquet...")
+
+    db_client = DatabaseClient()
+    frames = db_client.stream_swipe_frames(
+        dating_account_id=args.account_id,
+        start=args.since,
+        end=args.until,
+        batch_size=args.batch_size
+    )
+    written = write_swipe_dataset(
+        frames, args.output, dating_account_id=args.account_id, start=args.since, end=args.until
+    )
+    print(f"\n已匯出 {written} 筆記錄至 {args.output}")
+
+
+def run_snapshot(args):
+    """彙總已結束日期的每日分析快照"""
+    from automations.database_client import DatabaseClient
+    from analysis.analytics_snapshots import SnapshotJob
+
+    print("\n[快照模式] 彙總每日分析快照...")
+
+    job = SnapshotJob(DatabaseClient(), batch_size=args.batch_size)
+    written = job.run(dating_account_id=args.account_id, until=args.until, since=args.since)
+    print(f"\n已寫入 {written} 筆每日快照")
+
+
 def run_ab_test(args):
     """執行 A/B 測試"""
+    from automations.database_client import DatabaseClient
+    from analysis.ab_test_manager import ABTestManager
+
     print("\n[A/B 測試模式] 開始測試...")
     
     db_client = DatabaseClient()
@@ -105,16 +294,123 @@ def run_ab_test(args):
     print(f"\n測試名稱: {test_config.get('test_name')}")
     print(f"測試時長: {test_config.get('duration_days')} 天")
     print(f"每個檔案滑卡數: {test_config.get('swipes_per_profile')}")
+
+    if args.state:
+        from analysis.ab_test_manager import SequentialABTest
+
+        # 序貫測試：累加上一個時段（上次執行至今）的滑卡記錄並重新評估，再選出下一個時段的測試組
+        if Path(args.state).exists():
+            test = SequentialABTest.load(args.state)
+        else:
+            test = manager.create_sequential_test(test_config)
+        previous = test.current
+        counts = manager.record_session(test, dating_account_id=args.account_id)
+        profile = test.choose()
+        test.save(args.state)
+        decision = test.decision()
+        if counts is not None:
+            print(f"\n上一個時段 {previous}: {counts.right_swipes} 次右滑, {counts.matches} 次配對")
+        print(f"\n序貫測試狀態: {decision['status']}（已評估 {decision['looks']} 次）")
+        for name, arm in decision['arms'].items():
+            p_value = decision['p_values'].get(name)
+            line = (f"  {name}: {arm['right_swipes']} 次右滑, 配對率 {arm['match_rate']:.2f}%, "
+                    f"流量 {decision['allocation'].get(name, 0):.0%}")
+            if p_value is not None:
+                line += f", p = {p_value:.4f}"
+            print(line)
+        if decision['status'] == 'stopped':
+            print(f"  結果: {decision['winner'] or 'tie'}（{decision['reason']}），省下 {decision['swipes_saved']} 次滑卡")
+        if profile is not None:
+            config_file = test_config['profiles'][profile].get('config_file')
+            print(f"  下一個時段啟用: {profile}" + (f"（{config_file}）" if config_file else ''))
+        return
+
+    if args.bandit:
+        from analysis.ab_test_manager import ProfileBandit
+
+        # 多臂分配：先累加上一個時段（上次執行至今）的滑卡記錄，再依後驗選出下一個時段要啟用的個人檔案
+        if Path(args.bandit).exists():
+            bandit = ProfileBandit.load(args.bandit)
+        else:
+            bandit = manager.create_bandit(test_config, strategy=args.strategy)
+        previous = bandit.current
+        counts = manager.record_session(bandit, dating_account_id=args.account_id)
+        profile = bandit.choose()
+        bandit.save(args.bandit)
+        summary = bandit.summary()
+        if counts is not None:
+            print(f"\n上一個時段 {previous}: {counts.right_swipes} 次右滑, {counts.matches} 次配對")
+        print(f"\n分配策略: {summary['strategy']}（第 {summary['sessions']} 個時段）")
+        for name, arm in summary['arms'].items():
+            print(f"  {name}: {arm['right_swipes']} 次右滑, 後驗配對率 {arm['posterior_mean']:.2f}%, "
+                  f"為最佳的機率 {arm['prob_best']:.1%}")
+        config_file = test_config['profiles'][profile].get('config_file')
+        print(f"  下一個時段啟用: {profile}" + (f"（{config_file}）" if config_file else ''))
+        return
     
     # TODO: 實現完整的 A/B 測試流程
     print("\nA/B 測試功能開發中...")
 
 
+def run_simulation(args):
+    """離線模擬滑卡（不開啟瀏覽器）"""
+    import json
+    import time
+    from analysis.ab_test_manager import count_swipes
+    from analysis.swipe_simulator import MatchModel, SwipeSimulator
+
+    print(f"\n[模擬模式] 策略 {args.strategy}，{args.count} 次滑卡（種子 {args.seed}）...")
+
+    scorer = None
+    if args.strategy == 'ai' or args.model:
+        from analysis.ai_scorer import AIScorer
+        from analysis.analysis_cache import AnalysisCache
+        from analysis.profile_analyzer import ANALYZER_VERSION
+
+        scorer = AIScorer(model_path=args.model, cache=AnalysisCache(ANALYZER_VERSION))
+
+    simulator = SwipeSimulator(match_model=MatchModel(base_rate=args.base_rate), seed=args.seed)
+    start = time.perf_counter()
+    records = simulator.run(args.count, args.strategy, scorer, nlp=not args.no_nlp)
+    elapsed = time.perf_counter() - start
+
+    counts = count_swipes(records)
+    print(f"  右滑: {counts.right_swipes}，左滑: {counts.left_swipes}")
+    print(f"  配對: {counts.matches}，配對率: {counts.match_rate:.2f}%")
+    print(f"  耗時: {elapsed:.2f} 秒（每秒 {args.count / elapsed:,.0f} 次）")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(records, f, ensure_ascii=False)
+        print(f"  記錄已儲存至: {args.output}")
+
+
 def run_ai_score(args):
     """執行 AI 評分"""
+    from analysis.ai_scorer import AIScorer
+
     print("\n[AI 評分模式] 初始化評分系統...")
     
-    scorer = AIScorer()
+    if args.train and args.parquet:
+        scorer = AIScorer()
+        scorer.train_model_from_parquet(args.parquet, dating_account_id=args.account_id)
+    elif args.train:
+        from automations.database_client import DatabaseClient
+        from analysis.ai_scorer import TRAINING_COLUMNS
+
+        # 只有右滑（含超級喜歡）才可能配對，以其配對結果作為標籤
+        db_client = DatabaseClient()
+        scorer = AIScorer()
+        scorer.train_model_from_frames(db_client.stream_swipe_frames(
+            dating_account_id=args.account_id,
+            columns=TRAINING_COLUMNS,
+            directions=('right', 'super')
+        ))
+    else:
+        scorer = AIScorer(model_path=args.model)
+
+    if args.train and args.model:
+        scorer.save_model(args.model)
     
     # 測試範例檔案
     test_profile = {
@@ -146,34 +442,120 @@ def main():
     # 自動化指令
     auto_parser = subparsers.add_parser('auto', help='執行自動化滑卡')
     auto_parser.add_argument('--count', type=int, default=10, help='滑卡次數')
-    auto_parser.add_argument('--strategy', choices=['random', 'all_right', 'all_left'], 
+    auto_parser.add_argument('--strategy', choices=['random', 'all_right', 'all_left', 'ai'], 
                            default='random', help='滑卡策略')
+    auto_parser.add_argument('--model', help='AI 策略使用的模型檔案路徑')
+    auto_parser.add_argument('--decision-budget-ms', type=float, default=200,
+                           help='AI 策略單次評分的延遲預算（毫秒），逾時改用快速規則評分')
     auto_parser.add_argument('--headless', action='store_true', help='無頭模式')
     auto_parser.add_argument('--account-id', type=int, help='社交帳號 ID')
+    auto_parser.add_argument('--pipelined', action='store_true',
+                           help='管線化模式：擷取、評分與寫入重疊執行，並於執行中分批寫入資料庫')
+    auto_parser.add_argument('--flush-size', type=int, default=50, help='管線化模式每批寫入筆數')
+    auto_parser.add_argument('--save-session', action='store_true',
+                           help='登入後保存登入狀態（供 multi 指令使用，需搭配 --account-id）')
+    auto_parser.add_argument('--session-dir', default='sessions', help='登入狀態檔目錄')
+
+    # 多帳號指令
+    multi_parser = subparsers.add_parser('multi', help='多帳號並行自動化滑卡（共用瀏覽器）')
+    multi_parser.add_argument('--account-ids', type=int, nargs='+', required=True, help='社交帳號 ID 列表')
+    multi_parser.add_argument('--count', type=int, default=10, help='每個帳號的滑卡次數')
+    multi_parser.add_argument('--strategy', choices=['random', 'all_right', 'all_left', 'ai'],
+                            default='random', help='滑卡策略')
+    multi_parser.add_argument('--model', help='AI 策略使用的模型檔案路徑')
+    multi_parser.add_argument('--config', default='configs/ab_test_config.json',
+                            help='設定檔路徑（讀取 schedule.daily_swipe_limit）')
+    multi_parser.add_argument('--swipes-per-minute', type=float, default=10, help='每個帳號每分鐘滑卡上限')
+    multi_parser.add_argument('--max-contexts', type=int, default=4, help='同時執行的帳號數上限')
+    multi_parser.add_argument('--session-dir', default='sessions', help='登入狀態檔目錄')
+    multi_parser.add_argument('--max-context-memory-mb', type=float, default=512,
+                            help='單一帳號 context 的記憶體上限，超過時重建 context')
+    multi_parser.add_argument('--headless', action='store_true', help='無頭模式')
     
     # 分析指令
     analysis_parser = subparsers.add_parser('analyze', help='生成統計分析報告')
     analysis_parser.add_argument('--output', help='輸出檔案路徑 (JSON)')
     analysis_parser.add_argument('--account-id', type=int, help='社交帳號 ID')
+    analysis_parser.add_argument('--since', type=datetime.fromisoformat, help='起始時間 (ISO 格式，含)')
+    analysis_parser.add_argument('--until', type=datetime.fromisoformat, help='結束時間 (ISO 格式，不含)')
+    analysis_source = analysis_parser.add_mutually_exclusive_group()
+    analysis_source.add_argument('--parquet', help='由 Parquet 資料集目錄讀取（不連線資料庫）')
+    analysis_source.add_argument('--state', help='增量統計狀態檔 (JSON)，只讀取新記錄並由狀態產生報告'
+                                                 '（每個帳號使用各自的狀態檔）')
+    analysis_source.add_argument('--snapshots', action='store_true',
+                                help='由每日快照產生報告，只掃描尚未彙總的原始記錄（先執行 snapshot 指令）')
+    analysis_source.add_argument('--approximate', action='store_true',
+                                help='串流近似模式：年齡與距離以 KLL 草圖估計 p50/p90/p99 與直方圖，記憶體用量固定')
+
+    # 匯出指令
+    export_parser = subparsers.add_parser('export', help='匯出滑卡記錄為分區 Parquet 資料集')
+    export_parser.add_argument('--output', required=True, help='資料集目錄')
+    export_parser.add_argument('--account-id', type=int, help='社交帳號 ID，未提供時匯出所有帳號')
+    export_parser.add_argument('--since', type=datetime.fromisoformat, help='起始時間 (ISO 格式，含)')
+    export_parser.add_argument('--until', type=datetime.fromisoformat, help='結束時間 (ISO 格式，不含)')
+    export_parser.add_argument('--batch-size', type=int, default=50000, help='每批讀取筆數')
+
+    # 每日快照指令
+    snapshot_parser = subparsers.add_parser('snapshot', help='彙總已結束日期的每日分析快照')
+    snapshot_parser.add_argument('--account-id', type=int, help='社交帳號 ID，未提供時處理所有帳號')
+    snapshot_parser.add_argument('--since', type=date.fromisoformat,
+                                help='由此日期起重新彙總 (YYYY-MM-DD，含)，預設由最後一筆快照的隔天開始')
+    snapshot_parser.add_argument('--until', type=date.fromisoformat, help='彙總到此日期之前 (YYYY-MM-DD，不含)，預設為今天')
+    snapshot_parser.add_argument('--batch-size', type=int, default=10000, help='每批讀取筆數')
     
     # A/B 測試指令
     abtest_parser = subparsers.add_parser('abtest', help='執行 A/B 測試')
     abtest_parser.add_argument('--config', default='configs/ab_test_config.json',
                              help='測試設定檔路徑')
+    abtest_parser.add_argument('--state', help='序貫測試狀態檔 (JSON)，不存在時依設定建立；'
+                                               '每個時段結束時執行，累加該時段的滑卡記錄並選出下一個時段的測試組')
+    abtest_parser.add_argument('--account-id', type=int, help='讀取滑卡記錄的社交帳號 ID，未提供時讀取所有帳號')
+    abtest_parser.add_argument('--bandit', help='多臂分配器狀態檔 (JSON)，不存在時依設定建立；每個時段結束時執行，'
+                                                '累加該時段的滑卡記錄並選出下一個時段要啟用的個人檔案')
+    abtest_parser.add_argument('--strategy', choices=['top_two', 'thompson', 'ucb'],
+                             help='建立分配器時使用的策略，預設依設定檔 (top_two)')
     
+    # 離線模擬指令
+    simulate_parser = subparsers.add_parser('simulate', help='以合成個人檔案離線模擬滑卡（不開啟瀏覽器）')
+    simulate_parser.add_argument('--count', type=int, default=10000, help='滑卡次數')
+    simulate_parser.add_argument('--strategy', choices=['random', 'all_right', 'all_left', 'ai'],
+                               default='random', help='滑卡策略')
+    simulate_parser.add_argument('--model', help='AI 評分使用的模型檔案路徑')
+    simulate_parser.add_argument('--no-nlp', action='store_true',
+                               help='以快速規則評分（不需 NLTK 資料，同評分逾時的備援）')
+    simulate_parser.add_argument('--base-rate', type=float, default=0.12, help='配對機率模型的基準配對率')
+    simulate_parser.add_argument('--seed', type=int, default=0, help='隨機種子（相同種子結果相同）')
+    simulate_parser.add_argument('--output', help='輸出模擬記錄 (JSON)')
+
     # AI 評分指令
     ai_parser = subparsers.add_parser('aiscore', help='使用 AI 評分系統')
-    ai_parser.add_argument('--model', help='模型檔案路徑')
+    ai_parser.add_argument('--model', help='模型檔案路徑（搭配 --train 時為儲存路徑）')
+    ai_parser.add_argument('--train', action='store_true', help='以資料庫中的滑卡記錄訓練模型')
+    ai_parser.add_argument('--account-id', type=int, help='訓練資料的社交帳號 ID，未提供時使用所有帳號')
+    ai_parser.add_argument('--parquet', help='訓練資料改由 Parquet 資料集目錄讀取（不連線資料庫）')
     
     args = parser.parse_args()
-    
+
+    if args.command == 'analyze' and args.state and (args.since or args.until):
+        parser.error('--state 為累計統計，無法搭配 --since/--until')
+
     # 執行對應指令
     if args.command == 'auto':
+        import asyncio
         asyncio.run(run_automation(args))
+    elif args.command == 'multi':
+        import asyncio
+        asyncio.run(run_multi_account(args))
     elif args.command == 'analyze':
         run_analysis(args)
+    elif args.command == 'export':
+        run_export(args)
+    elif args.command == 'snapshot':
+        run_snapshot(args)
     elif args.command == 'abtest':
         run_ab_test(args)
+    elif args.command == 'simulate':
+        run_simulation(args)
     elif args.command == 'aiscore':
         run_ai_score(args)
     else: